@@ -0,0 +1,20 @@
+"""
+The overhead benchmarks for pytest-benchmark.
+
+Run with ``pytest benchmarks/bench_overhead.py``. The results can be saved
+and compared between versions with ``--benchmark-autosave`` and
+``--benchmark-compare``.
+"""
+
+import pytest
+
+from cases import build_cases
+
+pytest.importorskip("pytest_benchmark")
+
+CASES = build_cases()
+
+
+@pytest.mark.parametrize("name", list(CASES))
+def test_overhead(benchmark, name):
+    benchmark(CASES[name])
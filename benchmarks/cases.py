@@ -0,0 +1,143 @@
+"""
+The operations measured by the overhead benchmarks, shared by overhead.py
+and bench_overhead.py. Each case is a function taking no arguments that
+performs one operation.
+"""
+
+from itertools import count
+from typing import Callable, Dict
+
+from pycircuitbreaker import (
+    circuit,
+    CircuitBreaker,
+    CircuitBreakerException,
+    CircuitBreakerRegistry,
+    CircuitBreakerStrategy,
+)
+
+REGISTRY_SIZES = (10, 1000, 100000)
+EXCEPTION_LIST_SIZE = 50
+
+
+class JumpingClock:
+    """
+    A clock that moves past any recovery timeout each time it is read, so
+    an open breaker is always half open
+    """
+
+    def __init__(self):
+        self._now = count(step=3600)
+
+    def __call__(self) -> float:
+        return float(next(self._now))
+
+
+def succeed():
+    return True
+
+
+def fail():
+    raise IOError()
+
+
+def fail_fast(breaker: CircuitBreaker, func: Callable) -> Callable:
+    def case():
+        try:
+            breaker.call(func)
+        except (IOError, CircuitBreakerException):
+            pass
+
+    return case
+
+
+WINDOW_STRATEGIES = (
+    CircuitBreakerStrategy.COUNT_WINDOW,
+    CircuitBreakerStrategy.SLIDING_WINDOW,
+)
+
+
+def strategy_cases(strategy: CircuitBreakerStrategy) -> Dict[str, Callable]:
+    name = strategy.name.lower()
+    options = {"strategy": strategy}
+    if strategy in WINDOW_STRATEGIES:
+        # Open on the first error, like the other strategies
+        options["strategy_options"] = {"minimum_calls": 1}
+
+    closed = CircuitBreaker(**options)
+
+    open_breaker = CircuitBreaker(error_threshold=1, recovery_timeout=3600, **options)
+    fail_fast(open_breaker, fail)()
+
+    # Every probe fails, so the breaker reopens and is half open again on
+    # the next call
+    half_open = CircuitBreaker(
+        clock=JumpingClock(), error_threshold=1, recovery_timeout=1, **options
+    )
+    fail_fast(half_open, fail)()
+
+    return {
+        f"{name}.closed": lambda: closed.call(succeed),
+        f"{name}.open": fail_fast(open_breaker, succeed),
+        f"{name}.half_open": fail_fast(half_open, fail),
+    }
+
+
+def classification_cases() -> Dict[str, Callable]:
+    errors = [
+        type(f"Error{index}", (Exception,), {}) for index in range(EXCEPTION_LIST_SIZE)
+    ]
+    last_error = errors[-1]
+
+    def raise_last_error():
+        raise last_error()
+
+    denylist = CircuitBreaker(error_threshold=2**62, exception_denylist=errors)
+    allowlist = CircuitBreaker(exception_allowlist=errors)
+
+    def call(breaker):
+        def case():
+            try:
+                breaker.call(raise_last_error)
+            except last_error:
+                pass
+
+        return case
+
+    return {
+        "classification.denylist": call(denylist),
+        "classification.allowlist": call(allowlist),
+    }
+
+
+def registry_cases() -> Dict[str, Callable]:
+    cases = {}
+    for size in REGISTRY_SIZES:
+        registry = CircuitBreakerRegistry()
+        breakers = [
+            CircuitBreaker(error_threshold=1, recovery_timeout=3600)
+            for _ in range(size)
+        ]
+        for breaker in breakers:
+            registry.register(breaker)
+
+        # One breaker in a hundred is open
+        for breaker in breakers[::100]:
+            fail_fast(breaker, fail)()
+
+        cases[f"registry.{size}.get_open_circuits"] = registry.get_open_circuits
+        cases[f"registry.{size}.count_by_state"] = registry.count_by_state
+
+    return cases
+
+
+def build_cases() -> Dict[str, Callable]:
+    cases = {"baseline.function": succeed}
+
+    for strategy in CircuitBreakerStrategy:
+        cases.update(strategy_cases(strategy))
+
+    cases["decorator.closed"] = circuit(succeed)
+    cases.update(classification_cases())
+    cases.update(registry_cases())
+
+    return cases
@@ -0,0 +1,74 @@
+"""
+Measures breaker throughput when many threads share a single breaker.
+
+Run with ``python benchmarks/contention.py``. Each configuration is reported
+with the number of calls per second and the number of times ``on_open`` fired,
+which must be 1 for a thread safe breaker.
+"""
+
+import argparse
+import threading
+import time
+
+from pycircuitbreaker import CircuitBreaker, CircuitBreakerException
+
+
+def run(thread_safe: bool, threads: int, calls: int) -> dict:
+    opened = []
+    breaker = CircuitBreaker(
+        error_threshold=threads,
+        on_open=lambda breaker, error: opened.append(error),
+        recovery_timeout=3600,
+        thread_safe=thread_safe,
+    )
+    barrier = threading.Barrier(threads + 1)
+
+    def work(index):
+        # The dependency fails for the last part of the run so that every
+        # thread races to open the breaker at roughly the same time
+        if index >= calls * 0.9:
+            raise IOError()
+        return index
+
+    def worker():
+        barrier.wait()
+        for index in range(calls):
+            try:
+                breaker.call(work, index)
+            except (IOError, CircuitBreakerException):
+                pass
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "thread_safe": thread_safe,
+        "calls_per_sec": threads * calls / elapsed,
+        "on_open_calls": len(opened),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--calls", type=int, default=20000)
+    args = parser.parse_args()
+
+    for thread_safe in (False, True):
+        result = run(thread_safe, args.threads, args.calls)
+        print(
+            f"thread_safe={result['thread_safe']!s:<5} "
+            f"{result['calls_per_sec']:>12,.0f} calls/sec "
+            f"on_open fired {result['on_open_calls']} time(s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
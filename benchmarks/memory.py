@@ -0,0 +1,55 @@
+"""
+Measures the memory used by each breaker when many breakers are created.
+
+Run with ``python benchmarks/memory.py``. Each configuration is reported with
+the number of bytes allocated per breaker, measured with tracemalloc, which
+includes the strategy, ID and locks of each breaker. Breakers are given a
+generated UUID unless ``--named`` is passed.
+"""
+
+import argparse
+import tracemalloc
+
+from pycircuitbreaker import CircuitBreaker, CircuitBreakerStrategy
+
+CONFIGURATIONS = {
+    "default": {},
+    "net_error": {"strategy": CircuitBreakerStrategy.NET_ERROR},
+    "thread_safe": {"thread_safe": True},
+    "denylist": {"exception_denylist": [IOError, TimeoutError]},
+}
+
+
+def run(name: str, breakers: int, named: bool) -> dict:
+    options = CONFIGURATIONS[name]
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    created = [
+        CircuitBreaker(breaker_id=f"breaker-{index}" if named else None, **options)
+        for index in range(breakers)
+    ]
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # The list holding the breakers is not part of their cost
+    size = after - before - created.__sizeof__()
+
+    return {"name": name, "bytes_per_breaker": size / breakers}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--breakers", type=int, default=100000)
+    parser.add_argument("--named", action="store_true")
+    args = parser.parse_args()
+
+    for name in CONFIGURATIONS:
+        result = run(name, args.breakers, args.named)
+        print(
+            f"{result['name']:<12} {result['bytes_per_breaker']:>8,.0f} bytes/breaker"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Measures the overhead of breaker metrics on the call path.
+
+Run with ``python benchmarks/metrics.py``. Each configuration is reported with
+the time per call in nanoseconds, with and without metrics, for calls that
+succeed and calls that fail.
+"""
+
+import argparse
+import time
+
+from pycircuitbreaker import CircuitBreaker
+
+
+def succeed():
+    return True
+
+
+def fail():
+    raise IOError()
+
+
+def run(metrics: bool, func, calls: int) -> float:
+    # The breaker never opens, so every call reaches the function
+    breaker = CircuitBreaker(error_threshold=calls + 1, metrics=metrics)
+
+    start = time.perf_counter()
+    for _ in range(calls):
+        try:
+            breaker.call(func)
+        except IOError:
+            pass
+    elapsed = time.perf_counter() - start
+
+    return elapsed / calls * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200000)
+    args = parser.parse_args()
+
+    for func in (succeed, fail):
+        baseline = run(False, func, args.calls)
+        instrumented = run(True, func, args.calls)
+        print(
+            f"{func.__name__:<8} "
+            f"metrics=False {baseline:>8,.0f} ns/call "
+            f"metrics=True {instrumented:>8,.0f} ns/call "
+            f"overhead {instrumented - baseline:>6,.0f} ns/call"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Measures the time taken by breaker operations compared with a bare function call.
+
+Run with ``python benchmarks/overhead.py``. Calls are measured for every
+strategy while the breaker is closed, open (failing fast) and half open
+(with a failing probe), along with the decorator, exception classification
+against long allowlists and denylists, and registry queries with 10, 1000
+and 100000 breakers.
+
+Results can be saved with ``--json results.json`` and compared against a
+previous run with ``--compare results.json`` to catch regressions.
+"""
+
+import argparse
+import json
+import os
+import platform
+import timeit
+
+import pycircuitbreaker
+
+from cases import build_cases
+
+
+def package_version() -> str:
+    """
+    The version of the imported package, read from its VERSION file as
+    setup.py does
+    """
+    path = os.path.join(os.path.dirname(pycircuitbreaker.__file__), "VERSION")
+    with open(path) as version_file:
+        return version_file.read().strip()
+
+
+def measure(case, repeat: int) -> float:
+    """
+    The fastest time of an operation in nanoseconds over repeat runs
+    """
+    timer = timeit.Timer(case)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", default="", help="Only run cases containing this")
+    parser.add_argument("--json", help="Save the results to this file")
+    parser.add_argument("--compare", help="Compare with results saved by --json")
+    args = parser.parse_args()
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as results_file:
+            previous = json.load(results_file)["results"]
+
+    results = {}
+    for name, case in build_cases().items():
+        if args.filter not in name:
+            continue
+
+        results[name] = measure(case, args.repeat)
+
+        line = f"{name:<40} {results[name]:>12,.0f} ns"
+        if name in previous:
+            change = (results[name] - previous[name]) / previous[name] * 100
+            line += f" {previous[name]:>12,.0f} ns {change:>+7.1f}%"
+        print(line)
+
+    if args.json:
+        with open(args.json, "w") as results_file:
+            json.dump(
+                {
+                    "python": platform.python_version(),
+                    "pycircuitbreaker": package_version(),
+                    "results": results,
+                },
+                results_file,
+                indent=2,
+                sort_keys=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
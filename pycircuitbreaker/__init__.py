@@ -1,4 +1,31 @@
-from .pycircuitbreaker import circuit, CircuitBreaker, CircuitBreakerRegistry
-from .exceptions import CircuitBreakerException, CircuitBreakerRegistryException
+from .pycircuitbreaker import (
+    circuit,
+    CircuitBreaker,
+    CircuitBreakerGroup,
+    CircuitBreakerRegistry,
+)
+from .exceptions import (
+    BulkheadFullException,
+    CallTimeoutException,
+    CircuitBreakerException,
+    CircuitBreakerRegistryException,
+    CircuitBreakerStoreException,
+    ThrottledException,
+    TimeoutExecutorFullException,
+)
 from .state import CircuitBreakerState
 from .strategies import CircuitBreakerStrategy
+from .backoff import ExponentialBackoff
+from .batch import CallOutcome
+from .bulkhead import Bulkhead
+from .cache import ResultCache
+from .events import (
+    AsyncioEventBus,
+    CircuitBreakerEvent,
+    CircuitBreakerEventType,
+    EventBus,
+    ThreadedEventBus,
+)
+from .retry import RetryBudget, RetryPolicy
+from .single_flight import SingleFlight
+from .timeout import TimeoutExecutor
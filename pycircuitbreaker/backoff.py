@@ -0,0 +1,58 @@
+import math
+import random
+from typing import Callable, Optional
+
+
+class ExponentialBackoff:
+    """
+    Grows an interval exponentially with the number of attempts, up to
+    max_interval (an hour by default, or without limit if None). A random jitter of up to jitter * interval is added or
+    subtracted so that processes that started together spread out.
+    """
+
+    MAX_INTERVAL = 3600.0
+    MULTIPLIER = 2.0
+
+    def __init__(
+        self,
+        multiplier: float = MULTIPLIER,
+        max_interval: Optional[float] = MAX_INTERVAL,
+        jitter: float = 0.0,
+        random_func: Callable[[], float] = random.random,
+    ):
+        if multiplier < 1:
+            raise ValueError(f"multiplier must be at least 1, got {multiplier}")
+
+        if not 0 <= jitter <= 1:
+            raise ValueError(f"jitter must be between 0 and 1, got {jitter}")
+
+        self._multiplier = multiplier
+        self._max_interval = max_interval
+        self._jitter = jitter
+        self._random = random_func
+
+    def interval(self, base: float, attempt: int) -> float:
+        """
+        The interval to use after attempt previous failed attempts
+        """
+        max_interval = self._max_interval
+        if max_interval is not None and base > 0 and self._multiplier > 1:
+            # Stop growing once the cap is reached, so that a long outage
+            # cannot overflow the power
+            attempt = min(
+                attempt,
+                max(0, math.ceil(math.log(max_interval / base, self._multiplier)) + 1),
+            )
+
+        try:
+            interval = base * self._multiplier**attempt
+        except OverflowError:
+            interval = math.inf if base > 0 else 0.0
+
+        if max_interval is not None:
+            interval = min(interval, max_interval)
+
+        if self._jitter:
+            interval *= 1 + self._jitter * (2 * self._random() - 1)
+
+        return max(0.0, interval)
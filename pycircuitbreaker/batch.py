@@ -0,0 +1,20 @@
+from typing import Any, NamedTuple, Optional
+
+
+class CallOutcome(NamedTuple):
+    """
+    The outcome of one call of a batch.
+
+    result is the value returned by a call that completed and exception the
+    exception raised by a call that failed. Calls that were not made because
+    the breaker rejected them have rejected set, with the CircuitBreakerException
+    as exception
+    """
+
+    result: Any = None
+    exception: Optional[BaseException] = None
+    rejected: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.exception is None
@@ -0,0 +1,159 @@
+import asyncio
+from collections import deque
+from threading import Event, Lock
+from typing import Deque, Optional, Union
+
+
+class Bulkhead:
+    """
+    Limits the number of calls running at the same time to
+    max_concurrent_calls.
+
+    When every slot is taken, up to max_wait_calls further calls wait for a
+    slot for at most max_wait_time seconds (forever if None). Calls beyond
+    that are rejected straight away. Threads and coroutines may share a
+    bulkhead; slots are handed to waiters in the order they arrived.
+    """
+
+    MAX_WAIT_CALLS = 0
+
+    def __init__(
+        self,
+        max_concurrent_calls: int,
+        max_wait_calls: int = MAX_WAIT_CALLS,
+        max_wait_time: Optional[float] = None,
+    ):
+        if max_concurrent_calls < 1:
+            raise ValueError(
+                f"max_concurrent_calls must be at least 1, got {max_concurrent_calls}"
+            )
+
+        if max_wait_calls < 0:
+            raise ValueError(
+                f"max_wait_calls must not be negative, got {max_wait_calls}"
+            )
+
+        self._max_concurrent_calls = max_concurrent_calls
+        self._max_wait_calls = max_wait_calls
+        self._max_wait_time = max_wait_time
+        self._active_calls = 0
+        self._rejected_count = 0
+        self._waiters: Deque[Union[Event, asyncio.Future]] = deque()
+        self._lock = Lock()
+
+    def acquire(self) -> bool:
+        """
+        Take a slot, waiting if allowed. Returns False if the call is rejected
+        """
+        with self._lock:
+            if self._try_acquire():
+                return True
+
+            if len(self._waiters) >= self._max_wait_calls:
+                self._rejected_count += 1
+                return False
+
+            waiter = Event()
+            self._waiters.append(waiter)
+
+        if waiter.wait(self._max_wait_time):
+            return True
+
+        with self._lock:
+            if waiter.is_set():
+                # The slot was handed over as the wait timed out
+                return True
+
+            self._waiters.remove(waiter)
+            self._rejected_count += 1
+            return False
+
+    async def acquire_async(self) -> bool:
+        """
+        Take a slot without blocking the event loop, waiting if allowed.
+        Returns False if the call is rejected
+        """
+        with self._lock:
+            if self._try_acquire():
+                return True
+
+            if len(self._waiters) >= self._max_wait_calls:
+                self._rejected_count += 1
+                return False
+
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+
+        try:
+            await asyncio.wait_for(waiter, self._max_wait_time)
+        except asyncio.TimeoutError:
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                except ValueError:
+                    # Already handed a slot, which _grant gives back
+                    pass
+                self._rejected_count += 1
+            return False
+        except asyncio.CancelledError:
+            with self._lock:
+                try:
+                    self._waiters.remove(waiter)
+                    granted = False
+                except ValueError:
+                    granted = True
+
+            if granted and waiter.done() and not waiter.cancelled():
+                self.release()
+            raise
+
+        return True
+
+    def release(self):
+        """
+        Give back a slot, handing it to the longest waiting call if any
+        """
+        with self._lock:
+            if not self._waiters:
+                self._active_calls -= 1
+                return
+
+            waiter = self._waiters.popleft()
+            if isinstance(waiter, Event):
+                waiter.set()
+                return
+
+        waiter.get_loop().call_soon_threadsafe(self._grant, waiter)
+
+    @property
+    def active_calls(self) -> int:
+        return self._active_calls
+
+    @property
+    def max_concurrent_calls(self) -> int:
+        return self._max_concurrent_calls
+
+    @property
+    def rejected_count(self) -> int:
+        """
+        The number of calls rejected because the bulkhead was full
+        """
+        return self._rejected_count
+
+    @property
+    def waiting_calls(self) -> int:
+        return len(self._waiters)
+
+    def _try_acquire(self) -> bool:
+        if self._active_calls < self._max_concurrent_calls and not self._waiters:
+            self._active_calls += 1
+            return True
+
+        return False
+
+    def _grant(self, waiter: asyncio.Future):
+        if waiter.done():
+            # The waiter gave up after the slot was handed to it
+            self.release()
+        else:
+            waiter.set_result(True)
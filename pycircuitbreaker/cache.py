@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from threading import Lock
+from time import monotonic
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def call_key(
+    func: Callable,
+    args: Tuple,
+    kwargs: Dict[str, Any],
+    key_func: Optional[Callable[..., Hashable]] = None,
+) -> Tuple:
+    """
+    The key identifying a call by its function and arguments, or by its
+    function and the value of key_func if given
+    """
+    if key_func is not None:
+        return func, key_func(*args, **kwargs)
+
+    return func, args, tuple(sorted(kwargs.items()))
+
+
+class ResultCache:
+    """
+    A bounded cache of the last successful result of each call, used to
+    serve stale results while a breaker is open.
+
+    Results are keyed by the function and its arguments, or by the function
+    and the value of key_func if given. At most max_size results are kept,
+    evicting the least recently used first, and results older than ttl
+    seconds are not served. Calls whose key cannot be hashed are not cached.
+    """
+
+    MAX_SIZE = 128
+
+    def __init__(
+        self,
+        max_size: int = MAX_SIZE,
+        ttl: Optional[float] = None,
+        key_func: Optional[Callable[..., Hashable]] = None,
+        clock: Callable[[], float] = monotonic,
+    ):
+        if max_size < 1:
+            raise ValueError(f"max_size must be at least 1, got {max_size}")
+
+        self._max_size = max_size
+        self._ttl = ttl
+        self._key_func = key_func
+        self._clock = clock
+        self._results: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = Lock()
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+
+    def get(self, func: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Any:
+        """
+        The cached result of the call. Raises KeyError if there is none
+        """
+        key = self._key(func, args, kwargs)
+
+        with self._lock:
+            try:
+                result, stored_at = self._results[key]
+            except TypeError:
+                raise KeyError(key) from None
+
+            if self._ttl is not None and self._clock() - stored_at >= self._ttl:
+                del self._results[key]
+                raise KeyError(key)
+
+            self._results.move_to_end(key)
+            return result
+
+    def put(self, func: Callable, args: Tuple, kwargs: Dict[str, Any], result: Any):
+        key = self._key(func, args, kwargs)
+
+        with self._lock:
+            try:
+                self._results[key] = (result, self._clock())
+            except TypeError:
+                return
+
+            self._results.move_to_end(key)
+            if len(self._results) > self._max_size:
+                self._results.popitem(last=False)
+
+    def _key(self, func: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Tuple:
+        return call_key(func, args, kwargs, self._key_func)
@@ -0,0 +1,46 @@
+from typing import Dict, Iterable, Optional, Type
+
+
+class ExceptionClassifier:
+    """
+    Decides whether an exception counts as an error for a breaker.
+
+    Decisions are cached per exception type so that the allowlist and denylist
+    are only scanned the first time a type is seen. The cache never holds
+    exception instances, so tracebacks and frames are not kept alive.
+    """
+
+    CACHE_SIZE = 128
+
+    def __init__(
+        self,
+        exception_allowlist: Optional[Iterable[Type[BaseException]]] = None,
+        exception_denylist: Optional[Iterable[Type[BaseException]]] = None,
+        cache_size: int = CACHE_SIZE,
+    ):
+        self._allowlist = tuple(exception_allowlist or ())
+        self._denylist = tuple(exception_denylist or ())
+        self._cache: Dict[type, bool] = {}
+        self._cache_size = cache_size
+
+    def is_error(self, exception: BaseException) -> bool:
+        exc_type = type(exception)
+        try:
+            return self._cache[exc_type]
+        except KeyError:
+            pass
+
+        is_error = self._classify(exc_type)
+
+        if len(self._cache) >= self._cache_size:
+            # Evict the oldest decision. Another thread may have done so already
+            self._cache.pop(next(iter(self._cache), None), None)
+        self._cache[exc_type] = is_error
+
+        return is_error
+
+    def _classify(self, exc_type: type) -> bool:
+        if self._allowlist and issubclass(exc_type, self._allowlist):
+            return False
+
+        return not self._denylist or issubclass(exc_type, self._denylist)
@@ -0,0 +1,231 @@
+import asyncio
+import logging
+from enum import Enum
+from inspect import isawaitable
+from queue import Full, Queue
+from threading import Lock, Thread
+from typing import Any, Callable, Iterable, Iterator, NamedTuple, Optional, Tuple
+
+from .state import CircuitBreakerState
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitBreakerEventType(Enum):
+    ERROR = "ERROR"
+    IGNORED_ERROR = "IGNORED_ERROR"
+    REJECTED = "REJECTED"
+    SLOW_CALL = "SLOW_CALL"
+    STATE_TRANSITION = "STATE_TRANSITION"
+    SUCCESS = "SUCCESS"
+
+
+class CircuitBreakerEvent(NamedTuple):
+    """
+    Something that happened to a breaker.
+
+    error is the exception or detected error result for ERROR, the
+    exception for IGNORED_ERROR, the CircuitBreakerException for REJECTED
+    and the error that opened the breaker for a transition to OPEN. state
+    is the new state for STATE_TRANSITION and elapsed is the duration of
+    the call in seconds for SLOW_CALL
+    """
+
+    type: CircuitBreakerEventType
+    breaker: Any
+    error: Any = None
+    state: Optional[CircuitBreakerState] = None
+    elapsed: Optional[float] = None
+
+
+Listener = Callable[[CircuitBreakerEvent], Any]
+
+
+class EventBus:
+    """
+    Delivers breaker events to subscribed listeners.
+
+    Listeners are called synchronously by the thread making the call, so an
+    exception raised by a listener propagates to the caller. Use
+    ThreadedEventBus or AsyncioEventBus to keep listeners off the call path.
+    """
+
+    def __init__(self):
+        self._listeners: Tuple[Tuple[Listener, Optional[frozenset]], ...] = ()
+        self._lock = Lock()
+
+    def subscribe(
+        self,
+        listener: Listener,
+        event_types: Optional[Iterable[CircuitBreakerEventType]] = None,
+    ):
+        """
+        Call listener with every event, or only with events of event_types
+        """
+        types = frozenset(event_types) if event_types is not None else None
+        with self._lock:
+            self._listeners += ((listener, types),)
+
+    def unsubscribe(self, listener: Listener):
+        with self._lock:
+            self._listeners = tuple(
+                (subscribed, types)
+                for subscribed, types in self._listeners
+                if subscribed != listener
+            )
+
+    def publish(self, event: CircuitBreakerEvent):
+        for listener in self._listeners_for(event):
+            listener(event)
+
+    def _listeners_for(self, event: CircuitBreakerEvent) -> Iterator[Listener]:
+        for listener, types in self._listeners:
+            if types is None or event.type in types:
+                yield listener
+
+
+class ThreadedEventBus(EventBus):
+    """
+    Delivers events to listeners from a background thread.
+
+    Events are queued for the thread, which is started by the first event.
+    When max_queue_size events are waiting, further events are dropped and
+    counted in dropped_count rather than blocking the call. Exceptions raised
+    by listeners are logged.
+    """
+
+    MAX_QUEUE_SIZE = 1024
+
+    def __init__(self, max_queue_size: int = MAX_QUEUE_SIZE):
+        super().__init__()
+        self._queue: "Queue[Optional[CircuitBreakerEvent]]" = Queue(max_queue_size)
+        self._dropped_count = 0
+        self._thread: Optional[Thread] = None
+
+    def close(self):
+        """
+        Deliver the events already queued and stop the background thread
+        """
+        with self._lock:
+            thread, self._thread = self._thread, None
+
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def publish(self, event: CircuitBreakerEvent):
+        if self._thread is None:
+            self._start()
+
+        try:
+            self._queue.put_nowait(event)
+        except Full:
+            self._dropped_count += 1
+
+    @property
+    def dropped_count(self) -> int:
+        """
+        The number of events dropped because the queue was full
+        """
+        return self._dropped_count
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = Thread(
+                    target=self._run, name="pycircuitbreaker-events", daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            event = self._queue.get()
+            if event is None:
+                return
+
+            for listener in self._listeners_for(event):
+                try:
+                    listener(event)
+                except Exception:
+                    logger.exception("Breaker event listener failed")
+
+
+class AsyncioEventBus(EventBus):
+    """
+    Delivers events to listeners in an asyncio event loop.
+
+    Events may be published from any thread. Listeners may be coroutine
+    functions, which are run as tasks. When max_pending events are waiting
+    to be delivered, further events are dropped and counted in dropped_count
+    rather than blocking the call. Exceptions raised by listeners are logged.
+
+    Without a loop, events are delivered in the loop running when they are
+    published, and in the last such loop when published from other threads.
+    Events published while no loop can deliver them, for example from
+    synchronous code before a loop has run or after it closed, are dropped.
+    """
+
+    MAX_PENDING = 1024
+
+    def __init__(
+        self,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        max_pending: int = MAX_PENDING,
+    ):
+        super().__init__()
+        self._loop = loop
+        self._follow_running_loop = loop is None
+        self._max_pending = max_pending
+        self._pending = 0
+        self._dropped_count = 0
+
+    def publish(self, event: CircuitBreakerEvent):
+        loop = self._loop
+        if self._follow_running_loop and (loop is None or loop.is_closed()):
+            try:
+                loop = self._loop = asyncio.get_running_loop()
+            except RuntimeError:
+                pass
+
+        with self._lock:
+            if loop is None or self._pending >= self._max_pending:
+                self._dropped_count += 1
+                return
+            self._pending += 1
+
+        try:
+            loop.call_soon_threadsafe(self._deliver, loop, event)
+        except RuntimeError:
+            # The loop was closed
+            with self._lock:
+                self._pending -= 1
+                self._dropped_count += 1
+
+    @property
+    def dropped_count(self) -> int:
+        """
+        The number of events dropped because too many were waiting or no loop
+        could deliver them
+        """
+        return self._dropped_count
+
+    def _deliver(self, loop: asyncio.AbstractEventLoop, event: CircuitBreakerEvent):
+        with self._lock:
+            self._pending -= 1
+
+        for listener in self._listeners_for(event):
+            try:
+                result = listener(event)
+            except Exception:
+                logger.exception("Breaker event listener failed")
+                continue
+
+            if isawaitable(result):
+                loop.create_task(self._await(result))
+
+    @staticmethod
+    async def _await(result):
+        try:
+            await result
+        except Exception:
+            logger.exception("Breaker event listener failed")
@@ -1,21 +1,82 @@
-from datetime import datetime
-
-
 class CircuitBreakerException(Exception):
     def __init__(self, breaker, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._breaker = breaker
 
     def __str__(self):
-        seconds_remaining = (
-            self._breaker.recovery_start_time - datetime.utcnow()
-        ).total_seconds()
         return (
             f"Circuit {self._breaker.id} OPEN "
             f"until {self._breaker.recovery_start_time.isoformat()} "
-            f"({self._breaker.error_count} errors, {seconds_remaining} sec remaining)"
+            f"({self._breaker.error_count} errors, "
+            f"{self._breaker.recovery_time_remaining} sec remaining of "
+            f"{self._breaker.recovery_timeout} sec timeout)"
+        )
+
+
+class BulkheadFullException(CircuitBreakerException):
+    """
+    Raised instead of making a call when the bulkhead of the breaker is full
+    """
+
+    def __str__(self):
+        return (
+            f"Circuit {self._breaker.id} bulkhead full "
+            f"({self._breaker.bulkhead.max_concurrent_calls} concurrent calls)"
+        )
+
+
+class TimeoutExecutorFullException(CircuitBreakerException):
+    """
+    Raised instead of making a call when the timeout executor of the breaker
+    is full
+    """
+
+    def __str__(self):
+        executor = self._breaker.timeout_executor
+        return (
+            f"Circuit {self._breaker.id} timeout executor full "
+            f"({executor.max_workers} workers, "
+            f"{executor.max_queue_size} queued calls)"
+        )
+
+
+class ThrottledException(CircuitBreakerException):
+    """
+    Raised instead of making a call that the adaptive strategy of the breaker
+    chose to shed
+    """
+
+    def __init__(self, breaker, rejection_rate, *args, **kwargs):
+        super().__init__(breaker, *args, **kwargs)
+        self.rejection_rate = rejection_rate
+
+    def __str__(self):
+        return (
+            f"Circuit {self._breaker.id} throttled "
+            f"({self.rejection_rate:.0%} of calls rejected)"
+        )
+
+
+class CallTimeoutException(TimeoutError):
+    """
+    Raised when a call made through a breaker does not complete within the
+    timeout of the breaker. It always counts as an error
+    """
+
+    def __init__(self, breaker, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._breaker = breaker
+
+    def __str__(self):
+        return (
+            f"Call through circuit {self._breaker.id} timed out "
+            f"after {self._breaker.timeout} sec"
         )
 
 
 class CircuitBreakerRegistryException(Exception):
     pass
+
+
+class CircuitBreakerStoreException(Exception):
+    pass
@@ -0,0 +1,195 @@
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, List, Tuple
+
+from .state import CircuitBreakerState
+
+# Upper bounds of the latency buckets in seconds, doubling from 1 millisecond
+# to about 33 seconds. Slower calls fall in a final unbounded bucket
+LATENCY_BUCKETS = tuple(0.001 * 2**power for power in range(16))
+
+
+class LatencyHistogram:
+    """
+    Counts call latencies in fixed log scale buckets. The counts are held in
+    a preallocated array that recording a latency updates in place
+    """
+
+    __slots__ = ("_counts", "_sum")
+
+    def __init__(self):
+        self._counts = array("Q", bytes(8 * (len(LATENCY_BUCKETS) + 1)))
+        self._sum = 0.0
+
+    def observe(self, seconds: float):
+        self._counts[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+        self._sum += seconds
+
+    @property
+    def buckets(self) -> List[Tuple[float, int]]:
+        """
+        The cumulative count of latencies at or below each bucket bound,
+        ending with the total for an infinite bound
+        """
+        buckets = []
+        total = 0
+        for bound, count in zip(LATENCY_BUCKETS + (float("inf"),), self._counts):
+            total += count
+            buckets.append((bound, total))
+
+        return buckets
+
+    @property
+    def count(self) -> int:
+        return sum(self._counts)
+
+    @property
+    def sum(self) -> float:
+        return self._sum
+
+
+class BreakerMetrics:
+    """
+    Counts the calls made through a breaker and their outcomes.
+
+    Counters are updated without a lock to keep the overhead low, so counts
+    from calls racing in different threads may occasionally be lost
+    """
+
+    __slots__ = (
+        "calls",
+        "failures",
+        "latency",
+        "rejections",
+        "successes",
+        "transitions",
+    )
+
+    def __init__(self):
+        self.calls = 0
+        self.successes = 0
+        self.failures: Dict[str, int] = {}
+        self.rejections: Dict[str, int] = {
+            "bulkhead": 0,
+            "executor": 0,
+            "open": 0,
+            "throttled": 0,
+        }
+        self.transitions: Dict[CircuitBreakerState, int] = {
+            CircuitBreakerState.CLOSED: 0,
+            CircuitBreakerState.OPEN: 0,
+        }
+        self.latency = LatencyHistogram()
+
+    def record_failure(self, kind: str):
+        self.failures[kind] = self.failures.get(kind, 0) + 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": dict(self.failures),
+            "rejections": dict(self.rejections),
+            "transitions": {
+                state.name: count for state, count in self.transitions.items()
+            },
+            "latency": {
+                "buckets": self.latency.buckets,
+                "count": self.latency.count,
+                "sum": self.latency.sum,
+            },
+        }
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    pairs = (f'{name}="{_escape(value)}"' for name, value in labels.items())
+    return "{" + ",".join(pairs) + "}"
+
+
+def _bound(bound: float) -> str:
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def render_prometheus(snapshots: Dict[Any, Dict[str, Any]]) -> str:
+    """
+    Render breaker snapshots, as returned by CircuitBreakerRegistry.get_metrics,
+    in the Prometheus text exposition format
+    """
+    families = {
+        "state": ("gauge", "Whether the breaker is in the state."),
+        "calls_total": ("counter", "Calls made through the breaker."),
+        "successes_total": ("counter", "Calls that succeeded."),
+        "failures_total": ("counter", "Calls that failed, by exception type."),
+        "rejections_total": ("counter", "Calls rejected by the breaker."),
+        "transitions_total": ("counter", "Transitions of the breaker to a state."),
+        "call_duration_seconds": ("histogram", "Duration of calls in seconds."),
+        "executor_workers": ("gauge", "Threads of the timeout executor."),
+        "executor_running_calls": ("gauge", "Calls running in the timeout executor."),
+        "executor_queue_depth": (
+            "gauge",
+            "Calls waiting for a thread of the timeout executor.",
+        ),
+    }
+    samples: Dict[str, List[str]] = {name: [] for name in families}
+
+    for breaker_id, snapshot in snapshots.items():
+        for state in CircuitBreakerState:
+            value = int(snapshot["state"] == state.name)
+            labels = _labels(breaker=breaker_id, state=state.name)
+            samples["state"].append(f"state{labels} {value}")
+
+        executor = snapshot.get("executor")
+        if executor is not None:
+            labels = _labels(breaker=breaker_id)
+            samples["executor_workers"].append(
+                f"executor_workers{labels} {executor['max_workers']}"
+            )
+            samples["executor_running_calls"].append(
+                f"executor_running_calls{labels} {executor['running_calls']}"
+            )
+            samples["executor_queue_depth"].append(
+                f"executor_queue_depth{labels} {executor['queue_depth']}"
+            )
+
+        metrics = snapshot.get("metrics")
+        if metrics is None:
+            continue
+
+        labels = _labels(breaker=breaker_id)
+        samples["calls_total"].append(f"calls_total{labels} {metrics['calls']}")
+        samples["successes_total"].append(
+            f"successes_total{labels} {metrics['successes']}"
+        )
+        for kind, count in metrics["failures"].items():
+            labels = _labels(breaker=breaker_id, exception=kind)
+            samples["failures_total"].append(f"failures_total{labels} {count}")
+        for reason, count in metrics["rejections"].items():
+            labels = _labels(breaker=breaker_id, reason=reason)
+            samples["rejections_total"].append(f"rejections_total{labels} {count}")
+        for state, count in metrics["transitions"].items():
+            labels = _labels(breaker=breaker_id, state=state)
+            samples["transitions_total"].append(f"transitions_total{labels} {count}")
+
+        latency = metrics["latency"]
+        histogram = samples["call_duration_seconds"]
+        for bound, count in latency["buckets"]:
+            labels = _labels(breaker=breaker_id, le=_bound(bound))
+            histogram.append(f"call_duration_seconds_bucket{labels} {count}")
+        labels = _labels(breaker=breaker_id)
+        histogram.append(f"call_duration_seconds_sum{labels} {latency['sum']!r}")
+        histogram.append(f"call_duration_seconds_count{labels} {latency['count']}")
+
+    lines = []
+    for name, (kind, description) in families.items():
+        if not samples[name]:
+            continue
+
+        lines.append(f"# HELP pycircuitbreaker_{name} {description}")
+        lines.append(f"# TYPE pycircuitbreaker_{name} {kind}")
+        lines.extend(f"pycircuitbreaker_{sample}" for sample in samples[name])
+
+    return "\n".join(lines) + "\n"
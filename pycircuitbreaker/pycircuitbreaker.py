@@ -1,133 +1,1163 @@
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta
-from functools import lru_cache, wraps
-from typing import Callable, Iterable, Optional, List
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import wraps
+from heapq import heappop, heappush
+from inspect import isawaitable, iscoroutinefunction
+from itertools import count, repeat
+from threading import local, Lock, RLock
+from time import monotonic, perf_counter
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Set, Tuple
 from uuid import uuid4
+from weakref import finalize, WeakValueDictionary
 
-from .exceptions import CircuitBreakerException, CircuitBreakerRegistryException
-from .state import CircuitBreakerState
+from .backoff import ExponentialBackoff
+from .batch import CallOutcome
+from .bulkhead import Bulkhead
+from .cache import ResultCache
+from .metrics import BreakerMetrics, render_prometheus
+from .retry import RetryPolicy
+from .single_flight import SingleFlight
+from .timeout import default_executor, TimeoutExecutor
+from .classifier import ExceptionClassifier
+from .events import CircuitBreakerEvent, CircuitBreakerEventType, EventBus
+from .exceptions import (
+    BulkheadFullException,
+    CallTimeoutException,
+    CircuitBreakerException,
+    CircuitBreakerRegistryException,
+    ThrottledException,
+    TimeoutExecutorFullException,
+)
+from .state import (
+    CircuitBreakerState,
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    STATE_CODES,
+    STATES,
+)
+from .stores import SlotRecord, StateStore
 from .strategies import CircuitBreakerStrategy, get_strategy
 
 
-@lru_cache()
-def exception_in_list(exception: Exception, type_list: Iterable[Exception]):
+class _NullLock:
     """
-    Check if the exception matches any type in the list considering derived types
+    Stand-in for a lock used when a breaker is not shared between threads
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_LOCK = _NullLock()
 
-    This was extracted from the CircuitBreaker class to enable use of the lru_cache
+
+class _BreakerConfig:
+    """
+    The immutable configuration of a breaker.
+
+    Breakers created with equal settings share a single config, so a large
+    number of breakers only pays for the state that differs between them
     """
-    return any(isinstance(exception, exc_type) for exc_type in type_list)
+
+    __slots__ = (
+        "bulkhead",
+        "classifier",
+        "clock",
+        "detect_error",
+        "error_threshold",
+        "event_bus",
+        "fallback",
+        "fast_path",
+        "half_open_max_calls",
+        "metrics",
+        "on_close",
+        "on_open",
+        "recovery_backoff",
+        "recovery_threshold",
+        "recovery_timeout",
+        "retry",
+        "single_flight",
+        "slow_call_threshold",
+        "stale_cache",
+        "strategy",
+        "strategy_options",
+        "thread_safe",
+        "throttled",
+        "timed",
+        "timeout",
+        "timeout_executor",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        bulkhead,
+        clock,
+        detect_error,
+        error_threshold,
+        event_bus,
+        exception_allowlist,
+        exception_denylist,
+        fallback,
+        half_open_max_calls,
+        metrics,
+        on_close,
+        on_open,
+        recovery_backoff,
+        recovery_threshold,
+        recovery_timeout,
+        retry,
+        single_flight,
+        slow_call_threshold,
+        stale_cache,
+        strategy,
+        strategy_options,
+        thread_safe,
+        timeout,
+        timeout_executor,
+    ):
+        self.bulkhead = bulkhead
+        self.classifier = ExceptionClassifier(
+            exception_allowlist=exception_allowlist,
+            exception_denylist=exception_denylist,
+        )
+        self.clock = clock
+        self.detect_error = detect_error
+        self.error_threshold = error_threshold
+        self.event_bus = event_bus
+        self.fallback = fallback
+        self.half_open_max_calls = half_open_max_calls
+        self.metrics = metrics
+        self.on_close = on_close
+        self.on_open = on_open
+        self.recovery_backoff = recovery_backoff
+        self.recovery_threshold = recovery_threshold
+        self.recovery_timeout = recovery_timeout
+        self.retry = retry
+        self.single_flight = single_flight
+        self.slow_call_threshold = slow_call_threshold
+        self.stale_cache = stale_cache
+        self.strategy = get_strategy(strategy)
+        self.strategy_options = dict(strategy_options or {})
+        self.thread_safe = thread_safe
+        # Whether the strategy may reject calls while the breaker is closed
+        self.throttled = hasattr(self.strategy, "allow_request")
+        self.timeout = timeout
+        self.timeout_executor = timeout_executor
+        self.timed = metrics or slow_call_threshold is not None
+        # Whether a success may skip the breaker while it is closed without
+        # errors, because nothing else needs to see the call
+        self.fast_path = (
+            bulkhead is None
+            and detect_error is None
+            and event_bus is None
+            and retry is None
+            and single_flight is None
+            and stale_cache is None
+            and timeout is None
+            and not self.timed
+        )
+
+
+_configs: "WeakValueDictionary[Tuple, _BreakerConfig]" = WeakValueDictionary()
+
+
+def _typed(items: Iterable[Tuple[str, Any]]) -> Tuple:
+    return tuple((name, type(value), value) for name, value in items)
+
+
+def _get_config(**settings) -> _BreakerConfig:
+    """
+    The shared config for the settings, created if no live breaker uses it
+    """
+    for name in ("exception_allowlist", "exception_denylist"):
+        settings[name] = tuple(settings[name] or ())
+    settings["strategy_options"] = tuple(
+        sorted((settings["strategy_options"] or {}).items())
+    )
+
+    # Values that are equal but of a different type, such as False, 0 and
+    # 0.0, must not share a config
+    key = _typed(sorted(settings.items())) + _typed(settings["strategy_options"])
+    try:
+        config = _configs.get(key)
+    except TypeError:
+        # Settings that cannot be hashed are not shared
+        return _BreakerConfig(**settings)
+
+    if config is None:
+        config = _configs.setdefault(key, _BreakerConfig(**settings))
+
+    return config
+
+
+_batch_executor: Optional[ThreadPoolExecutor] = None
+_batch_executor_lock = Lock()
+_batch_worker = local()
+
+
+def _mark_batch_worker():
+    _batch_worker.active = True
+
+
+def _default_batch_executor() -> ThreadPoolExecutor:
+    """
+    The pool shared by batches that were not given an executor, created when
+    first needed
+    """
+    global _batch_executor
+
+    with _batch_executor_lock:
+        if _batch_executor is None:
+            _batch_executor = ThreadPoolExecutor(
+                CircuitBreaker.BATCH_CHUNK_SIZE,
+                thread_name_prefix="pycircuitbreaker-batch",
+                initializer=_mark_batch_worker,
+            )
+
+        return _batch_executor
 
 
 class CircuitBreaker:
+    BATCH_CHUNK_SIZE = 32
     ERROR_THRESHOLD = 5
     RECOVERY_THRESHOLD = 1
     RECOVERY_TIMEOUT = 30
 
+    __slots__ = (
+        "_config",
+        "_effective_recovery_timeout",
+        "_failed_recoveries",
+        "_fast_path",
+        "_id",
+        "_lock",
+        "_metrics",
+        "_open_until",
+        "_opened_at",
+        "_probe_generation",
+        "_probe_lock",
+        "_probes_in_flight",
+        "_slot",
+        "_strategy",
+        "_transition_listeners",
+        "__weakref__",
+    )
+
     def __init__(
         self,
         breaker_id: Optional = None,
+        bulkhead: Optional[Bulkhead] = None,
+        clock: Callable[[], float] = monotonic,
         detect_error: Optional[Callable] = None,
         error_threshold: int = ERROR_THRESHOLD,
+        event_bus: Optional[EventBus] = None,
         exception_denylist: Optional[Iterable[Exception]] = None,
         exception_allowlist: Optional[Iterable[Exception]] = None,
+        fallback: Optional[Any] = None,
+        half_open_max_calls: Optional[int] = None,
+        metrics: bool = False,
         on_close: Optional[Callable] = None,
         on_open: Optional[Callable] = None,
+        recovery_backoff: Optional[ExponentialBackoff] = None,
         recovery_threshold: int = RECOVERY_THRESHOLD,
         recovery_timeout: int = RECOVERY_TIMEOUT,
+        retry: Optional[RetryPolicy] = None,
+        single_flight: Optional[SingleFlight] = None,
+        slow_call_threshold: Optional[float] = None,
+        stale_cache: Optional[ResultCache] = None,
+        store: Optional[StateStore] = None,
         strategy: CircuitBreakerStrategy = CircuitBreakerStrategy.SINGLE_RESET,
+        strategy_options: Optional[Mapping[str, Any]] = None,
+        thread_safe: bool = False,
+        timeout: Optional[float] = None,
+        timeout_executor: Optional[TimeoutExecutor] = None,
     ):
+        if timeout is None:
+            timeout_executor = None
+        elif timeout_executor is None:
+            timeout_executor = default_executor()
+
+        config = _get_config(
+            bulkhead=bulkhead,
+            clock=clock,
+            detect_error=detect_error,
+            error_threshold=error_threshold,
+            event_bus=event_bus,
+            exception_allowlist=exception_allowlist,
+            exception_denylist=exception_denylist,
+            fallback=fallback,
+            half_open_max_calls=half_open_max_calls,
+            metrics=metrics,
+            on_close=on_close,
+            on_open=on_open,
+            recovery_backoff=recovery_backoff,
+            recovery_threshold=recovery_threshold,
+            recovery_timeout=recovery_timeout,
+            retry=retry,
+            single_flight=single_flight,
+            slow_call_threshold=slow_call_threshold,
+            stale_cache=stale_cache,
+            strategy=strategy,
+            strategy_options=strategy_options,
+            thread_safe=thread_safe,
+            timeout=timeout,
+            timeout_executor=timeout_executor,
+        )
+        self._config = config
         self._id = breaker_id or uuid4()
-        self._detect_error = detect_error
-        self._exception_denylist = frozenset(exception_denylist or [])
-        self._exception_allowlist = frozenset(exception_allowlist or [])
-        self._on_close = on_close
-        self._on_open = on_open
-        self._recovery_timeout = recovery_timeout
-        self._time_opened = datetime.utcnow()
-
-        Strategy = get_strategy(strategy)
-        self._strategy = Strategy(
-            error_threshold=error_threshold, recovery_threshold=recovery_threshold
+        self._effective_recovery_timeout = recovery_timeout
+        self._failed_recoveries = 0
+        self._opened_at = clock()
+        self._open_until = self._opened_at + recovery_timeout
+        self._lock = Lock() if thread_safe else _NULL_LOCK
+        self._metrics = BreakerMetrics() if metrics else None
+        self._probe_generation = 0
+        self._probe_lock = Lock()
+        self._probes_in_flight = 0
+        self._transition_listeners: Tuple[Callable, ...] = ()
+
+        self._strategy = config.strategy(
+            error_threshold=error_threshold,
+            recovery_threshold=recovery_threshold,
+            clock=clock,
+            **config.strategy_options,
         )
 
+        self._slot = None
+        if store is not None:
+            self._slot = store.slot(self._id)
+            self._slot.configure(error_threshold, recovery_timeout, clock)
+        self._update_fast_path()
+
     def call(self, func, *args, **kwargs):
         """
         Call the supplied function respecting the circuit breaker rule
         """
-        if self.state == CircuitBreakerState.OPEN:
-            raise CircuitBreakerException(self)
+        if self._fast_path:
+            try:
+                return func(*args, **kwargs)
+            except Exception as ex:
+                self._handle_exception(ex)
+                raise
 
-        result = None
+        single_flight = self._config.single_flight
+        if single_flight is not None:
+            key = single_flight.key(func, args, kwargs)
+            if key is not None:
+                return single_flight.call(key, self._call, func, args, kwargs)
+
+        return self._call(func, args, kwargs)
+
+    def _call(self, func, args, kwargs):
+        retry = self._config.retry
+        if retry is not None:
+            return retry.call(self._attempt, func, args, kwargs, stop=self._is_open)
+
+        return self._attempt(func, args, kwargs)
+
+    def _attempt(self, func, args, kwargs):
+        try:
+            probe = self._check_state()
+            bulkhead = self._config.bulkhead
+            if bulkhead is not None and not bulkhead.acquire():
+                self._reject(probe)
+            executor = self._config.timeout_executor
+            if executor is not None and not executor.acquire():
+                if bulkhead is not None:
+                    bulkhead.release()
+                self._reject(probe, TimeoutExecutorFullException)
+        except CircuitBreakerException as ex:
+            self._record_rejection(ex)
+            return self._fall_back(ex, func, args, kwargs)
+
+        start = perf_counter() if self._config.timed else None
+
+        try:
+            if executor is None:
+                result = func(*args, **kwargs)
+            else:
+                result = self._run_with_timeout(executor, func, args, kwargs)
+        except Exception as ex:
+            self._handle_exception(ex, self._finish(start), probe)
+            raise
+        else:
+            if self._handle_result(result, self._finish(start), probe):
+                self._cache_result(func, args, kwargs, result)
+            return result
+        finally:
+            if bulkhead is not None:
+                bulkhead.release()
+            if probe is not None:
+                self._release_probe(probe)
+
+    async def call_async(self, func, *args, **kwargs):
+        """
+        Await the supplied coroutine function respecting the circuit breaker rule.
+        Error detection is applied to the awaited result rather than the coroutine
+        """
+        if self._fast_path:
+            try:
+                return await func(*args, **kwargs)
+            except Exception as ex:
+                self._handle_exception(ex)
+                raise
+
+        single_flight = self._config.single_flight
+        if single_flight is not None:
+            key = single_flight.key(func, args, kwargs)
+            if key is not None:
+                return await single_flight.call_async(
+                    key, self._call_async, func, args, kwargs
+                )
+
+        return await self._call_async(func, args, kwargs)
+
+    async def _call_async(self, func, args, kwargs):
+        retry = self._config.retry
+        if retry is not None:
+            return await retry.call_async(
+                self._attempt_async, func, args, kwargs, stop=self._is_open
+            )
+
+        return await self._attempt_async(func, args, kwargs)
+
+    async def _attempt_async(self, func, args, kwargs):
+        try:
+            probe = self._check_state()
+            bulkhead = self._config.bulkhead
+            if bulkhead is not None and not await bulkhead.acquire_async():
+                self._reject(probe)
+        except CircuitBreakerException as ex:
+            self._record_rejection(ex)
+            result = self._fall_back(ex, func, args, kwargs)
+            return await result if isawaitable(result) else result
+
+        start = perf_counter() if self._config.timed else None
 
         try:
-            result = func(*args, **kwargs)
+            if self._config.timeout is None:
+                result = await func(*args, **kwargs)
+            else:
+                result = await self._await_with_timeout(func(*args, **kwargs))
         except Exception as ex:
-            if not self._exception_allowlisted(ex) and self._exception_denylisted(ex):
-                self._handle_error(ex)
+            self._handle_exception(ex, self._finish(start), probe)
             raise
+        else:
+            if self._handle_result(result, self._finish(start), probe):
+                self._cache_result(func, args, kwargs, result)
+            return result
+        finally:
+            if bulkhead is not None:
+                bulkhead.release()
+            if probe is not None:
+                self._release_probe(probe)
+
+    def call_many(
+        self,
+        func: Callable,
+        items: Iterable[Tuple],
+        chunk_size: int = BATCH_CHUNK_SIZE,
+        executor: Optional[Executor] = None,
+    ) -> List[CallOutcome]:
+        """
+        Call func once with each tuple of arguments in items and return the
+        outcome of each call. The calls of each chunk of chunk_size items run
+        concurrently on executor, or on a pool shared by all breakers. The
+        outcomes of a chunk are recorded together, so items left when the
+        breaker opens are rejected without being called
+        """
+        self._check_batch(chunk_size)
+
+        items = list(items)
+        outcomes: List[CallOutcome] = []
+        # A batch made by an item of another batch gets a pool of its own, as
+        # waiting on the shared pool from one of its threads could deadlock
+        own_pool = executor is None and getattr(_batch_worker, "active", False)
+        if own_pool:
+            pool = ThreadPoolExecutor(
+                max(1, min(chunk_size, len(items))),
+                thread_name_prefix="pycircuitbreaker-batch",
+                initializer=_mark_batch_worker,
+            )
+        else:
+            pool = executor or _default_batch_executor()
+
+        try:
+            while len(outcomes) < len(items):
+                chunk, probe, rejection = self._admit_chunk(
+                    items, len(outcomes), chunk_size
+                )
+                admitted = [args for args in chunk if not isinstance(args, CallOutcome)]
+                try:
+                    runs = list(pool.map(self._run_item, repeat(func), admitted))
+                    recorded = self._record_batch(func, admitted, runs, probe)
+                finally:
+                    if probe is not None:
+                        self._release_probe(probe)
+
+                outcomes.extend(self._merge_batch(chunk, recorded))
+                if rejection is not None:
+                    outcomes.extend(
+                        self._reject_batch(rejection, len(items) - len(outcomes))
+                    )
+        finally:
+            if own_pool:
+                pool.shutdown()
+
+        return outcomes
+
+    async def gather(
+        self,
+        func: Callable,
+        items: Iterable[Tuple],
+        chunk_size: int = BATCH_CHUNK_SIZE,
+    ) -> List[CallOutcome]:
+        """
+        Await the coroutine function func once with each tuple of arguments
+        in items and return the outcome of each call. The calls of each chunk
+        of chunk_size items are awaited concurrently, and recorded as for
+        call_many
+        """
+        self._check_batch(chunk_size)
+
+        items = list(items)
+        outcomes: List[CallOutcome] = []
+
+        while len(outcomes) < len(items):
+            chunk, probe, rejection = self._admit_chunk(
+                items, len(outcomes), chunk_size
+            )
+            admitted = [args for args in chunk if not isinstance(args, CallOutcome)]
+            try:
+                runs = await asyncio.gather(
+                    *(self._run_item_async(func, args) for args in admitted)
+                )
+                recorded = self._record_batch(func, admitted, runs, probe)
+            finally:
+                if probe is not None:
+                    self._release_probe(probe)
+
+            outcomes.extend(self._merge_batch(chunk, recorded))
+            if rejection is not None:
+                outcomes.extend(
+                    self._reject_batch(rejection, len(items) - len(outcomes))
+                )
+
+        return outcomes
+
+    def _check_batch(self, chunk_size: int):
+        if chunk_size < 1:
+            raise ValueError(f"chunk_size must be at least 1, got {chunk_size}")
+
+        config = self._config
+        unsupported = [
+            name
+            for name in ("fallback", "retry", "single_flight")
+            if getattr(config, name) is not None
+        ]
+        if unsupported:
+            raise ValueError(
+                f"Batches are not supported by breakers with {', '.join(unsupported)}"
+                ", make a call per item instead"
+            )
+
+    def _admit_chunk(
+        self, items: List[Tuple], start: int, chunk_size: int
+    ) -> Tuple[List, Optional[int], Optional[CircuitBreakerException]]:
+        """
+        Check the breaker once for each item of the chunk starting at start.
+
+        Returns the chunk, with the arguments of the items admitted and the
+        outcome of the items shed by the strategy, the recovery probe, and
+        the exception if the breaker rejects the rest of the batch. Recovery
+        probes are made one at a time
+        """
+        chunk = []
+        for args in items[start : start + chunk_size]:
+            try:
+                probe = self._check_state()
+            except ThrottledException as ex:
+                self._record_rejection(ex)
+                chunk.append(CallOutcome(exception=ex, rejected=True))
+                continue
+            except CircuitBreakerException as ex:
+                return chunk, None, ex
+
+            if probe is None:
+                chunk.append(args)
+                continue
+
+            if chunk:
+                # Make the probe with the next chunk
+                self._release_probe(probe)
+                break
+
+            return [args], probe, None
+
+        return chunk, None, None
+
+    @staticmethod
+    def _merge_batch(chunk: List, recorded: List[CallOutcome]) -> List[CallOutcome]:
+        """
+        The outcomes of a chunk in order, from the outcomes of the items shed
+        and of the calls made
+        """
+        recorded = iter(recorded)
+        return [
+            args if isinstance(args, CallOutcome) else next(recorded) for args in chunk
+        ]
+
+    def _run_item(self, func, args):
+        bulkhead = self._config.bulkhead
+        if bulkhead is not None and not bulkhead.acquire():
+            return None, BulkheadFullException(self), False, True
+
+        try:
+            executor = self._config.timeout_executor
+            if executor is not None and not executor.acquire():
+                return None, TimeoutExecutorFullException(self), False, True
+
+            start = perf_counter() if self._config.timed else None
+            try:
+                if executor is None:
+                    result = func(*args)
+                else:
+                    result = self._run_with_timeout(executor, func, args, {})
+            except Exception as ex:
+                return None, ex, self._finish(start), False
+
+            return result, None, self._finish(start), False
+        finally:
+            if bulkhead is not None:
+                bulkhead.release()
+
+    async def _run_item_async(self, func, args):
+        bulkhead = self._config.bulkhead
+        if bulkhead is not None and not await bulkhead.acquire_async():
+            return None, BulkheadFullException(self), False, True
+
+        try:
+            start = perf_counter() if self._config.timed else None
+            try:
+                if self._config.timeout is None:
+                    result = await func(*args)
+                else:
+                    result = await self._await_with_timeout(func(*args))
+            except Exception as ex:
+                return None, ex, self._finish(start), False
+
+            return result, None, self._finish(start), False
+        finally:
+            if bulkhead is not None:
+                bulkhead.release()
+
+    def _reject_batch(
+        self, exception: CircuitBreakerException, count: int
+    ) -> List[CallOutcome]:
+        for _ in range(count):
+            self._record_rejection(exception)
+
+        return [CallOutcome(exception=exception, rejected=True)] * count
+
+    def _record_batch(self, func, chunk, runs, probe) -> List[CallOutcome]:
+        """
+        Record the outcomes of a chunk of calls, updating the strategy once
+        for the whole chunk
+        """
+        outcomes = []
+        recorded = []
+        detect_error = self._config.detect_error
+
+        for args, (result, exception, slow, rejected) in zip(chunk, runs):
+            if rejected:
+                # Rejected by the bulkhead or timeout executor
+                self._record_rejection(exception)
+                outcomes.append(CallOutcome(exception=exception, rejected=True))
+                continue
+
+            if exception is not None:
+                outcomes.append(CallOutcome(exception=exception))
+                if self._is_error(exception):
+                    self._count_error(exception)
+                    recorded.append((exception, True, slow))
+                else:
+                    self._publish(
+                        CircuitBreakerEventType.IGNORED_ERROR, error=exception
+                    )
+                continue
+
+            outcomes.append(CallOutcome(result=result))
+            if detect_error is not None and detect_error(result):
+                self._count_error(result)
+                recorded.append((result, True, slow))
+                continue
+
+            if self._metrics is not None:
+                self._metrics.successes += 1
+            self._publish(CircuitBreakerEventType.SUCCESS)
+            self._cache_result(func, args, {}, result)
+            recorded.append((result, False, slow))
+
+        if recorded:
+            self._update_batch(recorded, probe)
+
+        return outcomes
+
+    def _update_batch(self, recorded, probe):
+        opened_by = None
+        closed = False
+
+        with self._transaction():
+            previous_state = self._state_code()
+            if not self._counts(previous_state, probe):
+                return
+
+            strategy = self._strategy
+            for subject, failed, slow in recorded:
+                if failed:
+                    opened = strategy.handle_error(slow)
+                elif slow:
+                    opened = strategy.handle_slow_success()
+                else:
+                    was_closed = strategy.state_code == CLOSED
+                    strategy.handle_success()
+                    if not was_closed and strategy.state_code == CLOSED:
+                        self._failed_recoveries = 0
+                        closed = True
+                    continue
+
+                if self._mark_opened(opened, previous_state):
+                    # Later outcomes of the chunk no longer count
+                    opened_by = subject
+                    break
+
+            self._update_fast_path()
+
+        if opened_by is not None:
+            self._notify_opened(opened_by)
+        elif closed:
+            self._notify_closed()
+
+    def _check_state(self) -> Optional[int]:
+        """
+        Raise if the breaker does not admit a call. Calls admitted while the
+        breaker is half open are recovery probes, identified by the number of
+        times the breaker has opened
+        """
+        state = self._state_code()
+        if state == CLOSED:
+            if self._config.throttled:
+                self._throttle()
+            return None
 
-        if self._detect_error is not None and self._detect_error(result):
-            self._handle_error(result)
+        if state == OPEN:
+            raise CircuitBreakerException(self)
+
+        # Another process may have started this recovery period
+        self._refresh()
+
+        with self._probe_lock:
+            if (
+                self._config.half_open_max_calls is not None
+                and self._probes_in_flight >= self._config.half_open_max_calls
+            ):
+                raise CircuitBreakerException(self)
+
+            self._probes_in_flight += 1
+            return self._probe_generation
+
+    def _throttle(self):
+        """
+        Raise if the strategy sheds the call
+        """
+        with self._lock:
+            if self._strategy.allow_request():
+                return
+
+            rejection_rate = self._strategy.rejection_rate
+
+        raise ThrottledException(self, rejection_rate)
+
+    def _reject(self, probe: Optional[int], exception=BulkheadFullException):
+        """
+        Fail a call rejected by the bulkhead or timeout executor. It is not
+        counted as an error
+        """
+        if probe is not None:
+            self._release_probe(probe)
+
+        raise exception(self)
+
+    def _run_with_timeout(self, executor: TimeoutExecutor, func, args, kwargs):
+        future = executor.submit(func, args, kwargs)
+        if not wait((future,), self._config.timeout).done:
+            # A call still waiting for a thread is not started at all
+            future.cancel()
+            raise CallTimeoutException(self)
+
+        return future.result()
+
+    async def _await_with_timeout(self, awaitable):
+        try:
+            return await asyncio.wait_for(awaitable, self._config.timeout)
+        except asyncio.TimeoutError:
+            raise CallTimeoutException(self) from None
+
+    def _state_code(self) -> int:
+        if self._slot is None:
+            state = self._strategy.state_code
+            open_until = self._open_until
+        else:
+            state, open_until = self._slot.read_state()
+            state = STATE_CODES[state]
+
+        if state == OPEN and self._config.clock() >= open_until:
+            return HALF_OPEN
+
+        return state
+
+    def _is_open(self) -> bool:
+        return self._state_code() == OPEN
+
+    def _release_probe(self, probe: int):
+        with self._probe_lock:
+            # Probes from an earlier recovery period no longer hold a slot
+            if probe == self._probe_generation:
+                self._probes_in_flight -= 1
+
+    def _counts(self, state: int, probe: Optional[int]) -> bool:
+        """
+        Once the breaker has opened only the outcome of recovery probes counts.
+        Calls admitted before the breaker opened are ignored
+        """
+        return state == CLOSED or (
+            state == HALF_OPEN and probe == self._probe_generation
+        )
+
+    def _finish(self, start: Optional[float]) -> bool:
+        """
+        Record the latency of a call started at start and return whether it
+        was slow
+        """
+        if start is None:
+            return False
+
+        elapsed = perf_counter() - start
+        metrics = self._metrics
+        if metrics is not None:
+            metrics.calls += 1
+            metrics.latency.observe(elapsed)
+
+        threshold = self._config.slow_call_threshold
+        if threshold is None or elapsed < threshold:
+            return False
+
+        self._publish(CircuitBreakerEventType.SLOW_CALL, elapsed=elapsed)
+        return True
+
+    def _publish(self, event_type: CircuitBreakerEventType, **fields):
+        event_bus = self._config.event_bus
+        if event_bus is not None:
+            event_bus.publish(CircuitBreakerEvent(event_type, self, **fields))
+
+    def _record_rejection(self, exception: CircuitBreakerException):
+        if self._metrics is not None:
+            if isinstance(exception, BulkheadFullException):
+                reason = "bulkhead"
+            elif isinstance(exception, TimeoutExecutorFullException):
+                reason = "executor"
+            elif isinstance(exception, ThrottledException):
+                reason = "throttled"
+            else:
+                reason = "open"
+            self._metrics.rejections[reason] += 1
+
+        self._publish(CircuitBreakerEventType.REJECTED, error=exception)
+
+    def _handle_exception(self, exception, slow=False, probe=None):
+        if self._is_error(exception):
+            self._handle_error(exception, slow, probe)
         else:
-            self._handle_success()
+            self._publish(CircuitBreakerEventType.IGNORED_ERROR, error=exception)
 
-        return result
+    def _is_error(self, exception) -> bool:
+        # Timeouts count as errors whatever the exception lists say
+        timed_out = isinstance(exception, CallTimeoutException)
+        return timed_out or self._config.classifier.is_error(exception)
 
-    def _exception_denylisted(self, exception):
+    def _handle_result(self, result, slow=False, probe=None) -> bool:
         """
-        Determine if an exception type is denylisted by checking to see
-        if it matches any type in the denylist
+        Record the result of a call. Returns False if the result is an error
         """
-        if not self._exception_denylist or type(exception) in self._exception_denylist:
-            return True
+        if self._config.detect_error is not None and self._config.detect_error(result):
+            self._handle_error(result, slow, probe)
+            return False
+
+        if self._metrics is not None:
+            self._metrics.successes += 1
+
+        if self._config.event_bus is not None:
+            self._publish(CircuitBreakerEventType.SUCCESS)
+
+        if slow:
+            self._handle_slow_success(result, probe)
+        else:
+            self._handle_success(probe)
+
+        return True
 
-        return exception_in_list(exception, self._exception_denylist)
+    def _cache_result(self, func, args, kwargs, result):
+        if self._config.stale_cache is not None:
+            self._config.stale_cache.put(func, args, kwargs, result)
 
-    def _exception_allowlisted(self, exception):
+    def _fall_back(self, exception, func, args, kwargs):
         """
-        Determine if an exception type is allowlisted by checking to see
-        if it matches any type in the allowlist
+        The result of a call rejected by the breaker: a cached result if the
+        breaker serves stale results, then the fallback. Otherwise the
+        rejection is raised
         """
-        if type(exception) in self._exception_allowlist:
-            return True
+        config = self._config
+        if config.stale_cache is not None:
+            try:
+                return config.stale_cache.get(func, args, kwargs)
+            except KeyError:
+                pass
 
-        return exception_in_list(exception, self._exception_allowlist)
+        if config.fallback is None:
+            raise exception
 
-    def _handle_error(self, error):
-        opened = self._strategy.handle_error()
+        if callable(config.fallback):
+            return config.fallback(*args, **kwargs)
+
+        return config.fallback
+
+    def _count_error(self, error):
+        if self._metrics is not None:
+            self._metrics.record_failure(type(error).__name__)
+
+        self._publish(CircuitBreakerEventType.ERROR, error=error)
+
+    def _handle_error(self, error, slow=False, probe=None):
+        self._count_error(error)
+
+        with self._transaction():
+            previous_state = self._state_code()
+            if not self._counts(previous_state, probe):
+                return
+
+            opened = self._strategy.handle_error(slow)
+            opened = self._mark_opened(opened, previous_state)
+            self._update_fast_path()
 
         if opened:
-            self._time_opened = datetime.utcnow()
+            self._notify_opened(error)
+
+    def _handle_slow_success(self, result, probe=None):
+        with self._transaction():
+            previous_state = self._state_code()
+            if not self._counts(previous_state, probe):
+                return
+
+            opened = self._strategy.handle_slow_success()
+            opened = self._mark_opened(opened, previous_state)
+            self._update_fast_path()
+
+        if opened:
+            self._notify_opened(result)
+
+    def _handle_success(self, probe=None):
+        if self._slot is None and self._strategy.steady:
+            return
+
+        with self._transaction():
+            if not self._counts(self._state_code(), probe):
+                return
+
+            previous_state = self._strategy.state_code
+            self._strategy.handle_success()
+            closed = previous_state != CLOSED and self._strategy.state_code == CLOSED
+            if closed:
+                self._failed_recoveries = 0
+            self._update_fast_path()
+
+        if closed:
+            self._notify_closed()
+
+    def _update_fast_path(self):
+        """
+        Let calls skip the breaker while it is closed without errors. A call
+        that fails is then recorded as usual, while a success changes nothing
+        """
+        self._fast_path = (
+            self._config.fast_path and self._slot is None and self._strategy.steady
+        )
+
+    def _notify_opened(self, error):
+        if self._metrics is not None:
+            self._metrics.transitions[CircuitBreakerState.OPEN] += 1
+
+        for listener in self._transition_listeners:
+            listener(self, CircuitBreakerState.OPEN)
+
+        self._publish(
+            CircuitBreakerEventType.STATE_TRANSITION,
+            error=error,
+            state=CircuitBreakerState.OPEN,
+        )
 
-            if self._on_open:
-                self._on_open(self, error)
+        if self._config.on_open:
+            self._config.on_open(self, error)
+
+    def _notify_closed(self):
+        if self._metrics is not None:
+            self._metrics.transitions[CircuitBreakerState.CLOSED] += 1
+
+        for listener in self._transition_listeners:
+            listener(self, CircuitBreakerState.CLOSED)
+
+        self._publish(
+            CircuitBreakerEventType.STATE_TRANSITION, state=CircuitBreakerState.CLOSED
+        )
+
+        if self._config.on_close:
+            self._config.on_close(self)
+
+    def _transaction(self):
+        """
+        A context in which the state of the breaker can be updated atomically
+        """
+        if self._slot is None:
+            return self._lock
+
+        return self._slot_transaction()
+
+    @contextmanager
+    def _slot_transaction(self):
+        with self._slot.lock():
+            self._load_slot()
+            yield
+            self._save_slot()
+
+    def _load_slot(self):
+        record = self._slot.load()
+        if record is None:
+            # Nothing has been saved for this breaker yet
+            return
+
+        self._strategy.load(record.state, record.error_count, record.success_count)
+        self._opened_at = record.opened_at
+        self._open_until = record.open_until
+        self._effective_recovery_timeout = record.recovery_timeout
+        self._failed_recoveries = record.failed_recoveries
+
+        if record.open_count != self._probe_generation:
+            # Another process opened the breaker
+            with self._probe_lock:
+                self._probe_generation = record.open_count
+                self._probes_in_flight = 0
+
+    def _refresh(self):
+        if self._slot is not None:
+            with self._slot.lock():
+                self._load_slot()
+
+    def _save_slot(self):
+        state, error_count, success_count = self._strategy.dump()
+        self._slot.save(
+            SlotRecord(
+                state=state,
+                error_count=error_count,
+                success_count=success_count,
+                opened_at=self._opened_at,
+                open_until=self._open_until,
+                recovery_timeout=self._effective_recovery_timeout,
+                failed_recoveries=self._failed_recoveries,
+                open_count=self._probe_generation,
+            )
+        )
+
+    def _mark_opened(self, opened: bool, previous_state: int) -> bool:
+        if not opened:
+            return False
+
+        if previous_state == HALF_OPEN:
+            self._failed_recoveries += 1
+        else:
+            self._failed_recoveries = 0
+
+        if self._config.recovery_backoff is not None:
+            self._effective_recovery_timeout = self._config.recovery_backoff.interval(
+                self._config.recovery_timeout, self._failed_recoveries
+            )
+        else:
+            self._effective_recovery_timeout = self._config.recovery_timeout
 
-    def _handle_success(self):
-        previous_state = self._strategy.state
-        self._strategy.handle_success()
-        current_state = self._strategy.state
+        self._opened_at = self._config.clock()
+        self._open_until = self._opened_at + self._effective_recovery_timeout
 
-        if (
-            previous_state != CircuitBreakerState.CLOSED
-            and current_state == CircuitBreakerState.CLOSED
-        ):
-            if self._on_close:
-                self._on_close(self)
+        with self._probe_lock:
+            self._probe_generation += 1
+            self._probes_in_flight = 0
+
+        return True
+
+    @property
+    def bulkhead(self) -> Optional[Bulkhead]:
+        return self._config.bulkhead
 
     @property
     def error_count(self) -> int:
+        self._refresh()
         return self._strategy.error_count
 
     @property
     def id(self):
         return self._id
 
+    @property
+    def timeout(self) -> Optional[float]:
+        return self._config.timeout
+
+    @property
+    def timeout_executor(self) -> Optional[TimeoutExecutor]:
+        """
+        The executor running synchronous calls when a timeout is set
+        """
+        return self._config.timeout_executor
+
+    @property
+    def metrics(self) -> Optional[BreakerMetrics]:
+        """
+        The call counters and latency histogram of the breaker, if enabled
+        """
+        return self._metrics
+
     @property
     def open_time(self) -> datetime:
         """
         The UTC time when the breaker opened
         """
-        return self._time_opened
+        self._refresh()
+        elapsed = self._config.clock() - self._opened_at
+        return datetime.utcnow() - timedelta(seconds=elapsed)
+
+    @property
+    def recovery_timeout(self) -> float:
+        """
+        The number of seconds the breaker stays fully open for, including
+        any backoff and jitter applied when it last opened
+        """
+        self._refresh()
+        return self._effective_recovery_timeout
 
     @property
     def recovery_start_time(self) -> datetime:
@@ -135,7 +1165,16 @@ class CircuitBreaker:
         The UTC time until which the breaker is fully open. After this time,
         the recovery period will begin and test requests will be allowed through
         """
-        return self._time_opened + timedelta(seconds=self._recovery_timeout)
+        return datetime.utcnow() + timedelta(seconds=self.recovery_time_remaining)
+
+    @property
+    def recovery_time_remaining(self) -> float:
+        """
+        The number of seconds until the recovery period begins. This is negative
+        once the recovery start time has passed
+        """
+        self._refresh()
+        return self._open_until - self._config.clock()
 
     @property
     def state(self) -> CircuitBreakerState:
@@ -144,50 +1183,392 @@ class CircuitBreaker:
         If the breaker is open but enough time (defined by the recovery_time setting)
         has elapsed, the breaker is moved to the half_open state
         """
-        if (
-            self._strategy.state == CircuitBreakerState.OPEN
-            and datetime.utcnow() >= self.recovery_start_time
-        ):
-            return CircuitBreakerState.HALF_OPEN
-
-        return self._strategy.state
+        return STATES[self._state_code()]
 
     @property
     def success_count(self) -> int:
+        self._refresh()
         return self._strategy.success_count
 
 
 class CircuitBreakerRegistry:
-    def __init__(self) -> None:
-        self._registry: Dict[Any, CircuitBreaker] = {}
+    """
+    Tracks a set of breakers indexed by state.
+
+    Breakers notify the registry when they open or close, and the time at
+    which each open breaker becomes half open is kept in a heap, so queries
+    by state do not need to look at every breaker. The clock must be the
+    clock used by the registered breakers. Transitions made by other
+    processes sharing a store are not seen by the index.
+
+    With weak=True, the registry does not keep breakers alive.
+    """
+
+    def __init__(
+        self,
+        store: Optional[StateStore] = None,
+        clock: Callable[[], float] = monotonic,
+        weak: bool = False,
+    ) -> None:
+        self._registry: Dict[Any, CircuitBreaker] = (
+            WeakValueDictionary() if weak else {}
+        )
+        self._store = store
+        self._clock = clock
+        self._weak = weak
+        self._by_state: Dict[CircuitBreakerState, Set[Any]] = {
+            state: set() for state in CircuitBreakerState
+        }
+        self._states: Dict[Any, CircuitBreakerState] = {}
+        self._deadlines: List[Tuple[float, int, Any]] = []
+        self._sequence = count()
+        self._lock = RLock()
 
     def register(self, circuit: CircuitBreaker) -> None:
-        if circuit.id in self._registry:
-            raise CircuitBreakerRegistryException()
-        self._registry[circuit.id] = circuit
+        with self._lock:
+            if circuit.id in self._registry:
+                raise CircuitBreakerRegistryException()
+            self._registry[circuit.id] = circuit
+            self._index(circuit, circuit.state)
+
+        circuit._transition_listeners += (self._on_transition,)
+        if self._weak:
+            finalize(circuit, self._forget_collected, circuit.id)
+
+    def unregister(self, circuit: CircuitBreaker) -> None:
+        with self._lock:
+            if self._registry.get(circuit.id) is not circuit:
+                raise CircuitBreakerRegistryException()
+            del self._registry[circuit.id]
+            self._forget(circuit.id)
+
+        circuit._transition_listeners = tuple(
+            listener
+            for listener in circuit._transition_listeners
+            if listener != self._on_transition
+        )
+
+    def count_by_state(self) -> Dict[CircuitBreakerState, int]:
+        with self._lock:
+            self._expire()
+            return {state: len(ids) for state, ids in self._by_state.items()}
 
     def get_open_circuits(self) -> List[CircuitBreaker]:
-        return [
-            cb for cb in self._registry.values() if cb.state == CircuitBreakerState.OPEN
-        ]
+        return self._get_circuits_in_state(CircuitBreakerState.OPEN)
+
+    def get_half_open_circuits(self) -> List[CircuitBreaker]:
+        return self._get_circuits_in_state(CircuitBreakerState.HALF_OPEN)
 
     def get_circuits(self) -> List[CircuitBreaker]:
         return list(self._registry.values())
 
+    def _get_circuits_in_state(self, state: CircuitBreakerState):
+        with self._lock:
+            self._expire()
+            circuits = (
+                self._registry.get(breaker_id) for breaker_id in self._by_state[state]
+            )
+            return [circuit for circuit in circuits if circuit is not None]
+
+    def _on_transition(self, circuit: CircuitBreaker, state: CircuitBreakerState):
+        with self._lock:
+            if self._registry.get(circuit.id) is circuit:
+                self._index(circuit, state)
+
+    def _index(self, circuit: CircuitBreaker, state: CircuitBreakerState):
+        breaker_id = circuit.id
+        previous_state = self._states.get(breaker_id)
+        if previous_state is not None:
+            self._by_state[previous_state].discard(breaker_id)
+
+        self._states[breaker_id] = state
+        self._by_state[state].add(breaker_id)
+
+        if state == CircuitBreakerState.OPEN:
+            heappush(
+                self._deadlines,
+                (circuit._open_until, next(self._sequence), breaker_id),
+            )
+
+    def _expire(self):
+        """
+        Move the open breakers whose recovery period has started to half open
+        """
+        now = self._clock()
+        deadlines = self._deadlines
+
+        while deadlines and deadlines[0][0] <= now:
+            deadline, _, breaker_id = heappop(deadlines)
+            circuit = self._registry.get(breaker_id)
+
+            # Entries for breakers that have since closed or reopened are stale
+            if (
+                circuit is not None
+                and self._states.get(breaker_id) == CircuitBreakerState.OPEN
+                and circuit._open_until == deadline
+            ):
+                self._by_state[CircuitBreakerState.OPEN].discard(breaker_id)
+                self._by_state[CircuitBreakerState.HALF_OPEN].add(breaker_id)
+                self._states[breaker_id] = CircuitBreakerState.HALF_OPEN
+
+    def _forget_collected(self, breaker_id: Any):
+        with self._lock:
+            # The ID may have been registered again by another breaker
+            if breaker_id not in self._registry:
+                self._forget(breaker_id)
+
+    def _forget(self, breaker_id: Any):
+        with self._lock:
+            state = self._states.pop(breaker_id, None)
+            if state is not None:
+                self._by_state[state].discard(breaker_id)
+
+    def get_metrics(self) -> Dict[Any, Dict[str, Any]]:
+        """
+        A snapshot of the state of every registered breaker, and of its
+        metrics if enabled
+        """
+        with self._lock:
+            self._expire()
+            circuits = list(self._registry.items())
+            states = dict(self._states)
+
+        return {
+            breaker_id: {
+                "state": states[breaker_id].name,
+                "metrics": (
+                    circuit.metrics.snapshot() if circuit.metrics is not None else None
+                ),
+                "executor": (
+                    circuit.timeout_executor.snapshot()
+                    if circuit.timeout_executor is not None
+                    else None
+                ),
+            }
+            for breaker_id, circuit in circuits
+            if breaker_id in states
+        }
+
+    def render_prometheus(self) -> str:
+        """
+        The state and metrics of every registered breaker in the Prometheus
+        text exposition format
+        """
+        return render_prometheus(self.get_metrics())
+
+    def get_cluster_states(self) -> Dict[Any, CircuitBreakerState]:
+        """
+        The state of every breaker saved in the store of the registry,
+        including breakers of other processes or hosts sharing the store
+        """
+        if self._store is None:
+            raise CircuitBreakerRegistryException(
+                "A store is required to get the state of the cluster"
+            )
+
+        now = (self._store.clock or self._clock)()
+        states = {}
+        for breaker_id, record in self._store.records().items():
+            state = record.state
+            if state == CircuitBreakerState.OPEN and now >= record.open_until:
+                state = CircuitBreakerState.HALF_OPEN
+            states[breaker_id] = state
+
+        return states
+
+
+class CircuitBreakerGroup:
+    """
+    A family of breakers with the same configuration, one per key.
+
+    The key of a call is derived from its arguments with key_func and the
+    breaker for a key is created on first use. At most max_size breakers are
+    kept: the least recently used closed breakers are evicted first, and
+    closed breakers unused for idle_ttl seconds are evicted as well. Open and
+    half open breakers are never evicted, so the group can grow past
+    max_size while many of its breakers are open.
+
+    Any other keyword arguments are passed to every CircuitBreaker created.
+    """
+
+    MAX_SIZE = 1024
+
+    def __init__(
+        self,
+        breaker_id: Optional = None,
+        idle_ttl: Optional[float] = None,
+        key_func: Optional[Callable] = None,
+        max_size: int = MAX_SIZE,
+        registry: Optional[CircuitBreakerRegistry] = None,
+        **kwargs,
+    ):
+        self._id = breaker_id or uuid4()
+        self._idle_ttl = idle_ttl
+        self._key_func = key_func
+        self._max_size = max_size
+        self._registry = registry
+        self._breaker_kwargs = kwargs
+        self._clock = kwargs.get("clock", monotonic)
+        self._breakers: "OrderedDict[Any, Tuple[CircuitBreaker, float]]" = OrderedDict()
+        self._lock = Lock()
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._breakers
+
+    def __len__(self) -> int:
+        return len(self._breakers)
+
+    def call(self, func, *args, **kwargs):
+        """
+        Call the supplied function through the breaker for its key
+        """
+        return self.get(self._key(*args, **kwargs)).call(func, *args, **kwargs)
+
+    async def call_async(self, func, *args, **kwargs):
+        """
+        Await the supplied coroutine function through the breaker for its key
+        """
+        breaker = self.get(self._key(*args, **kwargs))
+        return await breaker.call_async(func, *args, **kwargs)
+
+    def get(self, key: Any) -> CircuitBreaker:
+        """
+        The breaker for the key, created if needed
+        """
+        now = self._clock()
+
+        with self._lock:
+            entry = self._breakers.get(key)
+            if entry is not None:
+                self._breakers[key] = (entry[0], now)
+                self._breakers.move_to_end(key)
+                return entry[0]
+
+            self._evict(now)
+
+            breaker = CircuitBreaker(
+                breaker_id=f"{self._id}:{key}", **self._breaker_kwargs
+            )
+            self._breakers[key] = (breaker, now)
+            if self._registry is not None:
+                self._registry.register(breaker)
+
+            return breaker
+
+    @property
+    def id(self):
+        return self._id
+
+    def _key(self, *args, **kwargs):
+        if self._key_func is None:
+            raise ValueError("A key_func is required to call a breaker group")
+
+        return self._key_func(*args, **kwargs)
+
+    def _evict(self, now: float):
+        # Makes room for one more breaker
+        breakers = self._breakers
+
+        if self._idle_ttl is not None:
+            # The least recently used breaker is first, so expired breakers
+            # are always at the start
+            while breakers:
+                key, (breaker, last_used) = next(iter(breakers.items()))
+                if now - last_used < self._idle_ttl or not self._evict_key(key):
+                    break
+
+        # Breakers that cannot be evicted are moved to the end so that each is
+        # only skipped once per eviction
+        for _ in range(len(breakers)):
+            if len(breakers) < self._max_size:
+                break
+
+            key = next(iter(breakers))
+            if not self._evict_key(key):
+                breakers.move_to_end(key)
+
+    def _evict_key(self, key: Any) -> bool:
+        breaker = self._breakers[key][0]
+        if breaker.state != CircuitBreakerState.CLOSED:
+            return False
+
+        del self._breakers[key]
+        if self._registry is not None:
+            self._registry.unregister(breaker)
+
+        return True
+
 
 def circuit(func: Callable, **kwargs) -> Callable:
     """
     Decorates the supplied function with the circuit breaker pattern.
+    Coroutine functions are detected and wrapped with an async wrapper.
+    If key_func is given, calls go through a CircuitBreakerGroup with a
+    breaker per key
     """
     if not callable(func):
         raise ValueError(
             f"Circuit breakers can only wrap something that is callable. Attempted to wrap {func}"
         )
 
+    if kwargs.get("key_func") is not None:
+        return _wrap(func, CircuitBreakerGroup(**kwargs))
+
     breaker = CircuitBreaker(**kwargs)
+    if breaker._config.fast_path and breaker._slot is None:
+        return _wrap_fast(func, breaker)
+
+    return _wrap(func, breaker)
+
+
+def _wrap(func: Callable, breaker) -> Callable:
+    if iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_circuit_wrapper(*args, **kwargs):
+            return await breaker.call_async(func, *args, **kwargs)
+
+        return async_circuit_wrapper
 
     @wraps(func)
     def circuit_wrapper(*args, **kwargs):
         return breaker.call(func, *args, **kwargs)
 
     return circuit_wrapper
+
+
+def _wrap_fast(func: Callable, breaker: CircuitBreaker) -> Callable:
+    """
+    Wrap func for a breaker whose configuration allows calls to skip it while
+    it is closed without errors. In that state the wrapper calls func
+    directly after reading a single attribute of the breaker
+    """
+    handle_exception = breaker._handle_exception
+
+    if iscoroutinefunction(func):
+
+        @wraps(func)
+        async def async_circuit_wrapper(*args, **kwargs):
+            if not breaker._fast_path:
+                return await breaker.call_async(func, *args, **kwargs)
+
+            try:
+                return await func(*args, **kwargs)
+            except Exception as ex:
+                handle_exception(ex)
+                raise
+
+        return async_circuit_wrapper
+
+    @wraps(func)
+    def circuit_wrapper(*args, **kwargs):
+        if not breaker._fast_path:
+            return breaker.call(func, *args, **kwargs)
+
+        try:
+            return func(*args, **kwargs)
+        except Exception as ex:
+            handle_exception(ex)
+            raise
+
+    return circuit_wrapper
@@ -0,0 +1,160 @@
+import asyncio
+import time
+from threading import Lock
+from typing import Any, Callable, Iterable, Optional, Type
+
+from .backoff import ExponentialBackoff
+from .classifier import ExceptionClassifier
+from .exceptions import CircuitBreakerException
+
+
+class RetryBudget:
+    """
+    Caps retries at a ratio of the calls made, so that retries cannot
+    multiply the load on a failing dependency.
+
+    Every call adds ratio to the budget and every retry takes one from it.
+    The budget starts with, and never holds more than, burst retries, which
+    allows a few retries before enough calls have been made.
+    """
+
+    RATIO = 0.1
+    BURST = 10
+
+    def __init__(self, ratio: float = RATIO, burst: int = BURST):
+        if not 0 <= ratio <= 1:
+            raise ValueError(f"ratio must be between 0 and 1, got {ratio}")
+
+        self._ratio = ratio
+        self._burst = burst
+        self._balance = float(burst)
+        self._lock = Lock()
+
+    def deposit(self):
+        with self._lock:
+            self._balance = min(self._burst, self._balance + self._ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Take a retry from the budget. Returns False if the budget is spent
+        """
+        with self._lock:
+            if self._balance < 1:
+                return False
+
+            self._balance -= 1
+            return True
+
+    @property
+    def balance(self) -> float:
+        return self._balance
+
+
+class RetryPolicy:
+    """
+    Retries failed calls up to max_attempts attempts in total.
+
+    The wait before each retry is interval seconds, grown by backoff if
+    given. Only exceptions that the exception_allowlist and
+    exception_denylist classify as errors are retried, matched as for a
+    breaker. Rejections by a breaker are never retried, and retries stop as
+    soon as the breaker opens or the budget is spent. Synchronous retries
+    wait with sleep and coroutines with asyncio.sleep.
+    """
+
+    MAX_ATTEMPTS = 3
+    INTERVAL = 0.1
+
+    def __init__(
+        self,
+        max_attempts: int = MAX_ATTEMPTS,
+        interval: float = INTERVAL,
+        backoff: Optional[ExponentialBackoff] = None,
+        budget: Optional[RetryBudget] = None,
+        exception_allowlist: Optional[Iterable[Type[BaseException]]] = None,
+        exception_denylist: Optional[Iterable[Type[BaseException]]] = None,
+        sleep: Callable[[float], Any] = time.sleep,
+    ):
+        if max_attempts < 1:
+            raise ValueError(f"max_attempts must be at least 1, got {max_attempts}")
+
+        self._max_attempts = max_attempts
+        self._interval = interval
+        self._backoff = backoff
+        self._budget = budget
+        self._classifier = ExceptionClassifier(
+            exception_allowlist=exception_allowlist,
+            exception_denylist=exception_denylist,
+        )
+        self._sleep = sleep
+
+    def call(
+        self, func: Callable, *args, stop: Optional[Callable[[], bool]] = None
+    ) -> Any:
+        """
+        Call func with args, retrying while it fails. stop is checked before
+        each retry, which is abandoned if it returns True
+        """
+        if self._budget is not None:
+            self._budget.deposit()
+
+        attempt = 1
+        while True:
+            try:
+                return func(*args)
+            except Exception as ex:
+                if not self._should_retry(ex, attempt, stop):
+                    raise
+
+            self._sleep(self._wait(attempt))
+            attempt += 1
+
+    async def call_async(
+        self, func: Callable, *args, stop: Optional[Callable[[], bool]] = None
+    ) -> Any:
+        """
+        Await func with args, retrying while it fails. stop is checked
+        before each retry, which is abandoned if it returns True
+        """
+        if self._budget is not None:
+            self._budget.deposit()
+
+        attempt = 1
+        while True:
+            try:
+                return await func(*args)
+            except Exception as ex:
+                if not self._should_retry(ex, attempt, stop):
+                    raise
+
+            await asyncio.sleep(self._wait(attempt))
+            attempt += 1
+
+    def _should_retry(
+        self,
+        exception: Exception,
+        attempt: int,
+        stop: Optional[Callable[[], bool]],
+    ) -> bool:
+        if attempt >= self._max_attempts:
+            return False
+
+        if isinstance(exception, CircuitBreakerException):
+            return False
+
+        if not self._classifier.is_error(exception):
+            return False
+
+        if stop is not None and stop():
+            return False
+
+        return self._budget is None or self._budget.withdraw()
+
+    def _wait(self, attempt: int) -> float:
+        """
+        The number of seconds to wait after attempt failed attempts
+        """
+        if self._backoff is None:
+            return self._interval
+
+        return self._backoff.interval(self._interval, attempt - 1)
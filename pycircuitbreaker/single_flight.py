@@ -0,0 +1,135 @@
+import asyncio
+from copy import copy
+from threading import Event, Lock
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from .cache import call_key
+
+
+class _Flight:
+    """
+    A call in progress, shared by every caller with the same key
+    """
+
+    __slots__ = ("completed", "done", "exception", "result")
+
+    def __init__(self, done):
+        self.completed = False
+        self.done = done
+        self.exception: Optional[Exception] = None
+        self.result: Any = None
+
+    def outcome(self) -> Any:
+        exception = self.exception
+        if exception is None:
+            return self.result
+
+        # Each caller raises its own copy, so that the traceback and context
+        # of one caller do not leak into the exception raised by another
+        try:
+            shared = copy(exception)
+        except Exception:
+            raise exception
+        raise shared from exception
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into a single call.
+
+    The first caller for a key makes the call and callers arriving while it
+    is in progress wait for it and receive its result or exception. If the
+    call is interrupted rather than failing, for example because the caller
+    was cancelled, a waiting caller makes the call instead. Keys are
+    the function and its arguments, or the function and the value of
+    key_func if given. Calls whose key cannot be hashed are not coalesced.
+    """
+
+    def __init__(self, key_func: Optional[Callable[..., Hashable]] = None):
+        self._key_func = key_func
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = Lock()
+
+    def call(self, key: Hashable, func: Callable, *args) -> Any:
+        """
+        Call func with args unless a call with the same key is in progress
+        in another thread, in which case its outcome is shared
+        """
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight(Event())
+
+            if leader:
+                break
+
+            flight.done.wait()
+            if flight.completed:
+                return flight.outcome()
+
+        try:
+            flight.result = func(*args)
+            flight.completed = True
+            return flight.result
+        except Exception as ex:
+            flight.exception = ex
+            flight.completed = True
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    async def call_async(self, key: Hashable, func: Callable, *args) -> Any:
+        """
+        Await func with args unless a call with the same key is in progress
+        in the event loop, in which case its outcome is shared
+        """
+        # Waiters can only be woken up by a call in their own event loop
+        key = (asyncio.get_running_loop(), key)
+
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader:
+                    flight = self._flights[key] = _Flight(asyncio.Event())
+
+            if leader:
+                break
+
+            await flight.done.wait()
+            if flight.completed:
+                return flight.outcome()
+
+        try:
+            flight.result = await func(*args)
+            flight.completed = True
+            return flight.result
+        except asyncio.CancelledError:
+            # An Exception before Python 3.8, but never shared
+            raise
+        except Exception as ex:
+            flight.exception = ex
+            flight.completed = True
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def key(
+        self, func: Callable, args: Tuple, kwargs: Dict[str, Any]
+    ) -> Optional[Hashable]:
+        """
+        The key of a call, or None if it cannot be hashed
+        """
+        key = call_key(func, args, kwargs, self._key_func)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+
+        return key
@@ -5,3 +5,16 @@ class CircuitBreakerState(Enum):
     CLOSED = "CLOSED"
     HALF_OPEN = "HALF_OPEN"
     OPEN = "OPEN"
+
+
+# Numeric codes used for the state in hot paths and in stores
+CLOSED = 0
+OPEN = 1
+HALF_OPEN = 2
+
+STATES = (
+    CircuitBreakerState.CLOSED,
+    CircuitBreakerState.OPEN,
+    CircuitBreakerState.HALF_OPEN,
+)
+STATE_CODES = {state: code for code, state in enumerate(STATES)}
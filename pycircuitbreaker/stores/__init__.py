@@ -0,0 +1,4 @@
+from .base import SlotRecord, StateSlot, StateStore
+from .memory import InMemoryStore
+from .redis import RedisStore
+from .shared_memory import SharedMemoryStore
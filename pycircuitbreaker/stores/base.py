@@ -0,0 +1,75 @@
+from typing import Any, Callable, ContextManager, Dict, NamedTuple, Optional, Tuple
+
+from ..state import CircuitBreakerState, STATE_CODES, STATES
+
+
+class SlotRecord(NamedTuple):
+    """
+    The state of a breaker that is shared through a store
+    """
+
+    state: CircuitBreakerState
+    error_count: int
+    success_count: int
+    opened_at: float
+    open_until: float
+    recovery_timeout: float
+    failed_recoveries: int
+    open_count: int
+
+
+class StateSlot:
+    """
+    The storage for a single breaker in a store.
+
+    Updates are made by loading the record, changing it and saving it back
+    while holding the lock. read_state must be safe to call without the lock.
+    """
+
+    def configure(
+        self,
+        error_threshold: int,
+        recovery_timeout: float,
+        clock: Callable[[], float],
+    ):
+        """
+        Called with the settings of a breaker using the slot, for stores that
+        open breakers themselves or keep times in a clock of their own
+        """
+
+    def lock(self) -> ContextManager:
+        raise NotImplementedError()
+
+    def load(self) -> Optional[SlotRecord]:
+        """
+        The saved record, or None if no record has been saved yet
+        """
+        raise NotImplementedError()
+
+    def save(self, record: SlotRecord):
+        raise NotImplementedError()
+
+    def read_state(self) -> Tuple[CircuitBreakerState, float]:
+        """
+        The state of the breaker and the time until which it is open
+        """
+        raise NotImplementedError()
+
+
+class StateStore:
+    """
+    Holds the state of breakers outside of the breaker objects so that it can
+    be shared. Breakers with the same ID share a slot.
+    """
+
+    # The clock of the times in the records, if not the clock of the breakers
+    clock: Optional[Callable[[], float]] = None
+
+    def slot(self, breaker_id: Any) -> StateSlot:
+        raise NotImplementedError()
+
+    def records(self) -> Dict[Any, SlotRecord]:
+        """
+        The saved records of every breaker in the store, keyed by breaker ID
+        """
+        raise NotImplementedError()
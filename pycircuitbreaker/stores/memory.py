@@ -0,0 +1,55 @@
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+from ..state import CircuitBreakerState
+from .base import SlotRecord, StateSlot, StateStore
+
+
+class InMemorySlot(StateSlot):
+    def __init__(self):
+        self._lock = Lock()
+        self._record: Optional[SlotRecord] = None
+
+    def lock(self) -> Lock:
+        return self._lock
+
+    def load(self) -> Optional[SlotRecord]:
+        return self._record
+
+    def save(self, record: SlotRecord):
+        self._record = record
+
+    def read_state(self) -> Tuple[CircuitBreakerState, float]:
+        # The record is replaced as a whole, so reading it is atomic
+        record = self._record
+        if record is None:
+            return CircuitBreakerState.CLOSED, 0.0
+
+        return record.state, record.open_until
+
+
+class InMemoryStore(StateStore):
+    """
+    Keeps breaker state in the current process. Breaker objects with the same
+    ID share their state, for example one breaker per thread or per request
+    handler for the same dependency.
+    """
+
+    def __init__(self):
+        self._slots: Dict[Any, InMemorySlot] = {}
+        self._lock = Lock()
+
+    def records(self) -> Dict[Any, SlotRecord]:
+        return {
+            breaker_id: slot.load()
+            for breaker_id, slot in list(self._slots.items())
+            if slot.load() is not None
+        }
+
+    def slot(self, breaker_id: Any) -> InMemorySlot:
+        with self._lock:
+            try:
+                return self._slots[breaker_id]
+            except KeyError:
+                slot = self._slots[breaker_id] = InMemorySlot()
+                return slot
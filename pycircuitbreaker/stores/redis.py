@@ -0,0 +1,484 @@
+import hashlib
+import logging
+import socket
+from threading import Event, Lock, Thread
+from time import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from ..exceptions import CircuitBreakerStoreException
+from .base import STATE_CODES, STATES, SlotRecord, StateStore
+from .memory import InMemorySlot
+
+logger = logging.getLogger(__name__)
+
+RECORD_FIELDS = (
+    "state",
+    "error_count",
+    "success_count",
+    "opened_at",
+    "open_until",
+    "recovery_timeout",
+    "failed_recoveries",
+    "open_count",
+)
+
+# Merges the changes of one host into the stored record, then returns the
+# stored record. A host that opened the breaker more often than the stored
+# record shows saves its record as a whole. Within the same open period the
+# error and success counts of every host add up, and the breaker is opened on
+# the server once the summed errors reach the error threshold. Records from an
+# earlier open period are stale and dropped.
+MERGE_SCRIPT = """
+local stored_open_count = tonumber(redis.call('HGET', KEYS[1], 'open_count')) or -1
+local open_count = tonumber(ARGV[1])
+if ARGV[3] == '1' then
+    if open_count > stored_open_count then
+        redis.call('HSET', KEYS[1], 'open_count', ARGV[1], 'updated_at', ARGV[2],
+            'state', ARGV[4], 'error_count', ARGV[5], 'success_count', ARGV[6],
+            'opened_at', ARGV[7], 'open_until', ARGV[8], 'recovery_timeout', ARGV[9],
+            'failed_recoveries', ARGV[10])
+    elseif open_count == stored_open_count then
+        local error_count = math.max(0,
+            redis.call('HINCRBY', KEYS[1], 'error_count', ARGV[12]))
+        local success_count = math.max(0,
+            redis.call('HINCRBY', KEYS[1], 'success_count', ARGV[13]))
+        redis.call('HSET', KEYS[1], 'error_count', error_count,
+            'success_count', success_count, 'updated_at', ARGV[2])
+        if ARGV[4] == '0' then
+            redis.call('HSET', KEYS[1], 'state', '0', 'failed_recoveries', ARGV[10])
+        end
+        local error_threshold = tonumber(ARGV[14])
+        if error_threshold > 0 and error_count >= error_threshold and
+                redis.call('HGET', KEYS[1], 'state') == '0' then
+            redis.call('HSET', KEYS[1], 'open_count', open_count + 1,
+                'state', '1', 'success_count', '0', 'opened_at', ARGV[2],
+                'open_until', ARGV[16], 'recovery_timeout', ARGV[15],
+                'failed_recoveries', '0')
+        end
+    end
+    redis.call('SADD', KEYS[2], ARGV[11])
+end
+return redis.call('HGETALL', KEYS[1])
+"""
+MERGE_SCRIPT_SHA = hashlib.sha1(MERGE_SCRIPT.encode()).hexdigest()
+
+
+class RedisError(CircuitBreakerStoreException):
+    pass
+
+
+class RedisConnection:
+    """
+    A minimal client for the Redis protocol (RESP) that supports pipelining
+    """
+
+    def __init__(self, host: str, port: int, timeout: float):
+        self._socket = socket.create_connection((host, port), timeout=timeout)
+        self._reader = self._socket.makefile("rb")
+
+    def close(self):
+        self._reader.close()
+        self._socket.close()
+
+    def execute(self, *command):
+        return self.pipeline([command])[0]
+
+    def pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        """
+        Send all commands in one write and read their replies. Error replies
+        are returned as RedisError instances rather than raised
+        """
+        self._socket.sendall(b"".join(self._encode(command) for command in commands))
+        return [self._read_reply() for _ in commands]
+
+    @staticmethod
+    def _encode(command: Sequence[Any]) -> bytes:
+        parts = [b"*%d\r\n" % len(command)]
+        for arg in command:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    def _read_reply(self):
+        line = self._reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise RedisError("Connection closed by server")
+
+        prefix, payload = line[:1], line[1:-2]
+        if prefix == b"+":
+            return payload.decode()
+        if prefix == b"-":
+            return RedisError(payload.decode())
+        if prefix == b":":
+            return int(payload)
+        if prefix == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self._reader.read(length + 2)
+            return data[:-2]
+        if prefix == b"*":
+            length = int(payload)
+            if length < 0:
+                return None
+            return [self._read_reply() for _ in range(length)]
+
+        raise RedisError(f"Unexpected reply {line!r}")
+
+
+class RedisSlot(InMemorySlot):
+    def __init__(self, breaker_id: Any, wall_clock: Callable[[], float]):
+        super().__init__()
+        self.breaker_id = breaker_id
+        self.clock = wall_clock
+        self.wall_clock = wall_clock
+        self.dirty = False
+        self.error_threshold = 0
+        self.recovery_timeout = 0.0
+        # The record last received from the server. The counts of the local
+        # record above it are the changes this host has not sent yet
+        self.synced: Optional[SlotRecord] = None
+
+    def configure(
+        self,
+        error_threshold: int,
+        recovery_timeout: float,
+        clock: Callable[[], float],
+    ):
+        self.clock = clock
+        self.error_threshold = error_threshold
+        self.recovery_timeout = recovery_timeout
+
+    def to_wall_clock(self, record: SlotRecord) -> SlotRecord:
+        """
+        The record with its times moved from the clock of the breakers to the
+        wall clock, which hosts can compare
+        """
+        return _shift(record, self._clock_offset())
+
+    def from_wall_clock(self, record: SlotRecord) -> SlotRecord:
+        return _shift(record, -self._clock_offset())
+
+    def _clock_offset(self) -> float:
+        if self.clock is self.wall_clock:
+            return 0.0
+
+        return self.wall_clock() - self.clock()
+
+    def save(self, record: SlotRecord):
+        super().save(record)
+        self.dirty = True
+
+    def merge(self, record: SlotRecord, sent: Optional[SlotRecord]):
+        """
+        Replace the local record with the one from the server, keeping the
+        changes saved locally since sent was sent
+        """
+        record = self.from_wall_clock(record)
+
+        with self._lock:
+            local = self._record
+            self.synced = record
+
+            if local is None or local is sent:
+                self._record = record
+                self.dirty = False
+            elif local.open_count < record.open_count:
+                # The local changes belong to an open period that has ended
+                self._record = record
+                self.dirty = False
+            elif local.open_count == record.open_count:
+                sent_errors, sent_successes = _counts(sent)
+                self._record = local._replace(
+                    error_count=max(
+                        0, record.error_count + local.error_count - sent_errors
+                    ),
+                    success_count=max(
+                        0, record.success_count + local.success_count - sent_successes
+                    ),
+                )
+
+    def deltas(self, record: SlotRecord) -> Tuple[int, int]:
+        """
+        The changes of the error and success counts that have not been sent
+        """
+        synced = self.synced
+        if synced is None or synced.open_count != record.open_count:
+            synced = None
+
+        errors, successes = _counts(synced)
+        return record.error_count - errors, record.success_count - successes
+
+
+def _shift(record: SlotRecord, seconds: float) -> SlotRecord:
+    if not seconds:
+        return record
+
+    return record._replace(
+        opened_at=record.opened_at + seconds, open_until=record.open_until + seconds
+    )
+
+
+def _counts(record: Optional[SlotRecord]) -> Tuple[int, int]:
+    if record is None:
+        return 0, 0
+
+    return record.error_count, record.success_count
+
+
+class RedisStore(StateStore):
+    """
+    Shares breaker state between hosts through Redis.
+
+    Breakers update a local copy of their state, so a call never waits for the
+    network. A background thread sends the changes of every breaker to the
+    server in a single pipeline every flush_interval seconds and brings back
+    changes made by other hosts. Changes are merged by a Lua script on the
+    server: the record of the breaker that opened most recently wins, and
+    within the same open period the error and success counts of all hosts add
+    up. The script opens the breaker once the summed errors reach the error
+    threshold.
+
+    Times are kept in Redis in the time of clock, time.time by default, as
+    the wall clocks of different hosts can be compared. Breakers using another
+    clock, such as the default time.monotonic, have their times converted
+    when they are sent and received.
+    """
+
+    FLUSH_INTERVAL = 0.1
+    PREFIX = "pycircuitbreaker"
+    TIMEOUT = 1.0
+
+    def __init__(
+        self,
+        host: str = "localhost",
+        port: int = 6379,
+        flush_interval: float = FLUSH_INTERVAL,
+        prefix: str = PREFIX,
+        timeout: float = TIMEOUT,
+        clock: Callable[[], float] = time,
+    ):
+        self.clock = clock
+        self._host = host
+        self._port = port
+        self._flush_interval = flush_interval
+        self._prefix = prefix
+        self._timeout = timeout
+        self._connection: Optional[RedisConnection] = None
+        self._connection_lock = Lock()
+        self._slots: Dict[Any, RedisSlot] = {}
+        self._slots_lock = Lock()
+        self._stopped = Event()
+        self._thread: Optional[Thread] = None
+
+    def close(self):
+        """
+        Stop the background thread and send any remaining changes
+        """
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+
+        try:
+            self.flush()
+        finally:
+            with self._connection_lock:
+                self._disconnect()
+
+    def flush(self):
+        """
+        Send local changes to the server and load changes from other hosts
+        """
+        slots = list(self._slots.values())
+        if not slots:
+            return
+
+        commands = []
+        sent = []
+        for slot in slots:
+            with slot.lock():
+                record = slot.load()
+                dirty = slot.dirty and record is not None
+                slot.dirty = False
+
+            commands.append(self._merge_command(slot, record, dirty))
+            sent.append((record, dirty))
+
+        try:
+            replies = self._pipeline(commands)
+        except Exception:
+            # Send the changes again with the next flush
+            for slot, (record, dirty) in zip(slots, sent):
+                if dirty:
+                    slot.dirty = True
+            raise
+
+        error = None
+        for slot, (record, dirty), reply in zip(slots, sent, replies):
+            if isinstance(reply, RedisError):
+                if dirty:
+                    slot.dirty = True
+                error = error or reply
+                continue
+
+            stored = self._parse_record(reply)
+            if stored is not None:
+                slot.merge(stored, record)
+
+        if error is not None:
+            # Start over with a new connection with the next flush
+            with self._connection_lock:
+                self._disconnect()
+            raise error
+
+    def records(self) -> Dict[Any, SlotRecord]:
+        members = self._pipeline([("SMEMBERS", self._index_key)])[0]
+        if not members:
+            return {}
+
+        breaker_ids = [member.decode() for member in members]
+        replies = self._pipeline(
+            [("HGETALL", self._key(breaker_id)) for breaker_id in breaker_ids]
+        )
+
+        records = {}
+        for breaker_id, reply in zip(breaker_ids, replies):
+            stored = self._parse_record(reply)
+            if stored is not None:
+                records[breaker_id] = stored
+
+        return records
+
+    def slot(self, breaker_id: Any) -> RedisSlot:
+        with self._slots_lock:
+            try:
+                return self._slots[breaker_id]
+            except KeyError:
+                slot = self._slots[breaker_id] = RedisSlot(breaker_id, self.clock)
+
+            if self._thread is None:
+                self._thread = Thread(
+                    target=self._run, name="pycircuitbreaker-redis", daemon=True
+                )
+                self._thread.start()
+
+            return slot
+
+    @property
+    def _index_key(self) -> str:
+        return f"{self._prefix}:breakers"
+
+    def _key(self, breaker_id: Any) -> str:
+        return f"{self._prefix}:breaker:{breaker_id}"
+
+    def _merge_command(
+        self, slot: RedisSlot, record: Optional[SlotRecord], dirty: bool
+    ) -> tuple:
+        if record is None:
+            record = SlotRecord(STATES[0], 0, 0, 0.0, 0.0, 0.0, 0, -1)
+        else:
+            record = slot.to_wall_clock(record)
+
+        now = self.clock()
+        error_delta, success_delta = slot.deltas(record)
+        return (
+            "EVALSHA",
+            MERGE_SCRIPT_SHA,
+            2,
+            self._key(slot.breaker_id),
+            self._index_key,
+            record.open_count,
+            repr(now),
+            "1" if dirty else "0",
+            STATE_CODES[record.state],
+            record.error_count,
+            record.success_count,
+            repr(record.opened_at),
+            repr(record.open_until),
+            repr(record.recovery_timeout),
+            record.failed_recoveries,
+            slot.breaker_id,
+            error_delta,
+            success_delta,
+            slot.error_threshold,
+            repr(slot.recovery_timeout),
+            repr(now + slot.recovery_timeout),
+        )
+
+    @staticmethod
+    def _parse_record(reply: Optional[list]) -> Optional[SlotRecord]:
+        if not reply:
+            return None
+
+        fields = {
+            reply[index].decode(): reply[index + 1].decode()
+            for index in range(0, len(reply), 2)
+        }
+        return SlotRecord(
+            state=STATES[int(fields["state"])],
+            error_count=int(fields["error_count"]),
+            success_count=int(fields["success_count"]),
+            opened_at=float(fields["opened_at"]),
+            open_until=float(fields["open_until"]),
+            recovery_timeout=float(fields["recovery_timeout"]),
+            failed_recoveries=int(fields["failed_recoveries"]),
+            open_count=int(fields["open_count"]),
+        )
+
+    def _pipeline(self, commands: Sequence[Sequence[Any]]) -> List[Any]:
+        with self._connection_lock:
+            try:
+                if self._connection is None:
+                    self._connect()
+                replies = self._connection.pipeline(commands)
+
+                # The server lost the script, for example after a restart or
+                # a failover. The commands that failed had no effect, so load
+                # the script again and resend them
+                missing = [
+                    index
+                    for index, reply in enumerate(replies)
+                    if isinstance(reply, RedisError)
+                    and str(reply).startswith("NOSCRIPT")
+                ]
+                if missing:
+                    self._load_script(self._connection)
+                    retried = self._connection.pipeline(
+                        [commands[index] for index in missing]
+                    )
+                    for index, reply in zip(missing, retried):
+                        replies[index] = reply
+
+                return replies
+            except (OSError, RedisError):
+                self._disconnect()
+                raise
+
+    def _connect(self):
+        connection = RedisConnection(self._host, self._port, self._timeout)
+        try:
+            self._load_script(connection)
+        except Exception:
+            connection.close()
+            raise
+
+        self._connection = connection
+
+    @staticmethod
+    def _load_script(connection: RedisConnection):
+        reply = connection.execute("SCRIPT", "LOAD", MERGE_SCRIPT)
+        if isinstance(reply, RedisError):
+            raise reply
+
+    def _disconnect(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _run(self):
+        while not self._stopped.wait(self._flush_interval):
+            try:
+                self.flush()
+            except (OSError, CircuitBreakerStoreException):
+                logger.warning("Failed to sync breakers with Redis", exc_info=True)
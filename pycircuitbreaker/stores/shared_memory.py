@@ -0,0 +1,223 @@
+import hashlib
+import mmap
+import os
+import struct
+from contextlib import contextmanager
+from threading import get_ident, Lock
+from typing import Any, Dict, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+from ..exceptions import CircuitBreakerStoreException
+from ..state import CircuitBreakerState
+from .base import STATE_CODES, STATES, SlotRecord, StateSlot, StateStore
+
+# version, key, state, error count, success count, opened at, open until,
+# recovery timeout, failed recoveries, open count
+SLOT_FORMAT = struct.Struct("<Q16sBxxxxxxxqqdddqq")
+SLOT_SIZE = 128
+KEY_SIZE = 16
+HEADER_SIZE = SLOT_SIZE
+STATE_OFFSET = 8 + KEY_SIZE
+STATE_FORMAT = struct.Struct("<B")
+OPEN_UNTIL_FORMAT = struct.Struct("<d")
+OPEN_UNTIL_OFFSET = STATE_OFFSET + 8 + 8 + 8 + 8
+VERSION_FORMAT = struct.Struct("<Q")
+# Lock free reads retried this many times before reading under the lock
+READ_ATTEMPTS = 100
+# The breaker ID is kept after the record, truncated to fit the slot
+NAME_OFFSET = SLOT_FORMAT.size
+NAME_SIZE = SLOT_SIZE - NAME_OFFSET
+
+
+class SharedMemorySlot(StateSlot):
+    def __init__(self, store: "SharedMemoryStore", offset: int):
+        self._store = store
+        self._offset = offset
+        self._lock = Lock()
+        self._owner: Optional[int] = None
+
+    @contextmanager
+    def lock(self):
+        # Record locks are held per process, so threads also need a lock
+        with self._lock:
+            with self._store._file_lock(self._offset, SLOT_SIZE):
+                self._owner = get_ident()
+                try:
+                    yield
+                finally:
+                    self._owner = None
+
+    def load(self) -> Optional[SlotRecord]:
+        return self._store._load(self._offset)
+
+    def save(self, record: SlotRecord):
+        buffer = self._store._mmap
+        version = VERSION_FORMAT.unpack_from(buffer, self._offset)[0]
+        key = buffer[self._offset + 8 : self._offset + 8 + KEY_SIZE]
+
+        # An odd version tells readers that a write is in progress. A writer
+        # killed mid write leaves it odd, so the parity is restored here
+        writing = version | 1
+        VERSION_FORMAT.pack_into(buffer, self._offset, writing)
+        SLOT_FORMAT.pack_into(
+            buffer,
+            self._offset,
+            writing,
+            key,
+            STATE_CODES[record.state],
+            *record[1:],
+        )
+        VERSION_FORMAT.pack_into(buffer, self._offset, writing + 1)
+
+    def read_state(self) -> Tuple[CircuitBreakerState, float]:
+        buffer = self._store._mmap
+        offset = self._offset
+
+        for _ in range(READ_ATTEMPTS):
+            version = VERSION_FORMAT.unpack_from(buffer, offset)[0]
+            if version & 1:
+                continue
+
+            state, open_until = self._read_state()
+            if VERSION_FORMAT.unpack_from(buffer, offset)[0] == version:
+                return state, open_until
+
+        # A write is taking long, or its writer was killed part way through.
+        # Nobody else can be writing if this thread holds the lock
+        if self._owner == get_ident():
+            return self._read_state()
+
+        with self.lock():
+            return self._read_state()
+
+    def _read_state(self) -> Tuple[CircuitBreakerState, float]:
+        buffer = self._store._mmap
+        offset = self._offset
+        state = STATE_FORMAT.unpack_from(buffer, offset + STATE_OFFSET)[0]
+        open_until = OPEN_UNTIL_FORMAT.unpack_from(buffer, offset + OPEN_UNTIL_OFFSET)[
+            0
+        ]
+        return STATES[state], open_until
+
+
+class SharedMemoryStore(StateStore):
+    """
+    Shares breaker state between processes on the same host through a memory
+    mapped file with a fixed size slot per breaker ID.
+
+    Every process that opens the same path sees the same breakers, so the
+    workers of a prefork server trip together. A path on a memory backed
+    filesystem such as /dev/shm avoids disk writes. Updates are serialised
+    with POSIX record locks on the slot.
+    """
+
+    SLOTS = 1024
+
+    def __init__(self, path: str, slots: int = SLOTS):
+        if fcntl is None:
+            raise CircuitBreakerStoreException(
+                "SharedMemoryStore requires POSIX file locking"
+            )
+
+        self._path = path
+        self._slots = slots
+        self._size = HEADER_SIZE + slots * SLOT_SIZE
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+
+        with self._file_lock(0, HEADER_SIZE):
+            if os.fstat(self._fd).st_size < self._size:
+                os.ftruncate(self._fd, self._size)
+
+        self._mmap = mmap.mmap(self._fd, self._size)
+        self._slot_cache: Dict[Any, SharedMemorySlot] = {}
+        # One slot object, and so one thread lock, per offset. Record locks
+        # are held per process, so unlocking a slot from one thread would
+        # release it for the other threads as well
+        self._slots_by_offset: Dict[int, SharedMemorySlot] = {}
+        self._lock = Lock()
+
+    def close(self):
+        self._mmap.close()
+        os.close(self._fd)
+
+    def records(self) -> Dict[Any, SlotRecord]:
+        records = {}
+
+        for index in range(self._slots):
+            offset = HEADER_SIZE + index * SLOT_SIZE
+            with self._slot_at(offset).lock():
+                record = self._load(offset)
+                name = self._mmap[offset + NAME_OFFSET : offset + SLOT_SIZE]
+
+            if record is not None:
+                records[name.rstrip(b"\0").decode(errors="ignore")] = record
+
+        return records
+
+    def slot(self, breaker_id: Any) -> SharedMemorySlot:
+        try:
+            return self._slot_cache[breaker_id]
+        except KeyError:
+            pass
+
+        name = str(breaker_id).encode()
+        key = hashlib.blake2b(name, digest_size=KEY_SIZE).digest()
+
+        with self._lock, self._file_lock(0, HEADER_SIZE):
+            offset = self._find_slot(key, name[:NAME_SIZE])
+
+        slot = self._slot_cache[breaker_id] = self._slot_at(offset)
+        return slot
+
+    def _slot_at(self, offset: int) -> SharedMemorySlot:
+        with self._lock:
+            try:
+                return self._slots_by_offset[offset]
+            except KeyError:
+                slot = self._slots_by_offset[offset] = SharedMemorySlot(self, offset)
+                return slot
+
+    def _load(self, offset: int) -> Optional[SlotRecord]:
+        values = SLOT_FORMAT.unpack_from(self._mmap, offset)
+        if values[0] == 0:
+            return None
+
+        return SlotRecord(STATES[values[2]], *values[3:])
+
+    def _find_slot(self, key: bytes, name: bytes) -> int:
+        """
+        Find the slot for the key with linear probing, claiming a free slot if
+        the key is new. Must be called with the header locked
+        """
+        empty = bytes(KEY_SIZE)
+        start = int.from_bytes(key[:8], "little") % self._slots
+
+        for probe in range(self._slots):
+            offset = HEADER_SIZE + ((start + probe) % self._slots) * SLOT_SIZE
+            slot_key = self._mmap[offset + 8 : offset + 8 + KEY_SIZE]
+
+            if slot_key == key:
+                return offset
+
+            if slot_key == empty:
+                self._mmap[offset + 8 : offset + 8 + KEY_SIZE] = key
+                self._mmap[offset + NAME_OFFSET : offset + NAME_OFFSET + len(name)] = (
+                    name
+                )
+                return offset
+
+        raise CircuitBreakerStoreException(
+            f"All {self._slots} slots in {self._path} are in use"
+        )
+
+    @contextmanager
+    def _file_lock(self, offset: int, length: int):
+        fcntl.lockf(self._fd, fcntl.LOCK_EX, length, offset)
+        try:
+            yield
+        finally:
+            fcntl.lockf(self._fd, fcntl.LOCK_UN, length, offset)
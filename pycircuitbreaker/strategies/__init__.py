@@ -1,12 +1,18 @@
 from enum import Enum
 
+from .adaptive import AdaptiveStrategy
+from .count_window import CountWindowStrategy
 from .net_error import NetErrorStrategy
 from .single_reset import SingleResetStrategy
+from .sliding_window import SlidingWindowStrategy
 
 
 class CircuitBreakerStrategy(Enum):
     SINGLE_RESET = "SINGLE_RESET"
     NET_ERROR = "NET_ERROR"
+    SLIDING_WINDOW = "SLIDING_WINDOW"
+    COUNT_WINDOW = "COUNT_WINDOW"
+    ADAPTIVE = "ADAPTIVE"
 
 
 def get_strategy(strategy: CircuitBreakerStrategy):
@@ -14,5 +20,11 @@ def get_strategy(strategy: CircuitBreakerStrategy):
         return SingleResetStrategy
     elif strategy == CircuitBreakerStrategy.NET_ERROR:
         return NetErrorStrategy
+    elif strategy == CircuitBreakerStrategy.SLIDING_WINDOW:
+        return SlidingWindowStrategy
+    elif strategy == CircuitBreakerStrategy.COUNT_WINDOW:
+        return CountWindowStrategy
+    elif strategy == CircuitBreakerStrategy.ADAPTIVE:
+        return AdaptiveStrategy
 
     raise ValueError(f"Unknown circuit breaker strategy {strategy}")
@@ -0,0 +1,110 @@
+import random
+from typing import Tuple
+
+from ..state import CircuitBreakerState, CLOSED
+from .buckets import SecondBuckets
+
+# Counters of the buckets
+REQUESTS = 0
+ACCEPTS = 1
+
+
+class AdaptiveStrategy:
+    """
+    Sheds a share of the calls locally instead of opening, in the manner of
+    client side throttling.
+
+    Over the last window_size seconds, each call is rejected with probability
+    max(0, (requests - multiplier * accepts) / (requests + 1)), where requests
+    counts every call including the rejected ones and accepts counts the calls
+    that succeeded. While the dependency succeeds nothing is rejected. As it
+    starts failing, the share of rejected calls grows until the calls let
+    through match the throughput it can still handle, and the calls that do
+    get through find out when it recovers. The breaker never opens.
+
+    Calls are counted in a ring of one bucket per second, as in
+    SlidingWindowStrategy.
+    """
+
+    __slots__ = ("_buckets", "_multiplier", "_random")
+
+    MULTIPLIER = 2.0
+    WINDOW_SIZE = 120
+
+    def __init__(
+        self,
+        error_threshold,
+        recovery_threshold,
+        clock,
+        multiplier=MULTIPLIER,
+        window_size=WINDOW_SIZE,
+        random_func=random.random,
+    ):
+        if multiplier < 1:
+            raise ValueError(f"multiplier must be at least 1, got {multiplier}")
+
+        self._buckets = SecondBuckets(clock, window_size, 2)
+        self._multiplier = multiplier
+        self._random = random_func
+
+    def allow_request(self) -> bool:
+        """
+        Decide whether a call may be made and count it
+        """
+        # The call itself is not counted yet, so a healthy or idle window
+        # never rejects it
+        rejection_rate = self.rejection_rate
+        self._buckets.add(REQUESTS)
+        return rejection_rate == 0 or self._random() >= rejection_rate
+
+    def dump(self) -> Tuple[CircuitBreakerState, int, int]:
+        # The window is not shared, and the breaker is always closed
+        return CircuitBreakerState.CLOSED, 0, 0
+
+    def load(self, state: CircuitBreakerState, error_count: int, success_count: int):
+        pass
+
+    def handle_error(self, slow=False) -> bool:
+        return False
+
+    def handle_slow_success(self) -> bool:
+        # A slow call is not an accept, so it raises the rejection rate
+        return False
+
+    def handle_success(self) -> bool:
+        self._buckets.add(ACCEPTS)
+        return False
+
+    @property
+    def error_count(self) -> int:
+        """
+        The number of calls in the window that were rejected or did not succeed
+        """
+        buckets = self._buckets
+        return max(0, buckets.total(REQUESTS) - buckets.total(ACCEPTS))
+
+    @property
+    def rejection_rate(self) -> float:
+        """
+        The probability that a call is rejected
+        """
+        requests = self._buckets.total(REQUESTS)
+        accepts = self._buckets.total(ACCEPTS)
+        return max(0.0, (requests - self._multiplier * accepts) / (requests + 1))
+
+    @property
+    def steady(self) -> bool:
+        # Every call is recorded in the window
+        return False
+
+    @property
+    def state(self) -> CircuitBreakerState:
+        return CircuitBreakerState.CLOSED
+
+    @property
+    def state_code(self) -> int:
+        return CLOSED
+
+    @property
+    def success_count(self) -> int:
+        return self._buckets.total(ACCEPTS)
@@ -0,0 +1,73 @@
+from array import array
+from typing import Callable
+
+
+class SecondBuckets:
+    """
+    Counts events of several kinds over the last window_size seconds.
+
+    Each counter is kept in a ring of one bucket per second, so memory does
+    not grow with the event rate and counting an event is O(1). Buckets that
+    fall out of the window are cleared as the clock moves forward.
+    """
+
+    __slots__ = ("_clock", "_counts", "_head", "_totals", "_window_size")
+
+    def __init__(self, clock: Callable[[], float], window_size: int, counters: int):
+        if window_size < 1:
+            raise ValueError(
+                f"window_size must be at least 1 second, got {window_size}"
+            )
+
+        self._clock = clock
+        self._window_size = int(window_size)
+        self._counts = tuple(
+            array("L", [0]) * self._window_size for _ in range(counters)
+        )
+        self._totals = [0] * counters
+        self._head = int(clock())
+
+    def __len__(self) -> int:
+        return self._window_size
+
+    def add(self, counter: int):
+        index = self._advance()
+        self._counts[counter][index] += 1
+        self._totals[counter] += 1
+
+    def total(self, counter: int) -> int:
+        """
+        The number of events counted by counter in the window
+        """
+        self._advance()
+        return self._totals[counter]
+
+    def reset(self):
+        empty = array("L", [0]) * self._window_size
+        for counts in self._counts:
+            counts[:] = empty
+
+        self._totals = [0] * len(self._counts)
+
+    def _advance(self) -> int:
+        """
+        Expire the buckets that have left the window and return the index of
+        the bucket for the current second
+        """
+        second = int(self._clock())
+        head = self._head
+
+        if second > head:
+            if second - head >= self._window_size:
+                self.reset()
+            else:
+                totals = self._totals
+                for expired in range(head + 1, second + 1):
+                    index = expired % self._window_size
+                    for counter, counts in enumerate(self._counts):
+                        totals[counter] -= counts[index]
+                        counts[index] = 0
+
+            self._head = second
+
+        return self._head % self._window_size
@@ -0,0 +1,93 @@
+from .window import WindowStrategy
+
+
+class CountWindowStrategy(WindowStrategy):
+    """
+    Tracks the failure rate of the last window_size calls.
+
+    Failures and slow calls are stored as single bits in two rings, so a
+    window of 1000 calls takes 250 bytes. Running totals keep recording a call
+    O(1).
+    """
+
+    __slots__ = (
+        "_outcomes",
+        "_position",
+        "_slow_outcomes",
+        "_total_calls",
+        "_total_failures",
+        "_total_slow_calls",
+        "_window_size",
+    )
+
+    WINDOW_SIZE = 100
+
+    def __init__(
+        self,
+        error_threshold,
+        recovery_threshold,
+        clock=None,
+        window_size=WINDOW_SIZE,
+        **kwargs,
+    ):
+        super().__init__(recovery_threshold, **kwargs)
+
+        if window_size < 1:
+            raise ValueError(f"window_size must be at least 1 call, got {window_size}")
+
+        self._window_size = int(window_size)
+        self._outcomes = bytearray((self._window_size + 7) // 8)
+        self._slow_outcomes = bytearray(len(self._outcomes))
+        self._position = 0
+        self._total_calls = 0
+        self._total_failures = 0
+        self._total_slow_calls = 0
+
+    def _record(self, failed: bool, slow: bool):
+        position = self._position
+        index = position >> 3
+        bit = 1 << (position & 7)
+
+        if self._total_calls == self._window_size:
+            # The oldest outcome is overwritten
+            if self._outcomes[index] & bit:
+                self._total_failures -= 1
+            if self._slow_outcomes[index] & bit:
+                self._total_slow_calls -= 1
+        else:
+            self._total_calls += 1
+
+        if failed:
+            self._outcomes[index] |= bit
+            self._total_failures += 1
+        else:
+            self._outcomes[index] &= ~bit
+
+        if slow:
+            self._slow_outcomes[index] |= bit
+            self._total_slow_calls += 1
+        else:
+            self._slow_outcomes[index] &= ~bit
+
+        position += 1
+        self._position = 0 if position == self._window_size else position
+
+    def _reset(self):
+        self._outcomes[:] = bytes(len(self._outcomes))
+        self._slow_outcomes[:] = bytes(len(self._slow_outcomes))
+        self._position = 0
+        self._total_calls = 0
+        self._total_failures = 0
+        self._total_slow_calls = 0
+
+    @property
+    def _calls(self) -> int:
+        return self._total_calls
+
+    @property
+    def _failures(self) -> int:
+        return self._total_failures
+
+    @property
+    def _slow_calls(self) -> int:
+        return self._total_slow_calls
@@ -1,31 +1,50 @@
 from datetime import datetime
+from typing import Tuple
 
-from ..state import CircuitBreakerState
+from ..state import CircuitBreakerState, CLOSED, OPEN, STATE_CODES, STATES
 
 
 class NetErrorStrategy:
-    def __init__(self, error_threshold, recovery_threshold):
+    __slots__ = (
+        "_error_threshold",
+        "_net_error_count",
+        "_recovery_threshold",
+        "_state",
+    )
+
+    def __init__(self, error_threshold, recovery_threshold, clock=None):
         self._error_threshold = error_threshold
         self._net_error_count = 0
         self._recovery_threshold = recovery_threshold
-        self._state = CircuitBreakerState.CLOSED
+        self._state = CLOSED
+
+    def dump(self) -> Tuple[CircuitBreakerState, int, int]:
+        return STATES[self._state], self._net_error_count, 0
 
-    def handle_error(self) -> bool:
+    def load(self, state: CircuitBreakerState, error_count: int, success_count: int):
+        self._state = STATE_CODES[state]
+        self._net_error_count = error_count
+
+    def handle_error(self, slow=False) -> bool:
         self._net_error_count += 1
         opened = False
 
         if self._net_error_count >= self._error_threshold:
-            self._state = CircuitBreakerState.OPEN
+            self._state = OPEN
             opened = True
 
         return opened
 
+    def handle_slow_success(self) -> bool:
+        # Without a window to measure the slow call rate, a slow call is an error
+        return self.handle_error(slow=True)
+
     def handle_success(self) -> bool:
         self._net_error_count = max(0, self._net_error_count - 1)
         closed = False
 
         if self._net_error_count < self._error_threshold:
-            self._state = CircuitBreakerState.CLOSED
+            self._state = CLOSED
             closed = True
 
         return closed
@@ -34,8 +53,19 @@ class NetErrorStrategy:
     def error_count(self) -> int:
         return max(0, self._net_error_count - self._error_threshold)
 
+    @property
+    def steady(self) -> bool:
+        """
+        True when a success cannot change the state or error count of the strategy
+        """
+        return self._state == CLOSED and self._net_error_count == 0
+
     @property
     def state(self) -> CircuitBreakerState:
+        return STATES[self._state]
+
+    @property
+    def state_code(self) -> int:
         return self._state
 
     @property
@@ -1,33 +1,54 @@
 from datetime import datetime
+from typing import Tuple
 
-from ..state import CircuitBreakerState
+from ..state import CircuitBreakerState, CLOSED, OPEN, STATE_CODES, STATES
 
 
 class SingleResetStrategy:
-    def __init__(self, error_threshold, recovery_threshold):
+    __slots__ = (
+        "_error_count",
+        "_error_threshold",
+        "_recovery_threshold",
+        "_success_count",
+        "_state",
+    )
+
+    def __init__(self, error_threshold, recovery_threshold, clock=None):
         self._error_count = 0
         self._error_threshold = error_threshold
         self._recovery_threshold = recovery_threshold
         self._success_count = 0
-        self._state = CircuitBreakerState.CLOSED
+        self._state = CLOSED
+
+    def dump(self) -> Tuple[CircuitBreakerState, int, int]:
+        return STATES[self._state], self._error_count, self._success_count
 
-    def handle_error(self) -> bool:
+    def load(self, state: CircuitBreakerState, error_count: int, success_count: int):
+        self._state = STATE_CODES[state]
+        self._error_count = error_count
+        self._success_count = success_count
+
+    def handle_error(self, slow=False) -> bool:
         self._error_count += 1
         opened = False
 
         if self._error_count >= self._error_threshold:
-            self._state = CircuitBreakerState.OPEN
+            self._state = OPEN
             self._success_count = 0
             opened = True
 
         return opened
 
+    def handle_slow_success(self) -> bool:
+        # Without a window to measure the slow call rate, a slow call is an error
+        return self.handle_error(slow=True)
+
     def handle_success(self) -> bool:
         self._success_count += 1
         closed = False
 
         if self._success_count >= self._recovery_threshold:
-            self._state = CircuitBreakerState.CLOSED
+            self._state = CLOSED
             self._error_count = 0
             closed = True
 
@@ -37,8 +58,26 @@ class SingleResetStrategy:
     def error_count(self) -> int:
         return self._error_count
 
+    @property
+    def steady(self) -> bool:
+        """
+        True when a success cannot change the state or error count of the
+        strategy, now or through a later success
+        """
+        # Until recovery_threshold successes are counted, a success moves the
+        # breaker closer to the point where every success clears the errors
+        return (
+            self._state == CLOSED
+            and self._error_count == 0
+            and self._success_count >= self._recovery_threshold
+        )
+
     @property
     def state(self) -> CircuitBreakerState:
+        return STATES[self._state]
+
+    @property
+    def state_code(self) -> int:
         return self._state
 
     @property
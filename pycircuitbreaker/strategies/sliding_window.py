@@ -0,0 +1,55 @@
+from .buckets import SecondBuckets
+from .window import WindowStrategy
+
+# Counters of the buckets
+CALLS = 0
+FAILURES = 1
+SLOW_CALLS = 2
+
+
+class SlidingWindowStrategy(WindowStrategy):
+    """
+    Tracks the failure rate of the calls made in the last window_size seconds.
+
+    Calls are counted in a ring of one bucket per second, so memory does not
+    grow with the call rate and recording a call is O(1).
+    """
+
+    __slots__ = ("_buckets",)
+
+    WINDOW_SIZE = 60
+
+    def __init__(
+        self,
+        error_threshold,
+        recovery_threshold,
+        clock,
+        window_size=WINDOW_SIZE,
+        **kwargs,
+    ):
+        super().__init__(recovery_threshold, **kwargs)
+        self._buckets = SecondBuckets(clock, window_size, 3)
+
+    def _record(self, failed: bool, slow: bool):
+        self._buckets.add(CALLS)
+
+        if failed:
+            self._buckets.add(FAILURES)
+
+        if slow:
+            self._buckets.add(SLOW_CALLS)
+
+    def _reset(self):
+        self._buckets.reset()
+
+    @property
+    def _calls(self) -> int:
+        return self._buckets.total(CALLS)
+
+    @property
+    def _failures(self) -> int:
+        return self._buckets.total(FAILURES)
+
+    @property
+    def _slow_calls(self) -> int:
+        return self._buckets.total(SLOW_CALLS)
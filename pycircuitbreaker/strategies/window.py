@@ -0,0 +1,163 @@
+from typing import Tuple
+
+from ..state import CircuitBreakerState, CLOSED, OPEN, STATE_CODES, STATES
+
+
+class WindowStrategy:
+    """
+    Base class for strategies that open when the failure rate of the calls in
+    a window exceeds failure_rate_threshold percent, or when the rate of slow
+    calls exceeds slow_call_rate_threshold percent. The rates are only
+    considered once the window holds at least minimum_calls calls.
+
+    Subclasses implement _record, _reset and the _calls, _failures and
+    _slow_calls totals of the window.
+    """
+
+    __slots__ = (
+        "_failure_rate_threshold",
+        "_minimum_calls",
+        "_recovery_threshold",
+        "_slow_call_rate_threshold",
+        "_state",
+        "_success_count",
+    )
+
+    FAILURE_RATE_THRESHOLD = 50.0
+    MINIMUM_CALLS = 10
+    SLOW_CALL_RATE_THRESHOLD = 100.0
+
+    def __init__(
+        self,
+        recovery_threshold,
+        failure_rate_threshold=FAILURE_RATE_THRESHOLD,
+        minimum_calls=MINIMUM_CALLS,
+        slow_call_rate_threshold=SLOW_CALL_RATE_THRESHOLD,
+    ):
+        for name, value in (
+            ("failure_rate_threshold", failure_rate_threshold),
+            ("slow_call_rate_threshold", slow_call_rate_threshold),
+        ):
+            if not 0 < value <= 100:
+                raise ValueError(f"{name} must be a percentage, got {value}")
+
+        self._failure_rate_threshold = failure_rate_threshold
+        self._slow_call_rate_threshold = slow_call_rate_threshold
+        self._minimum_calls = max(1, minimum_calls)
+        self._recovery_threshold = recovery_threshold
+        self._success_count = 0
+        self._state = CLOSED
+
+    def dump(self) -> Tuple[CircuitBreakerState, int, int]:
+        # The window itself is not shared, only the state and recovery progress
+        return STATES[self._state], 0, self._success_count
+
+    def load(self, state: CircuitBreakerState, error_count: int, success_count: int):
+        state = STATE_CODES[state]
+        if state == CLOSED and self._state != state:
+            self._reset()
+
+        self._state = state
+        self._success_count = success_count
+
+    def handle_error(self, slow=False) -> bool:
+        if self._state == OPEN:
+            return self._fail_recovery()
+
+        self._record(True, slow)
+        return self._open_if_exceeded()
+
+    def handle_slow_success(self) -> bool:
+        if self._state == OPEN:
+            # A slow recovery call shows the dependency has not recovered
+            return self._fail_recovery()
+
+        self._record(False, True)
+        return self._open_if_exceeded()
+
+    def handle_success(self) -> bool:
+        if self._state == CLOSED:
+            self._record(False, False)
+            return False
+
+        self._success_count += 1
+        if self._success_count >= self._recovery_threshold:
+            self._state = CLOSED
+            self._reset()
+            return True
+
+        return False
+
+    @property
+    def error_count(self) -> int:
+        return self._failures
+
+    @property
+    def failure_rate(self) -> float:
+        """
+        The percentage of calls in the window that failed
+        """
+        calls = self._calls
+        return self._failures * 100 / calls if calls else 0.0
+
+    @property
+    def slow_call_rate(self) -> float:
+        """
+        The percentage of calls in the window that were slow
+        """
+        calls = self._calls
+        return self._slow_calls * 100 / calls if calls else 0.0
+
+    @property
+    def steady(self) -> bool:
+        # Every success is recorded in the window
+        return False
+
+    @property
+    def state(self) -> CircuitBreakerState:
+        return STATES[self._state]
+
+    @property
+    def state_code(self) -> int:
+        return self._state
+
+    @property
+    def success_count(self) -> int:
+        return self._success_count
+
+    def _fail_recovery(self) -> bool:
+        self._success_count = 0
+        return True
+
+    def _open_if_exceeded(self) -> bool:
+        calls = self._calls
+        if calls < self._minimum_calls:
+            return False
+
+        if (
+            self._failures * 100 >= self._failure_rate_threshold * calls
+            or self._slow_calls * 100 >= self._slow_call_rate_threshold * calls
+        ):
+            self._state = OPEN
+            self._success_count = 0
+            return True
+
+        return False
+
+    def _record(self, failed: bool, slow: bool):
+        raise NotImplementedError()
+
+    def _reset(self):
+        raise NotImplementedError()
+
+    @property
+    def _calls(self) -> int:
+        raise NotImplementedError()
+
+    @property
+    def _failures(self) -> int:
+        raise NotImplementedError()
+
+    @property
+    def _slow_calls(self) -> int:
+        raise NotImplementedError()
@@ -0,0 +1,141 @@
+import contextvars
+from concurrent.futures import Future, ThreadPoolExecutor
+from threading import Lock
+from typing import Any, Callable, Dict, Optional, Tuple
+
+_default_executor: Optional["TimeoutExecutor"] = None
+_default_executor_lock = Lock()
+
+
+class TimeoutExecutor:
+    """
+    Runs synchronous calls in a bounded pool of threads so that a caller can
+    stop waiting for a call that takes longer than its timeout.
+
+    Up to max_workers calls run at the same time and up to max_queue_size
+    further calls wait for a thread. Calls beyond that are rejected straight
+    away. A thread running a call that timed out stays busy until the call
+    returns, so calls that hang fill the executor and are then rejected
+    rather than starting ever more threads. Executors may be shared between
+    breakers.
+    """
+
+    MAX_WORKERS = 8
+    MAX_QUEUE_SIZE = 64
+
+    def __init__(
+        self, max_workers: int = MAX_WORKERS, max_queue_size: int = MAX_QUEUE_SIZE
+    ):
+        if max_workers < 1:
+            raise ValueError(f"max_workers must be at least 1, got {max_workers}")
+
+        if max_queue_size < 0:
+            raise ValueError(
+                f"max_queue_size must not be negative, got {max_queue_size}"
+            )
+
+        self._max_workers = max_workers
+        self._max_queue_size = max_queue_size
+        self._executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix="pycircuitbreaker-timeout"
+        )
+        self._pending_calls = 0
+        self._running_calls = 0
+        self._rejected_count = 0
+        self._lock = Lock()
+
+    def acquire(self) -> bool:
+        """
+        Reserve room for a call. Returns False if the executor is full
+        """
+        with self._lock:
+            if self._pending_calls >= self._max_workers + self._max_queue_size:
+                self._rejected_count += 1
+                return False
+
+            self._pending_calls += 1
+            return True
+
+    def submit(self, func: Callable, args: Tuple, kwargs: Dict[str, Any]) -> Future:
+        """
+        Call func with args in a worker thread, in a copy of the context of
+        the caller, using the room reserved by acquire
+        """
+        context = contextvars.copy_context()
+        try:
+            future = self._executor.submit(self._run, context, func, args, kwargs)
+        except BaseException:
+            self._release()
+            raise
+
+        future.add_done_callback(self._release)
+        return future
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait)
+
+    @property
+    def max_queue_size(self) -> int:
+        return self._max_queue_size
+
+    @property
+    def max_workers(self) -> int:
+        return self._max_workers
+
+    @property
+    def queue_depth(self) -> int:
+        """
+        The number of calls waiting for a thread
+        """
+        return self._pending_calls - self._running_calls
+
+    @property
+    def rejected_count(self) -> int:
+        """
+        The number of calls rejected because the executor was full
+        """
+        return self._rejected_count
+
+    @property
+    def running_calls(self) -> int:
+        """
+        The number of threads busy with a call, including calls that timed out
+        """
+        return self._running_calls
+
+    def snapshot(self) -> Dict[str, int]:
+        return {
+            "max_workers": self._max_workers,
+            "max_queue_size": self._max_queue_size,
+            "running_calls": self._running_calls,
+            "queue_depth": self.queue_depth,
+            "rejected_count": self._rejected_count,
+        }
+
+    def _run(self, context, func, args, kwargs):
+        with self._lock:
+            self._running_calls += 1
+
+        try:
+            return context.run(func, *args, **kwargs)
+        finally:
+            with self._lock:
+                self._running_calls -= 1
+
+    def _release(self, future: Optional[Future] = None):
+        with self._lock:
+            self._pending_calls -= 1
+
+
+def default_executor() -> TimeoutExecutor:
+    """
+    The executor shared by breakers with a timeout that were not given one,
+    created when first needed
+    """
+    global _default_executor
+
+    with _default_executor_lock:
+        if _default_executor is None:
+            _default_executor = TimeoutExecutor()
+
+        return _default_executor
@@ -21,7 +21,6 @@ setup(
         "Intended Audience :: Developers",
         "Topic :: Software Development :: Libraries :: Python Modules",
         "Programming Language :: Python :: 3",
-        "Programming Language :: Python :: 3.6",
         "Programming Language :: Python :: 3.7",
         "Programming Language :: Python :: 3.8",
         "Programming Language :: Python :: 3.9",
@@ -39,6 +38,7 @@ setup(
     packages=find_packages(exclude=["tests", "tests.*"]),
     package_data={"": ["VERSION"]},
     platforms="any",
+    python_requires=">=3.7",
     url="https://github.com/etimberg/pycircuitbreaker",
     version=version,
     zip_safe=False,
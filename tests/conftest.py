@@ -20,3 +20,44 @@ def success_func():
         return True
 
     return success
+
+
+@pytest.fixture()
+def async_error_func(io_error):
+    async def raises_error():
+        raise io_error
+
+    return raises_error
+
+
+@pytest.fixture()
+def async_success_func():
+    async def success():
+        return True
+
+    return success
+
+
+def fail(breaker, error_func, count=1):
+    """
+    Make count calls through breaker that fail with an IOError
+    """
+    for _ in range(count):
+        with pytest.raises(IOError):
+            breaker.call(error_func)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture()
+def clock():
+    return FakeClock()
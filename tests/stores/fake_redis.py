@@ -0,0 +1,164 @@
+"""
+A Redis server fake that speaks the Redis protocol on a local port.
+
+Only the commands used by RedisStore are implemented. Scripts cannot be run,
+so the fake registers a Python implementation of the merge script instead.
+"""
+
+import hashlib
+import socketserver
+import threading
+
+from pycircuitbreaker.stores.redis import MERGE_SCRIPT
+
+
+def merge_script(server, keys, args):
+    stored = server.data.setdefault(keys[0], {})
+    stored_open_count = int(stored.get(b"open_count", b"-1"))
+    open_count = int(args[0])
+
+    if args[2] == b"1":
+        if open_count > stored_open_count:
+            fields = (
+                b"open_count",
+                b"updated_at",
+                b"state",
+                b"error_count",
+                b"success_count",
+                b"opened_at",
+                b"open_until",
+                b"recovery_timeout",
+                b"failed_recoveries",
+            )
+            stored.update(zip(fields, args[:2] + args[3:10]))
+        elif open_count == stored_open_count:
+            error_count = max(0, int(stored[b"error_count"]) + int(args[11]))
+            success_count = max(0, int(stored[b"success_count"]) + int(args[12]))
+            stored[b"error_count"] = b"%d" % error_count
+            stored[b"success_count"] = b"%d" % success_count
+            stored[b"updated_at"] = args[1]
+            if args[3] == b"0":
+                stored[b"state"] = b"0"
+                stored[b"failed_recoveries"] = args[9]
+
+            error_threshold = int(args[13])
+            if (
+                error_threshold > 0
+                and error_count >= error_threshold
+                and stored[b"state"] == b"0"
+            ):
+                stored.update(
+                    {
+                        b"open_count": b"%d" % (open_count + 1),
+                        b"state": b"1",
+                        b"success_count": b"0",
+                        b"opened_at": args[1],
+                        b"open_until": args[15],
+                        b"recovery_timeout": args[14],
+                        b"failed_recoveries": b"0",
+                    }
+                )
+
+        server.data.setdefault(keys[1], set()).add(args[10])
+
+    return [item for pair in stored.items() for item in pair]
+
+
+SCRIPTS = {hashlib.sha1(MERGE_SCRIPT.encode()).hexdigest(): merge_script}
+
+
+class RedisHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        while True:
+            try:
+                command = self.read_command()
+            except ConnectionError:
+                return
+
+            if command is None:
+                return
+
+            self.server.commands.append(command)
+            with self.server.lock:
+                reply = self.execute(command[0].upper().decode(), command[1:])
+            self.wfile.write(self.encode(reply))
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+
+        count = int(line[1:-2])
+        command = []
+        for _ in range(count):
+            length = int(self.rfile.readline()[1:-2])
+            command.append(self.rfile.read(length + 2)[:-2])
+        return command
+
+    def execute(self, name, args):
+        data = self.server.data
+
+        if name == "PING":
+            return "PONG"
+        if name == "SCRIPT" and args[0].upper() == b"LOAD":
+            sha = hashlib.sha1(args[1]).hexdigest()
+            self.server.scripts.add(sha)
+            return sha.encode()
+        if name == "EVALSHA":
+            if self.server.error is not None:
+                return Exception(self.server.error)
+            script = SCRIPTS.get(args[0].decode())
+            if script is None or args[0].decode() not in self.server.scripts:
+                return Exception("NOSCRIPT No matching script")
+            key_count = int(args[1])
+            keys = [key.decode() for key in args[2 : 2 + key_count]]
+            return script(self.server, keys, args[2 + key_count :])
+        if name == "HGETALL":
+            stored = data.get(args[0].decode(), {})
+            return [item for pair in stored.items() for item in pair]
+        if name == "SMEMBERS":
+            return sorted(data.get(args[0].decode(), set()))
+
+        return Exception(f"ERR unknown command '{name}'")
+
+    def encode(self, reply):
+        if isinstance(reply, Exception):
+            return f"-{reply}\r\n".encode()
+        if isinstance(reply, str):
+            return f"+{reply}\r\n".encode()
+        if isinstance(reply, int):
+            return f":{reply}\r\n".encode()
+        if isinstance(reply, bytes):
+            return b"$%d\r\n%s\r\n" % (len(reply), reply)
+        if reply is None:
+            return b"$-1\r\n"
+        return b"*%d\r\n" % len(reply) + b"".join(self.encode(item) for item in reply)
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), RedisHandler)
+        self.commands = []
+        self.data = {}
+        # An error reply for every EVALSHA, if set
+        self.error = None
+        self.scripts = set()
+        self.lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self.serve_forever, kwargs={"poll_interval": 0.01}, daemon=True
+        )
+
+    @property
+    def port(self):
+        return self.server_address[1]
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
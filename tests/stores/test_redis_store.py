@@ -0,0 +1,276 @@
+import time
+
+import pytest
+
+from pycircuitbreaker import (
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitBreakerRegistryException,
+    CircuitBreakerState,
+)
+from pycircuitbreaker.stores import InMemoryStore, RedisStore
+from pycircuitbreaker.stores.redis import RedisError
+
+from .fake_redis import FakeRedisServer
+
+
+@pytest.fixture()
+def server():
+    with FakeRedisServer() as server:
+        yield server
+
+
+@pytest.fixture()
+def make_store(server, clock):
+    stores = []
+
+    def make_store():
+        # A long interval so that tests flush explicitly
+        store = RedisStore(port=server.port, flush_interval=60, clock=clock)
+        stores.append(store)
+        return store
+
+    yield make_store
+
+    for store in stores:
+        store.close()
+
+
+def make_breaker(store, clock, **kwargs):
+    return CircuitBreaker(
+        breaker_id="db", clock=clock, recovery_timeout=30, store=store, **kwargs
+    )
+
+
+def test_calls_do_not_wait_for_the_server(server, make_store, clock, error_func):
+    breaker = make_breaker(make_store(), clock, error_threshold=1)
+
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+
+    assert breaker.state == CircuitBreakerState.OPEN
+    assert not [command for command in server.commands if command[0] == b"EVALSHA"]
+
+
+def test_hosts_share_state_after_flush(make_store, clock, error_func):
+    first_store = make_store()
+    second_store = make_store()
+    first = make_breaker(first_store, clock, error_threshold=1)
+    second = make_breaker(second_store, clock, error_threshold=1)
+
+    with pytest.raises(IOError):
+        first.call(error_func)
+    assert second.state == CircuitBreakerState.CLOSED
+
+    first_store.flush()
+    second_store.flush()
+
+    assert second.state == CircuitBreakerState.OPEN
+    assert second.recovery_time_remaining == 30
+
+
+def test_flush_batches_all_breakers_in_one_pipeline(server, make_store, clock):
+    store = make_store()
+    breakers = [
+        CircuitBreaker(breaker_id=f"service-{index}", clock=clock, store=store)
+        for index in range(10)
+    ]
+    for breaker in breakers:
+        breaker.call(lambda: True)
+
+    store.flush()
+
+    evals = [command for command in server.commands if command[0] == b"EVALSHA"]
+    assert len(evals) == 10
+    assert len(store.records()) == 10
+
+
+def test_most_recently_opened_record_wins(make_store, clock, error_func, success_func):
+    first_store = make_store()
+    second_store = make_store()
+    first = make_breaker(first_store, clock, error_threshold=1)
+    second = make_breaker(second_store, clock, error_threshold=1)
+
+    with pytest.raises(IOError):
+        first.call(error_func)
+    first_store.flush()
+
+    # The second host has not seen the breaker open yet
+    second.call(success_func)
+    second_store.flush()
+
+    assert second.state == CircuitBreakerState.OPEN
+
+
+def test_error_counts_of_hosts_add_up(make_store, clock, error_func):
+    first_store = make_store()
+    second_store = make_store()
+    first = make_breaker(first_store, clock, error_threshold=4)
+    second = make_breaker(second_store, clock, error_threshold=4)
+
+    for breaker in (first, second):
+        for _ in range(3):
+            with pytest.raises(IOError):
+                breaker.call(error_func)
+
+    first_store.flush()
+    second_store.flush()
+    first_store.flush()
+
+    assert first.state == CircuitBreakerState.OPEN
+    assert second.state == CircuitBreakerState.OPEN
+
+
+def test_counts_are_not_sent_twice(make_store, clock, error_func):
+    first_store = make_store()
+    second_store = make_store()
+    first = make_breaker(first_store, clock, error_threshold=4)
+    second = make_breaker(second_store, clock, error_threshold=4)
+
+    with pytest.raises(IOError):
+        first.call(error_func)
+    for _ in range(3):
+        first_store.flush()
+    second_store.flush()
+
+    assert second.error_count == 1
+    assert second.state == CircuitBreakerState.CLOSED
+
+
+def test_script_is_loaded_again_when_the_server_lost_it(
+    server, make_store, clock, error_func
+):
+    first_store = make_store()
+    second_store = make_store()
+    first = make_breaker(first_store, clock, error_threshold=1)
+    second = make_breaker(second_store, clock, error_threshold=1)
+    first_store.flush()
+
+    # The server restarted or failed over to a replica without the script
+    server.scripts.clear()
+    with pytest.raises(IOError):
+        first.call(error_func)
+    first_store.flush()
+    second_store.flush()
+
+    assert second.state == CircuitBreakerState.OPEN
+
+
+def test_error_reply_keeps_changes_for_next_flush(
+    server, make_store, clock, error_func
+):
+    first_store = make_store()
+    second_store = make_store()
+    first = make_breaker(first_store, clock, error_threshold=1)
+    second = make_breaker(second_store, clock, error_threshold=1)
+
+    with pytest.raises(IOError):
+        first.call(error_func)
+
+    server.error = "BUSY Redis is busy running a script"
+    with pytest.raises(RedisError):
+        first_store.flush()
+    assert first_store.slot("db").dirty
+
+    server.error = None
+    first_store.flush()
+    second_store.flush()
+
+    assert second.state == CircuitBreakerState.OPEN
+
+
+def test_background_thread_flushes(server, clock, error_func):
+    first_store = RedisStore(port=server.port, flush_interval=0.01)
+    second_store = RedisStore(port=server.port, flush_interval=0.01)
+    try:
+        first = make_breaker(first_store, clock, error_threshold=1)
+        second = make_breaker(second_store, clock, error_threshold=1)
+
+        with pytest.raises(IOError):
+            first.call(error_func)
+
+        deadline = time.monotonic() + 5
+        while second.state != CircuitBreakerState.OPEN:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+    finally:
+        first_store.close()
+        second_store.close()
+
+
+def test_unreachable_server_keeps_local_state(clock, error_func):
+    store = RedisStore(port=1, flush_interval=60)
+    breaker = make_breaker(store, clock, error_threshold=1)
+
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+
+    with pytest.raises(OSError):
+        store.flush()
+
+    assert breaker.state == CircuitBreakerState.OPEN
+    assert store.slot("db").dirty
+
+
+def test_registry_cluster_states(make_store, clock, error_func):
+    store = make_store()
+    registry = CircuitBreakerRegistry(store=store, clock=clock)
+    breaker = make_breaker(store, clock, error_threshold=1)
+    CircuitBreaker(breaker_id="cache", clock=clock, store=store).call(lambda: True)
+
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+    store.flush()
+
+    assert registry.get_cluster_states() == {
+        "db": CircuitBreakerState.OPEN,
+        "cache": CircuitBreakerState.CLOSED,
+    }
+
+    clock.advance(30)
+    assert registry.get_cluster_states()["db"] == CircuitBreakerState.HALF_OPEN
+
+
+def test_monotonic_breakers_store_wall_clock_times(server, error_func):
+    first_store = RedisStore(port=server.port, flush_interval=60)
+    second_store = RedisStore(port=server.port, flush_interval=60)
+    try:
+        first = CircuitBreaker(
+            breaker_id="db", error_threshold=1, recovery_timeout=30, store=first_store
+        )
+        second = CircuitBreaker(
+            breaker_id="db", error_threshold=1, recovery_timeout=30, store=second_store
+        )
+
+        with pytest.raises(IOError):
+            first.call(error_func)
+        first_store.flush()
+        second_store.flush()
+
+        stored = first_store.records()["db"]
+        assert stored.open_until == pytest.approx(time.time() + 30, abs=1)
+        assert second.state == CircuitBreakerState.OPEN
+        assert second.recovery_time_remaining == pytest.approx(30, abs=1)
+        assert CircuitBreakerRegistry(store=first_store).get_cluster_states() == {
+            "db": CircuitBreakerState.OPEN
+        }
+    finally:
+        first_store.close()
+        second_store.close()
+
+
+def test_in_memory_store_shares_state_between_breakers(clock, error_func):
+    store = InMemoryStore()
+    first = make_breaker(store, clock, error_threshold=1)
+    second = make_breaker(store, clock, error_threshold=1)
+
+    with pytest.raises(IOError):
+        first.call(error_func)
+
+    assert second.state == CircuitBreakerState.OPEN
+    assert list(store.records()) == ["db"]
+
+
+def test_registry_cluster_states_requires_store():
+    with pytest.raises(CircuitBreakerRegistryException):
+        CircuitBreakerRegistry().get_cluster_states()
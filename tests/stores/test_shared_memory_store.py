@@ -0,0 +1,196 @@
+import multiprocessing
+import os
+import sys
+import threading
+
+import pytest
+
+from pycircuitbreaker import (
+    CircuitBreaker,
+    CircuitBreakerState,
+    CircuitBreakerStoreException,
+)
+from pycircuitbreaker.stores import SharedMemoryStore
+from pycircuitbreaker.stores.shared_memory import SLOT_SIZE, VERSION_FORMAT
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+pytestmark = pytest.mark.skipif(
+    sys.platform == "win32", reason="SharedMemoryStore requires POSIX file locking"
+)
+
+
+@pytest.fixture()
+def path(tmp_path):
+    return str(tmp_path / "breakers")
+
+
+def make_breaker(path, clock, breaker_id="db", **kwargs):
+    return CircuitBreaker(
+        breaker_id=breaker_id,
+        clock=clock,
+        recovery_timeout=30,
+        store=SharedMemoryStore(path, slots=8),
+        **kwargs,
+    )
+
+
+def test_breakers_with_same_id_share_state(path, clock, error_func):
+    first = make_breaker(path, clock, error_threshold=2)
+    second = make_breaker(path, clock, error_threshold=2)
+
+    with pytest.raises(IOError):
+        first.call(error_func)
+    assert second.error_count == 1
+
+    with pytest.raises(IOError):
+        second.call(error_func)
+
+    assert first.state == CircuitBreakerState.OPEN
+    assert second.state == CircuitBreakerState.OPEN
+    assert first.recovery_time_remaining == 30
+
+
+def test_breakers_with_different_ids_do_not_share_state(path, clock, error_func):
+    first = make_breaker(path, clock, breaker_id="db", error_threshold=1)
+    second = make_breaker(path, clock, breaker_id="cache", error_threshold=1)
+
+    with pytest.raises(IOError):
+        first.call(error_func)
+
+    assert first.state == CircuitBreakerState.OPEN
+    assert second.state == CircuitBreakerState.CLOSED
+
+
+def test_shared_breaker_recovers_everywhere(path, clock, error_func, success_func):
+    on_close = []
+    first = make_breaker(path, clock, error_threshold=1)
+    second = make_breaker(
+        path, clock, error_threshold=1, on_close=lambda breaker: on_close.append(1)
+    )
+
+    with pytest.raises(IOError):
+        first.call(error_func)
+
+    clock.advance(30)
+    assert second.state == CircuitBreakerState.HALF_OPEN
+
+    second.call(success_func)
+    assert first.state == CircuitBreakerState.CLOSED
+    assert on_close == [1]
+
+
+def test_success_in_one_breaker_resets_errors_of_another(
+    path, clock, error_func, success_func
+):
+    first = make_breaker(path, clock, error_threshold=2)
+    second = make_breaker(path, clock, error_threshold=2)
+
+    with pytest.raises(IOError):
+        first.call(error_func)
+    second.call(success_func)
+
+    assert first.error_count == 0
+
+
+def test_writer_killed_mid_write(path, clock, error_func):
+    breaker = make_breaker(path, clock, error_threshold=1)
+    slot = breaker._slot
+    buffer = slot._store._mmap
+    version = VERSION_FORMAT.unpack_from(buffer, slot._offset)[0]
+
+    # A writer killed after marking the slot as being written
+    VERSION_FORMAT.pack_into(buffer, slot._offset, version + 1)
+
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+
+    assert VERSION_FORMAT.unpack_from(buffer, slot._offset)[0] % 2 == 0
+    assert breaker.state == CircuitBreakerState.OPEN
+
+
+def slot_is_locked(path, offset):
+    fd = os.open(path, os.O_RDWR)
+    try:
+        fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB, SLOT_SIZE, offset)
+    except OSError:
+        os._exit(0)
+    os._exit(1)
+
+
+def test_records_keeps_slot_locked_by_another_thread(path):
+    store = SharedMemoryStore(path, slots=8)
+    slot = store.slot("db")
+    locked = threading.Event()
+    release = threading.Event()
+
+    def hold_lock():
+        with slot.lock():
+            locked.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold_lock)
+    holder.start()
+    locked.wait(5)
+    reader = threading.Thread(target=store.records)
+    reader.start()
+    reader.join(0.05)
+
+    try:
+        # records() waits for the thread lock rather than taking the slot
+        assert reader.is_alive()
+
+        context = multiprocessing.get_context("fork")
+        process = context.Process(target=slot_is_locked, args=(path, slot._offset))
+        process.start()
+        process.join()
+        assert process.exitcode == 0
+    finally:
+        release.set()
+        holder.join()
+        reader.join()
+
+
+def test_breaker_ids_with_the_same_name_share_a_slot(path):
+    store = SharedMemoryStore(path, slots=8)
+
+    assert store.slot(1) is store.slot("1")
+
+
+def test_store_raises_when_full(path):
+    store = SharedMemoryStore(path, slots=2)
+    store.slot("first")
+    store.slot("second")
+
+    with pytest.raises(CircuitBreakerStoreException):
+        store.slot("third")
+
+
+def fail_once(path):
+    breaker = CircuitBreaker(
+        breaker_id="db", error_threshold=4, store=SharedMemoryStore(path, slots=8)
+    )
+
+    try:
+        breaker.call(int, "not a number")
+    except ValueError:
+        pass
+
+
+def test_processes_trip_together(path):
+    context = multiprocessing.get_context("fork")
+    processes = [context.Process(target=fail_once, args=(path,)) for _ in range(4)]
+
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+    breaker = CircuitBreaker(breaker_id="db", store=SharedMemoryStore(path, slots=8))
+    assert breaker.error_count == 4
+    assert breaker.state == CircuitBreakerState.OPEN
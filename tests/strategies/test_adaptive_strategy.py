@@ -0,0 +1,131 @@
+import pytest
+
+from pycircuitbreaker import CircuitBreaker, CircuitBreakerState, ThrottledException
+from pycircuitbreaker.strategies import AdaptiveStrategy, CircuitBreakerStrategy
+
+from ..conftest import fail
+
+
+class FixedRandom:
+    def __init__(self, value):
+        self.value = value
+
+    def __call__(self):
+        return self.value
+
+
+@pytest.fixture()
+def random_func():
+    # Let calls through unless a test lowers the value
+    return FixedRandom(0.99)
+
+
+@pytest.fixture()
+def breaker(clock, random_func):
+    return CircuitBreaker(
+        clock=clock,
+        metrics=True,
+        strategy=CircuitBreakerStrategy.ADAPTIVE,
+        strategy_options={
+            "multiplier": 2,
+            "random_func": random_func,
+            "window_size": 10,
+        },
+    )
+
+
+def test_adaptive_admits_everything_while_healthy(breaker, success_func):
+    for _ in range(100):
+        breaker.call(success_func)
+
+    assert breaker._strategy.rejection_rate == 0
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_adaptive_never_sheds_calls_to_a_healthy_backend(clock, success_func):
+    for _ in range(200):
+        breaker = CircuitBreaker(
+            clock=clock,
+            strategy=CircuitBreakerStrategy.ADAPTIVE,
+            strategy_options={"window_size": 10},
+        )
+        for _ in range(20):
+            breaker.call(success_func)
+
+
+def test_adaptive_admits_first_call_after_idle_window(
+    breaker, clock, error_func, random_func, success_func
+):
+    # Shed every call that has any chance of being shed
+    random_func.value = 0.0
+    breaker.call(success_func)
+
+    fail(breaker, error_func)
+    clock.advance(10)
+
+    breaker.call(success_func)
+    assert breaker._strategy.rejection_rate == 0
+
+
+def test_adaptive_rejection_rate(breaker, error_func, success_func):
+    for _ in range(2):
+        breaker.call(success_func)
+    fail(breaker, error_func, 6)
+
+    # 8 requests and 2 accepts: (8 - 2 * 2) / (8 + 1)
+    assert breaker._strategy.rejection_rate == pytest.approx(4 / 9)
+
+
+def test_adaptive_sheds_calls_when_failing(breaker, error_func, random_func):
+    fail(breaker, error_func, 3)
+    assert breaker._strategy.rejection_rate == pytest.approx(3 / 4)
+
+    random_func.value = 0.5
+    with pytest.raises(ThrottledException) as exc_info:
+        breaker.call(error_func)
+
+    assert exc_info.value.rejection_rate == pytest.approx(4 / 5)
+    assert str(exc_info.value).endswith("throttled (80% of calls rejected)")
+    assert breaker.metrics.rejections["throttled"] == 1
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_adaptive_lets_some_calls_through(breaker, error_func, random_func):
+    fail(breaker, error_func, 3)
+
+    random_func.value = 0.9
+    fail(breaker, error_func)
+
+
+def test_adaptive_forgets_old_calls(breaker, clock, error_func, success_func):
+    fail(breaker, error_func, 3)
+
+    clock.advance(10)
+
+    assert breaker._strategy.rejection_rate == 0
+    breaker.call(success_func)
+
+
+def test_adaptive_slow_successes_are_not_accepts(clock, random_func):
+    strategy = AdaptiveStrategy(
+        error_threshold=5,
+        recovery_threshold=1,
+        clock=clock,
+        window_size=10,
+        random_func=random_func,
+    )
+
+    for _ in range(3):
+        assert strategy.allow_request()
+        strategy.handle_slow_success()
+
+    assert strategy.success_count == 0
+    assert strategy.error_count == 3
+
+
+def test_adaptive_invalid_options(clock):
+    with pytest.raises(ValueError):
+        AdaptiveStrategy(5, 1, clock, multiplier=0.5)
+
+    with pytest.raises(ValueError):
+        AdaptiveStrategy(5, 1, clock, window_size=0)
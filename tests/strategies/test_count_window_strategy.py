@@ -0,0 +1,81 @@
+import pytest
+
+from pycircuitbreaker import CircuitBreaker, CircuitBreakerState
+from pycircuitbreaker.strategies import CircuitBreakerStrategy, get_strategy
+from pycircuitbreaker.strategies.count_window import CountWindowStrategy
+
+from ..conftest import fail
+
+
+@pytest.fixture()
+def breaker(clock):
+    return CircuitBreaker(
+        clock=clock,
+        recovery_timeout=30,
+        strategy=CircuitBreakerStrategy.COUNT_WINDOW,
+        strategy_options={
+            "failure_rate_threshold": 50,
+            "minimum_calls": 4,
+            "window_size": 10,
+        },
+    )
+
+
+def test_count_window_is_registered():
+    assert get_strategy(CircuitBreakerStrategy.COUNT_WINDOW) is CountWindowStrategy
+
+
+def test_count_window_waits_for_minimum_calls(breaker, error_func):
+    fail(breaker, error_func, 3)
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+    fail(breaker, error_func)
+    assert breaker.state == CircuitBreakerState.OPEN
+
+
+def test_count_window_only_counts_last_calls(breaker, error_func, success_func):
+    fail(breaker, error_func, 2)
+    for _ in range(8):
+        breaker.call(success_func)
+    assert breaker.error_count == 2
+
+    # The two failures are pushed out of the window by the next successes
+    breaker.call(success_func)
+    breaker.call(success_func)
+    assert breaker.error_count == 0
+
+    fail(breaker, error_func, 4)
+    assert breaker.error_count == 4
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+    fail(breaker, error_func)
+    assert breaker.state == CircuitBreakerState.OPEN
+
+
+def test_count_window_recovers_with_an_empty_window(
+    breaker, clock, error_func, success_func
+):
+    fail(breaker, error_func, 4)
+    clock.advance(30)
+
+    breaker.call(success_func)
+    assert breaker.state == CircuitBreakerState.CLOSED
+    assert breaker.error_count == 0
+    assert breaker._strategy._calls == 0
+
+
+def test_count_window_is_bit_packed():
+    strategy = CountWindowStrategy(
+        error_threshold=5, recovery_threshold=1, window_size=1000, minimum_calls=2000
+    )
+
+    for index in range(2500):
+        if index % 4 == 0:
+            strategy.handle_error()
+        else:
+            strategy.handle_success()
+
+    assert len(strategy._outcomes) == 125
+    assert strategy._calls == 1000
+    assert strategy.error_count == 250
+    assert strategy.failure_rate == pytest.approx(25)
@@ -0,0 +1,111 @@
+import pytest
+
+from pycircuitbreaker import CircuitBreaker, CircuitBreakerState
+from pycircuitbreaker.strategies import CircuitBreakerStrategy
+
+from ..conftest import fail
+
+
+@pytest.fixture()
+def breaker(clock):
+    return CircuitBreaker(
+        clock=clock,
+        recovery_timeout=30,
+        strategy=CircuitBreakerStrategy.SLIDING_WINDOW,
+        strategy_options={
+            "failure_rate_threshold": 50,
+            "minimum_calls": 4,
+            "window_size": 10,
+        },
+    )
+
+
+def test_sliding_window_waits_for_minimum_calls(breaker, error_func):
+    fail(breaker, error_func, 3)
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+    fail(breaker, error_func)
+    assert breaker.state == CircuitBreakerState.OPEN
+
+
+def test_sliding_window_opens_on_failure_rate(breaker, error_func, success_func):
+    for _ in range(3):
+        breaker.call(success_func)
+    fail(breaker, error_func, 2)
+
+    assert breaker.state == CircuitBreakerState.CLOSED
+    assert breaker._strategy.failure_rate == pytest.approx(40)
+
+    fail(breaker, error_func)
+    assert breaker.state == CircuitBreakerState.OPEN
+
+
+def test_sliding_window_forgets_old_calls(breaker, clock, error_func):
+    fail(breaker, error_func, 3)
+    assert breaker.error_count == 3
+
+    clock.advance(5)
+    fail(breaker, error_func)
+    assert breaker.error_count == 4
+    assert breaker.state == CircuitBreakerState.OPEN
+
+    clock.advance(60)
+    assert breaker.error_count == 0
+
+
+def test_sliding_window_expires_buckets_one_second_at_a_time(
+    breaker, clock, error_func, success_func
+):
+    fail(breaker, error_func, 2)
+    clock.advance(5)
+    breaker.call(success_func)
+    breaker.call(success_func)
+
+    clock.advance(5)
+    # The failures are now 10 seconds old and have left the window
+    fail(breaker, error_func)
+    assert breaker.error_count == 1
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_sliding_window_recovers(breaker, clock, error_func, success_func):
+    fail(breaker, error_func, 4)
+    assert breaker.state == CircuitBreakerState.OPEN
+
+    clock.advance(30)
+    assert breaker.state == CircuitBreakerState.HALF_OPEN
+
+    breaker.call(success_func)
+    assert breaker.state == CircuitBreakerState.CLOSED
+    assert breaker.error_count == 0
+
+
+def test_sliding_window_failed_recovery_reopens(breaker, clock, error_func):
+    fail(breaker, error_func, 4)
+    clock.advance(30)
+
+    fail(breaker, error_func)
+    assert breaker.state == CircuitBreakerState.OPEN
+
+
+def test_sliding_window_memory_is_constant(breaker, success_func):
+    for _ in range(1000):
+        breaker.call(success_func)
+
+    assert len(breaker._strategy._buckets) == 10
+    assert breaker._strategy._calls == 1000
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"window_size": 0},
+        {"failure_rate_threshold": 0},
+        {"failure_rate_threshold": 101},
+    ],
+)
+def test_sliding_window_rejects_invalid_options(options):
+    with pytest.raises(ValueError):
+        CircuitBreaker(
+            strategy=CircuitBreakerStrategy.SLIDING_WINDOW, strategy_options=options
+        )
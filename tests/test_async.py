@@ -0,0 +1,77 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from pycircuitbreaker import (
+    circuit,
+    CircuitBreaker,
+    CircuitBreakerException,
+    CircuitBreakerState,
+)
+
+
+def test_call_async_success(async_success_func):
+    breaker = CircuitBreaker()
+
+    assert asyncio.run(breaker.call_async(async_success_func)) is True
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_call_async_opens_breaker(async_error_func):
+    breaker = CircuitBreaker(error_threshold=1)
+
+    with pytest.raises(IOError):
+        asyncio.run(breaker.call_async(async_error_func))
+
+    assert breaker.state == CircuitBreakerState.OPEN
+
+    with pytest.raises(CircuitBreakerException):
+        asyncio.run(breaker.call_async(async_error_func))
+
+
+def test_call_async_detects_errors_on_awaited_result():
+    detect_error = mock.Mock(return_value=True)
+    breaker = CircuitBreaker(detect_error=detect_error, error_threshold=1)
+
+    async def returns_error():
+        return 500
+
+    assert asyncio.run(breaker.call_async(returns_error)) == 500
+    detect_error.assert_called_once_with(500)
+    assert breaker.state == CircuitBreakerState.OPEN
+
+
+def test_call_async_respects_allowlist(async_error_func):
+    breaker = CircuitBreaker(error_threshold=1, exception_allowlist=[IOError])
+
+    with pytest.raises(IOError):
+        asyncio.run(breaker.call_async(async_error_func))
+
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_decorator_wraps_coroutine_functions(async_error_func):
+    wrapped = circuit(async_error_func, error_threshold=1)
+
+    assert asyncio.iscoroutinefunction(wrapped)
+
+    with pytest.raises(IOError):
+        asyncio.run(wrapped())
+
+    with pytest.raises(CircuitBreakerException):
+        asyncio.run(wrapped())
+
+
+def test_decorator_does_not_count_coroutine_before_it_runs():
+    detect_error = mock.Mock(return_value=False)
+
+    async def func(arg):
+        return arg
+
+    wrapped = circuit(func, detect_error=detect_error)
+    coro = wrapped("foo")
+
+    detect_error.assert_not_called()
+    assert asyncio.run(coro) == "foo"
+    detect_error.assert_called_once_with("foo")
@@ -0,0 +1,124 @@
+import pytest
+
+from pycircuitbreaker import (
+    CircuitBreaker,
+    CircuitBreakerException,
+    CircuitBreakerState,
+    ExponentialBackoff,
+)
+
+
+def test_backoff_grows_exponentially():
+    backoff = ExponentialBackoff(multiplier=2)
+
+    assert [backoff.interval(10, attempt) for attempt in range(4)] == [
+        10,
+        20,
+        40,
+        80,
+    ]
+
+
+def test_backoff_is_capped():
+    backoff = ExponentialBackoff(multiplier=3, max_interval=100)
+
+    assert backoff.interval(10, 5) == 100
+
+
+def test_backoff_does_not_overflow():
+    backoff = ExponentialBackoff(multiplier=2, max_interval=300)
+
+    assert backoff.interval(30, 1024) == 300
+    assert backoff.interval(30, 10**6) == 300
+    assert ExponentialBackoff(max_interval=None).interval(30, 1024) == float("inf")
+
+
+def test_backoff_is_capped_by_default():
+    assert ExponentialBackoff().interval(30, 100) == ExponentialBackoff.MAX_INTERVAL
+
+
+@pytest.mark.parametrize("random_value, expected", [(0.0, 90), (0.5, 100), (1.0, 110)])
+def test_backoff_jitter(random_value, expected):
+    backoff = ExponentialBackoff(
+        max_interval=100, jitter=0.1, random_func=lambda: random_value
+    )
+
+    assert backoff.interval(10, 10) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("options", [{"multiplier": 0.5}, {"jitter": 2}])
+def test_backoff_rejects_invalid_options(options):
+    with pytest.raises(ValueError):
+        ExponentialBackoff(**options)
+
+
+@pytest.fixture()
+def breaker(clock):
+    return CircuitBreaker(
+        clock=clock,
+        error_threshold=1,
+        recovery_backoff=ExponentialBackoff(multiplier=2, max_interval=100),
+        recovery_timeout=30,
+    )
+
+
+def test_breaker_backs_off_after_failed_recovery(breaker, clock, error_func):
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+    assert breaker.recovery_timeout == 30
+
+    for expected_timeout in (60, 100, 100):
+        clock.advance(breaker.recovery_timeout)
+        assert breaker.state == CircuitBreakerState.HALF_OPEN
+
+        with pytest.raises(IOError):
+            breaker.call(error_func)
+
+        assert breaker.recovery_timeout == expected_timeout
+        assert breaker.recovery_time_remaining == expected_timeout
+
+
+def test_breaker_backoff_resets_on_close(breaker, clock, error_func, success_func):
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+    clock.advance(30)
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+    clock.advance(60)
+
+    breaker.call(success_func)
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+    assert breaker.recovery_timeout == 30
+
+
+def test_breaker_recovers_after_many_failed_recoveries(clock, error_func):
+    breaker = CircuitBreaker(
+        clock=clock,
+        error_threshold=1,
+        recovery_backoff=ExponentialBackoff(multiplier=2, max_interval=300),
+        recovery_timeout=30,
+    )
+
+    for _ in range(1100):
+        with pytest.raises(IOError):
+            breaker.call(error_func)
+        assert breaker.state == CircuitBreakerState.OPEN
+        clock.advance(400)
+
+    assert breaker.state == CircuitBreakerState.HALF_OPEN
+
+
+def test_exception_reports_effective_timeout(breaker, clock, error_func):
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+    clock.advance(30)
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+
+    with pytest.raises(CircuitBreakerException) as exc_info:
+        breaker.call(error_func)
+
+    assert "of 60 sec timeout" in str(exc_info.value)
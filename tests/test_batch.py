@@ -0,0 +1,286 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pycircuitbreaker import (
+    Bulkhead,
+    CallOutcome,
+    CallTimeoutException,
+    CircuitBreaker,
+    CircuitBreakerException,
+    CircuitBreakerState,
+    CircuitBreakerStrategy,
+    ResultCache,
+    RetryPolicy,
+    ThrottledException,
+)
+
+
+def lookup(key):
+    if key < 0:
+        raise IOError(key)
+
+    return key * 2
+
+
+async def lookup_async(key):
+    return lookup(key)
+
+
+def test_call_many_returns_outcomes_in_order():
+    breaker = CircuitBreaker()
+
+    outcomes = breaker.call_many(lookup, [(1,), (2,), (3,)])
+
+    assert outcomes == [CallOutcome(2), CallOutcome(4), CallOutcome(6)]
+    assert all(outcome.ok for outcome in outcomes)
+
+
+def test_call_many_reports_failures():
+    breaker = CircuitBreaker(error_threshold=5)
+
+    outcomes = breaker.call_many(lookup, [(1,), (-1,)])
+
+    assert outcomes[0].result == 2
+    assert isinstance(outcomes[1].exception, IOError)
+    assert not outcomes[1].ok
+    assert not outcomes[1].rejected
+    assert breaker.error_count == 1
+
+
+def test_call_many_short_circuits_once_open():
+    calls = []
+
+    def failing(key):
+        calls.append(key)
+        raise IOError(key)
+
+    breaker = CircuitBreaker(error_threshold=2)
+
+    outcomes = breaker.call_many(failing, [(key,) for key in range(10)], chunk_size=3)
+
+    assert breaker.state == CircuitBreakerState.OPEN
+    assert calls == [0, 1, 2]
+    assert [outcome.rejected for outcome in outcomes] == [False] * 3 + [True] * 7
+    assert isinstance(outcomes[-1].exception, CircuitBreakerException)
+
+
+def test_call_many_on_open_breaker(error_func):
+    breaker = CircuitBreaker(error_threshold=1, metrics=True)
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+
+    outcomes = breaker.call_many(lookup, [(1,), (2,)])
+
+    assert all(outcome.rejected for outcome in outcomes)
+    assert breaker.metrics.rejections["open"] == 2
+
+
+def test_call_many_updates_strategy_once_per_chunk():
+    opened = []
+    breaker = CircuitBreaker(
+        error_threshold=1, on_open=lambda breaker, error: opened.append(error)
+    )
+
+    outcomes = breaker.call_many(lookup, [(-1,), (-2,)], chunk_size=2)
+
+    # Both calls were made, but only the first error opened the breaker
+    assert [type(outcome.exception) for outcome in outcomes] == [OSError, OSError]
+    assert opened == [outcomes[0].exception]
+
+
+def test_call_many_probes_one_at_a_time(clock):
+    closed = []
+    breaker = CircuitBreaker(
+        clock=clock,
+        error_threshold=1,
+        recovery_threshold=1,
+        recovery_timeout=10,
+        on_close=closed.append,
+    )
+    breaker.call_many(lookup, [(-1,)])
+    clock.advance(10)
+
+    outcomes = breaker.call_many(lookup, [(1,), (2,), (3,)])
+
+    assert [outcome.result for outcome in outcomes] == [2, 4, 6]
+    assert closed == [breaker]
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_call_many_records_metrics_and_cache():
+    cache = ResultCache()
+    breaker = CircuitBreaker(error_threshold=5, metrics=True, stale_cache=cache)
+
+    breaker.call_many(lookup, [(1,), (-1,)])
+
+    assert breaker.metrics.calls == 2
+    assert breaker.metrics.successes == 1
+    assert breaker.metrics.failures == {"OSError": 1}
+    assert cache.get(lookup, (1,), {}) == 2
+
+
+def test_call_many_with_executor():
+    breaker = CircuitBreaker()
+
+    with ThreadPoolExecutor(2) as executor:
+        outcomes = breaker.call_many(lookup, [(1,), (2,)], executor=executor)
+
+    assert [outcome.result for outcome in outcomes] == [2, 4]
+
+
+def test_call_many_shares_a_pool():
+    breaker = CircuitBreaker()
+
+    def thread_name(key):
+        return threading.current_thread().name
+
+    first = breaker.call_many(thread_name, [(1,)])
+    second = breaker.call_many(thread_name, [(1,)])
+
+    # The threads outlive each batch
+
+    assert first[0].result.startswith("pycircuitbreaker-batch")
+    assert {first[0].result, second[0].result} <= {
+        thread.name for thread in threading.enumerate()
+    }
+
+
+def test_nested_batches_do_not_deadlock():
+    outer = CircuitBreaker()
+    inner = CircuitBreaker()
+    # Every outer item runs on a thread of the shared pool at the same time
+    barrier = threading.Barrier(CircuitBreaker.BATCH_CHUNK_SIZE, timeout=5)
+
+    def fan_out(key):
+        barrier.wait()
+        outcomes = inner.call_many(lookup, [(key,), (key + 1,)])
+        return [outcome.result for outcome in outcomes]
+
+    results = []
+    thread = threading.Thread(
+        target=lambda: results.extend(
+            outer.call_many(
+                fan_out, [(key,) for key in range(CircuitBreaker.BATCH_CHUNK_SIZE)]
+            )
+        ),
+        daemon=True,
+    )
+    thread.start()
+    thread.join(10)
+
+    assert not thread.is_alive()
+    assert [outcome.result for outcome in results] == [
+        [key * 2, key * 2 + 2] for key in range(CircuitBreaker.BATCH_CHUNK_SIZE)
+    ]
+
+
+def test_call_many_counts_a_request_per_item(clock):
+    calls = []
+
+    def failing(key):
+        calls.append(key)
+        raise IOError(key)
+
+    breaker = CircuitBreaker(
+        clock=clock,
+        metrics=True,
+        strategy=CircuitBreakerStrategy.ADAPTIVE,
+        strategy_options={"random_func": lambda: 0.0},
+    )
+
+    outcomes = breaker.call_many(failing, [(key,) for key in range(10)])
+
+    # Once the first call is counted, every further item may be shed
+    assert calls == [0]
+    assert all(
+        isinstance(outcome.exception, ThrottledException) for outcome in outcomes[1:]
+    )
+    assert all(outcome.rejected for outcome in outcomes[1:])
+    assert breaker.metrics.rejections["throttled"] == 9
+
+
+def test_call_many_items_take_a_bulkhead_slot():
+    bulkhead = Bulkhead(max_concurrent_calls=1, max_wait_calls=0)
+    breaker = CircuitBreaker(bulkhead=bulkhead, metrics=True)
+    started = threading.Event()
+    release = threading.Event()
+
+    def blocking(key):
+        started.set()
+        release.wait(5)
+        return key
+
+    with ThreadPoolExecutor(1) as executor:
+        future = executor.submit(breaker.call, blocking, 0)
+        started.wait(5)
+        outcomes = breaker.call_many(lookup, [(1,), (2,)])
+        release.set()
+        future.result()
+
+    assert all(outcome.rejected for outcome in outcomes)
+    assert breaker.metrics.rejections["bulkhead"] == 2
+    assert bulkhead.active_calls == 0
+
+
+def test_call_many_items_time_out():
+    breaker = CircuitBreaker(timeout=0.01)
+
+    outcomes = breaker.call_many(time.sleep, [(0,), (0.2,)])
+
+    assert outcomes[0].ok
+    assert isinstance(outcomes[1].exception, CallTimeoutException)
+    assert not outcomes[1].rejected
+    assert breaker.error_count == 1
+
+
+@pytest.mark.parametrize(
+    "settings",
+    [{"fallback": 0}, {"retry": RetryPolicy()}],
+)
+def test_batches_reject_unsupported_settings(settings):
+    breaker = CircuitBreaker(**settings)
+
+    with pytest.raises(ValueError):
+        breaker.call_many(lookup, [(1,)])
+    with pytest.raises(ValueError):
+        asyncio.run(breaker.gather(lookup_async, [(1,)]))
+
+
+def test_call_many_invalid_chunk_size():
+    with pytest.raises(ValueError):
+        CircuitBreaker().call_many(lookup, [(1,)], chunk_size=0)
+
+
+def test_gather():
+    breaker = CircuitBreaker(error_threshold=5)
+
+    outcomes = asyncio.run(breaker.gather(lookup_async, [(1,), (-1,), (3,)]))
+
+    assert outcomes[0] == CallOutcome(2)
+    assert isinstance(outcomes[1].exception, IOError)
+    assert outcomes[2] == CallOutcome(6)
+
+
+def test_gather_short_circuits_once_open():
+    breaker = CircuitBreaker(error_threshold=1)
+
+    outcomes = asyncio.run(
+        breaker.gather(lookup_async, [(-1,), (2,), (3,)], chunk_size=1)
+    )
+
+    assert not outcomes[0].rejected
+    assert outcomes[1].rejected
+    assert outcomes[2].rejected
+
+
+def test_gather_items_time_out():
+    breaker = CircuitBreaker(timeout=0.01)
+
+    outcomes = asyncio.run(breaker.gather(asyncio.sleep, [(0.2,), (0,)]))
+
+    assert isinstance(outcomes[0].exception, CallTimeoutException)
+    assert outcomes[1].ok
@@ -1,3 +1,7 @@
+import gc
+import threading
+import weakref
+from datetime import datetime, timedelta
 from time import sleep
 from unittest import mock
 
@@ -7,6 +11,7 @@ from pycircuitbreaker import (
     CircuitBreaker,
     CircuitBreakerException,
     CircuitBreakerState,
+    CircuitBreakerStrategy,
 )
 
 
@@ -54,6 +59,23 @@ def test_breaker_recloses_after_recovery_time(error_func):
     assert breaker.state == CircuitBreakerState.HALF_OPEN
 
 
+def test_successes_clear_errors_once_recovery_threshold_reached(
+    error_func, success_func
+):
+    breaker = CircuitBreaker(error_threshold=3, recovery_threshold=3)
+    for _ in range(3):
+        breaker.call(success_func)
+
+    for _ in range(6):
+        with pytest.raises(IOError):
+            breaker.call(error_func)
+        breaker.call(success_func)
+
+    assert breaker.state == CircuitBreakerState.CLOSED
+    assert breaker.error_count == 0
+    assert breaker.success_count == 9
+
+
 def test_error_resets_reclose_state(half_open_breaker, error_func, success_func):
     half_open_breaker.call(success_func)
     assert half_open_breaker.state == CircuitBreakerState.HALF_OPEN
@@ -212,3 +234,163 @@ def test_calling_an_open_breaker_raises_an_error(error_func):
 def test_unknown_strategy_causes_error():
     with pytest.raises(ValueError):
         CircuitBreaker(strategy="foo")
+
+
+def test_errors_from_calls_admitted_before_open_do_not_notify_again(
+    error_func, io_error
+):
+    mock_open = mock.Mock()
+    breaker = CircuitBreaker(error_threshold=1, on_open=mock_open)
+
+    def slow_error_func():
+        # Another call opens the breaker while this one is still in flight
+        with pytest.raises(IOError):
+            breaker.call(error_func)
+        raise io_error
+
+    with pytest.raises(IOError):
+        breaker.call(slow_error_func)
+
+    mock_open.assert_called_once()
+    assert breaker.state == CircuitBreakerState.OPEN
+
+
+def test_thread_safe_breaker_notifies_once_under_contention(io_error):
+    mock_open = mock.Mock()
+    breaker = CircuitBreaker(
+        error_threshold=50, on_open=mock_open, recovery_timeout=60, thread_safe=True
+    )
+    barrier = threading.Barrier(32)
+
+    def raises_error():
+        raise io_error
+
+    def worker():
+        barrier.wait()
+        for _ in range(100):
+            try:
+                breaker.call(raises_error)
+            except (IOError, CircuitBreakerException):
+                pass
+
+    threads = [threading.Thread(target=worker) for _ in range(32)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert breaker.state == CircuitBreakerState.OPEN
+    mock_open.assert_called_once()
+
+
+def test_success_from_call_admitted_before_open_does_not_close(error_func):
+    breaker = CircuitBreaker(error_threshold=1, recovery_timeout=60)
+
+    def slow_success_func():
+        # Another call opens the breaker while this one is still in flight
+        with pytest.raises(IOError):
+            breaker.call(error_func)
+        return True
+
+    assert breaker.call(slow_success_func) is True
+    assert breaker.state == CircuitBreakerState.OPEN
+
+
+def test_breaker_uses_injected_clock(clock, error_func, success_func):
+    breaker = CircuitBreaker(clock=clock, error_threshold=1, recovery_timeout=30)
+
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+
+    clock.advance(29.9)
+    assert breaker.state == CircuitBreakerState.OPEN
+    assert breaker.recovery_time_remaining == pytest.approx(0.1)
+
+    clock.advance(0.1)
+    assert breaker.state == CircuitBreakerState.HALF_OPEN
+
+    breaker.call(success_func)
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_open_and_recovery_times_are_derived_from_clock(clock, error_func):
+    breaker = CircuitBreaker(clock=clock, error_threshold=1, recovery_timeout=30)
+
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+
+    clock.advance(10)
+    before = datetime.utcnow()
+    open_time = breaker.open_time
+    recovery_start_time = breaker.recovery_start_time
+    after = datetime.utcnow()
+
+    assert before - timedelta(seconds=10) <= open_time <= after - timedelta(seconds=10)
+    elapsed = (recovery_start_time - open_time).total_seconds()
+    assert elapsed == pytest.approx(30, abs=0.1)
+
+
+@pytest.mark.parametrize("allowlist", [None, [ValueError]])
+def test_call_does_not_keep_exceptions_alive(allowlist):
+    breaker = CircuitBreaker(error_threshold=1000, exception_allowlist=allowlist)
+    references = []
+
+    class TrackedError(IOError):
+        # Built-in exception types do not support weak references
+        pass
+
+    def raises_error():
+        raise TrackedError()
+
+    for _ in range(3):
+        try:
+            breaker.call(raises_error)
+        except IOError as ex:
+            references.append(weakref.ref(ex))
+
+    gc.collect()
+    assert all(reference() is None for reference in references)
+
+
+def test_breakers_with_equal_settings_share_config():
+    on_open = mock.Mock()
+    first = CircuitBreaker(exception_denylist=[IOError], on_open=on_open)
+    second = CircuitBreaker(exception_denylist=(IOError,), on_open=on_open)
+    other = CircuitBreaker(exception_denylist=[IOError], error_threshold=1)
+
+    assert first._config is second._config
+    assert first._config is not other._config
+    assert first._strategy is not second._strategy
+
+
+@pytest.mark.parametrize("first, second", [(0, False), (1, True), (1, 1.0)])
+def test_equal_settings_of_different_types_are_not_shared(first, second):
+    first_breaker = CircuitBreaker(fallback=first)
+    second_breaker = CircuitBreaker(fallback=second)
+
+    assert first_breaker._config is not second_breaker._config
+    assert type(second_breaker._config.fallback) is type(second)
+
+
+def test_unhashable_settings_are_not_shared(success_func):
+    class DetectError:
+        __hash__ = None
+
+        def __call__(self, result):
+            return result is None
+
+    detect_error = DetectError()
+    first = CircuitBreaker(detect_error=detect_error)
+    second = CircuitBreaker(detect_error=detect_error)
+
+    assert first._config is not second._config
+    assert first.call(success_func) is True
+
+
+@pytest.mark.parametrize("strategy", list(CircuitBreakerStrategy))
+def test_breaker_has_no_instance_dict(strategy):
+    breaker = CircuitBreaker(strategy=strategy)
+
+    assert not hasattr(breaker, "__dict__")
+    assert not hasattr(breaker._strategy, "__dict__")
+    assert weakref.ref(breaker)() is breaker
@@ -0,0 +1,203 @@
+import asyncio
+import threading
+
+import pytest
+
+from pycircuitbreaker import (
+    circuit,
+    Bulkhead,
+    BulkheadFullException,
+    CircuitBreaker,
+    CircuitBreakerException,
+    CircuitBreakerState,
+)
+
+
+def blocking_call(started, release):
+    def call():
+        started.set()
+        release.wait()
+        return True
+
+    return call
+
+
+def run_in_thread(breaker, func):
+    results = []
+
+    def target():
+        try:
+            results.append(breaker.call(func))
+        except Exception as ex:
+            results.append(ex)
+
+    thread = threading.Thread(target=target)
+    thread.start()
+    return thread, results
+
+
+def test_bulkhead_rejects_calls_above_limit(success_func):
+    bulkhead = Bulkhead(max_concurrent_calls=1)
+    breaker = CircuitBreaker(bulkhead=bulkhead, error_threshold=1)
+    started, release = threading.Event(), threading.Event()
+
+    thread, results = run_in_thread(breaker, blocking_call(started, release))
+    started.wait()
+
+    with pytest.raises(BulkheadFullException) as exc_info:
+        breaker.call(success_func)
+
+    release.set()
+    thread.join()
+
+    assert isinstance(exc_info.value, CircuitBreakerException)
+    assert "bulkhead full (1 concurrent calls)" in str(exc_info.value)
+    assert results == [True]
+    assert bulkhead.rejected_count == 1
+    assert bulkhead.active_calls == 0
+
+
+def test_rejections_are_not_errors(success_func):
+    bulkhead = Bulkhead(max_concurrent_calls=1)
+    breaker = CircuitBreaker(bulkhead=bulkhead, error_threshold=1)
+    started, release = threading.Event(), threading.Event()
+
+    thread, _ = run_in_thread(breaker, blocking_call(started, release))
+    started.wait()
+
+    for _ in range(3):
+        with pytest.raises(BulkheadFullException):
+            breaker.call(success_func)
+
+    release.set()
+    thread.join()
+
+    assert breaker.state == CircuitBreakerState.CLOSED
+    assert breaker.error_count == 0
+    assert breaker.call(success_func)
+
+
+def test_slot_released_after_error(error_func, success_func):
+    bulkhead = Bulkhead(max_concurrent_calls=1)
+    breaker = CircuitBreaker(bulkhead=bulkhead)
+
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+
+    assert bulkhead.active_calls == 0
+    assert breaker.call(success_func)
+
+
+def test_waiting_call_gets_released_slot():
+    bulkhead = Bulkhead(max_concurrent_calls=1, max_wait_calls=1)
+    breaker = CircuitBreaker(bulkhead=bulkhead)
+    started, release = threading.Event(), threading.Event()
+
+    first, first_results = run_in_thread(breaker, blocking_call(started, release))
+    started.wait()
+
+    second, second_results = run_in_thread(breaker, lambda: "waited")
+    while bulkhead.waiting_calls == 0:
+        pass
+
+    release.set()
+    first.join()
+    second.join()
+
+    assert first_results == [True]
+    assert second_results == ["waited"]
+    assert bulkhead.rejected_count == 0
+    assert bulkhead.active_calls == 0
+
+
+def test_wait_times_out(success_func):
+    bulkhead = Bulkhead(max_concurrent_calls=1, max_wait_calls=1, max_wait_time=0.01)
+    breaker = CircuitBreaker(bulkhead=bulkhead)
+    started, release = threading.Event(), threading.Event()
+
+    thread, _ = run_in_thread(breaker, blocking_call(started, release))
+    started.wait()
+
+    with pytest.raises(BulkheadFullException):
+        breaker.call(success_func)
+
+    release.set()
+    thread.join()
+
+    assert bulkhead.rejected_count == 1
+    assert bulkhead.waiting_calls == 0
+
+
+def test_rejected_probe_released(clock, error_func, success_func):
+    bulkhead = Bulkhead(max_concurrent_calls=1)
+    breaker = CircuitBreaker(
+        bulkhead=bulkhead, clock=clock, error_threshold=1, half_open_max_calls=1
+    )
+
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+    clock.advance(30)
+
+    assert bulkhead.acquire()
+    with pytest.raises(BulkheadFullException):
+        breaker.call(success_func)
+    bulkhead.release()
+
+    assert breaker._probes_in_flight == 0
+    assert breaker.call(success_func)
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{"max_concurrent_calls": 0}, {"max_concurrent_calls": 1, "max_wait_calls": -1}],
+)
+def test_bulkhead_rejects_invalid_options(options):
+    with pytest.raises(ValueError):
+        Bulkhead(**options)
+
+
+def test_async_bulkhead():
+    bulkhead = Bulkhead(max_concurrent_calls=1, max_wait_calls=1)
+    breaker = CircuitBreaker(bulkhead=bulkhead)
+    wrapped = circuit(asyncio.sleep, bulkhead=bulkhead)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def hold():
+            await release.wait()
+            return "held"
+
+        holder = asyncio.ensure_future(breaker.call_async(hold))
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(breaker.call_async(asyncio.sleep, 0, "waited"))
+        await asyncio.sleep(0)
+
+        with pytest.raises(BulkheadFullException):
+            await wrapped(0)
+
+        release.set()
+        return await holder, await waiter
+
+    assert asyncio.run(main()) == ("held", "waited")
+    assert bulkhead.rejected_count == 1
+    assert bulkhead.active_calls == 0
+
+
+def test_async_wait_times_out():
+    bulkhead = Bulkhead(max_concurrent_calls=1, max_wait_calls=1, max_wait_time=0.01)
+    breaker = CircuitBreaker(bulkhead=bulkhead)
+
+    async def main():
+        holder = asyncio.ensure_future(breaker.call_async(asyncio.sleep, 0.1))
+        await asyncio.sleep(0)
+
+        with pytest.raises(BulkheadFullException):
+            await breaker.call_async(asyncio.sleep, 0)
+
+        await holder
+
+    asyncio.run(main())
+    assert bulkhead.waiting_calls == 0
+    assert bulkhead.active_calls == 0
@@ -0,0 +1,68 @@
+import pytest
+
+from pycircuitbreaker.classifier import ExceptionClassifier
+
+
+class CustomError(IOError):
+    pass
+
+
+def test_everything_is_an_error_without_lists():
+    classifier = ExceptionClassifier()
+
+    assert classifier.is_error(ValueError())
+    assert classifier.is_error(CustomError())
+
+
+@pytest.mark.parametrize(
+    "exception, expected",
+    [
+        (IOError(), False),
+        (CustomError(), False),
+        (ValueError(), True),
+    ],
+)
+def test_allowlist_supports_inheritance(exception, expected):
+    classifier = ExceptionClassifier(exception_allowlist=[IOError])
+    assert classifier.is_error(exception) is expected
+
+
+@pytest.mark.parametrize(
+    "exception, expected",
+    [
+        (IOError(), True),
+        (CustomError(), True),
+        (ValueError(), False),
+    ],
+)
+def test_denylist_supports_inheritance(exception, expected):
+    classifier = ExceptionClassifier(exception_denylist=[IOError])
+    assert classifier.is_error(exception) is expected
+
+
+def test_allowlist_takes_precedence_over_denylist():
+    classifier = ExceptionClassifier(
+        exception_allowlist=[CustomError], exception_denylist=[IOError]
+    )
+
+    assert classifier.is_error(IOError())
+    assert not classifier.is_error(CustomError())
+
+
+def test_decisions_are_cached_by_type():
+    classifier = ExceptionClassifier(exception_allowlist=[IOError])
+
+    classifier.is_error(CustomError())
+    classifier.is_error(CustomError())
+
+    assert classifier._cache == {CustomError: False}
+
+
+def test_cache_is_bounded():
+    classifier = ExceptionClassifier(cache_size=2)
+    types = [type(f"Error{index}", (Exception,), {}) for index in range(3)]
+
+    for exc_type in types:
+        assert classifier.is_error(exc_type())
+
+    assert list(classifier._cache) == types[1:]
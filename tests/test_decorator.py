@@ -1,6 +1,9 @@
 import pytest
 
-from pycircuitbreaker import circuit, CircuitBreakerException
+import asyncio
+from unittest import mock
+
+from pycircuitbreaker import circuit, CircuitBreaker, CircuitBreakerException
 
 
 def test_decorator_raises_error_if_no_callable_passed():
@@ -29,3 +32,63 @@ def test_decorator_passes_args_to_wrapped_function():
 
     wrapped = circuit(func)
     assert wrapped("foo") == "foo"
+
+
+def test_decorator_fast_path_skips_breaker_while_closed(success_func):
+    wrapped = circuit(success_func)
+    # Successes are counted until recovery_threshold is reached
+    assert wrapped() is True
+
+    with mock.patch.object(CircuitBreaker, "call") as call:
+        assert wrapped() is True
+
+    call.assert_not_called()
+
+
+def test_decorator_fast_path_records_errors(clock):
+    calls = []
+
+    def func(fail):
+        calls.append(fail)
+        if fail:
+            raise IOError()
+        return True
+
+    wrapped = circuit(func, clock=clock, error_threshold=2)
+
+    with pytest.raises(IOError):
+        wrapped(True)
+
+    # The error must be reset by the next success
+    assert wrapped(False) is True
+    with pytest.raises(IOError):
+        wrapped(True)
+
+    with pytest.raises(IOError):
+        wrapped(True)
+    with pytest.raises(CircuitBreakerException):
+        wrapped(False)
+
+    clock.advance(30)
+    assert wrapped(False) is True
+    assert wrapped(False) is True
+    assert calls == [True, False, True, True, False, False]
+
+
+def test_decorator_without_fast_path(success_func):
+    detect_error = mock.Mock(return_value=False)
+    wrapped = circuit(success_func, detect_error=detect_error)
+
+    assert wrapped() is True
+    detect_error.assert_called_once_with(True)
+
+
+def test_decorator_fast_path_coroutine(async_error_func):
+    wrapped = circuit(async_error_func, error_threshold=2)
+
+    for _ in range(2):
+        with pytest.raises(IOError):
+            asyncio.run(wrapped())
+
+    with pytest.raises(CircuitBreakerException):
+        asyncio.run(wrapped())
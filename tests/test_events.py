@@ -0,0 +1,222 @@
+import asyncio
+import threading
+from unittest import mock
+
+import pytest
+
+from pycircuitbreaker import (
+    AsyncioEventBus,
+    circuit,
+    CircuitBreaker,
+    CircuitBreakerEvent,
+    CircuitBreakerEventType,
+    CircuitBreakerException,
+    CircuitBreakerState,
+    EventBus,
+    ThreadedEventBus,
+)
+
+
+def event_types(events):
+    return [event.type for event in events]
+
+
+@pytest.fixture()
+def events():
+    return []
+
+
+@pytest.fixture()
+def bus(events):
+    bus = EventBus()
+    bus.subscribe(events.append)
+    return bus
+
+
+def test_call_events(bus, events, error_func, success_func):
+    breaker = CircuitBreaker(
+        error_threshold=2, event_bus=bus, exception_allowlist=[KeyError]
+    )
+
+    def raise_key_error():
+        raise KeyError()
+
+    breaker.call(success_func)
+    with pytest.raises(KeyError):
+        breaker.call(raise_key_error)
+    for _ in range(2):
+        with pytest.raises(IOError):
+            breaker.call(error_func)
+    with pytest.raises(CircuitBreakerException):
+        breaker.call(success_func)
+
+    assert event_types(events) == [
+        CircuitBreakerEventType.SUCCESS,
+        CircuitBreakerEventType.IGNORED_ERROR,
+        CircuitBreakerEventType.ERROR,
+        CircuitBreakerEventType.ERROR,
+        CircuitBreakerEventType.STATE_TRANSITION,
+        CircuitBreakerEventType.REJECTED,
+    ]
+    assert all(event.breaker is breaker for event in events)
+    assert isinstance(events[1].error, KeyError)
+    assert events[4].state == CircuitBreakerState.OPEN
+    assert events[4].error is events[3].error
+    assert isinstance(events[5].error, CircuitBreakerException)
+
+
+def test_close_transition_event(bus, events, clock, error_func, success_func):
+    breaker = CircuitBreaker(clock=clock, error_threshold=1, event_bus=bus)
+
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+    clock.advance(30)
+    breaker.call(success_func)
+
+    assert events[-1] == CircuitBreakerEvent(
+        CircuitBreakerEventType.STATE_TRANSITION,
+        breaker,
+        state=CircuitBreakerState.CLOSED,
+    )
+
+
+def test_slow_call_event(bus, events, clock):
+    breaker = CircuitBreaker(event_bus=bus, slow_call_threshold=1)
+
+    def slow_call():
+        clock.advance(2)
+        return True
+
+    with mock.patch("pycircuitbreaker.pycircuitbreaker.perf_counter", clock):
+        breaker.call(slow_call)
+
+    assert events[0].type == CircuitBreakerEventType.SLOW_CALL
+    assert events[0].elapsed == 2
+
+
+def test_subscribe_to_event_types(error_func, success_func):
+    bus = EventBus()
+    errors, everything = [], []
+    bus.subscribe(errors.append, [CircuitBreakerEventType.ERROR])
+    bus.subscribe(everything.append)
+    breaker = CircuitBreaker(event_bus=bus)
+
+    breaker.call(success_func)
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+
+    assert event_types(errors) == [CircuitBreakerEventType.ERROR]
+    assert len(everything) == 2
+
+
+def test_unsubscribe(bus, events, success_func):
+    breaker = CircuitBreaker(event_bus=bus)
+    bus.unsubscribe(events.append)
+
+    breaker.call(success_func)
+
+    assert events == []
+
+
+def test_threaded_bus_delivers_off_call_path(success_func):
+    bus = ThreadedEventBus()
+    delivered = []
+    bus.subscribe(lambda event: delivered.append(threading.current_thread()))
+    breaker = CircuitBreaker(event_bus=bus)
+
+    breaker.call(success_func)
+    bus.close()
+
+    assert len(delivered) == 1
+    assert delivered[0] is not threading.current_thread()
+
+
+def test_threaded_bus_drops_events_when_full(success_func):
+    bus = ThreadedEventBus(max_queue_size=1)
+    release = threading.Event()
+    delivered = []
+
+    def listener(event):
+        release.wait()
+        delivered.append(event)
+
+    bus.subscribe(listener)
+    breaker = CircuitBreaker(event_bus=bus)
+
+    breaker.call(success_func)
+    # Wait for the first event to be taken off the queue by the listener
+    while bus._queue.qsize():
+        pass
+    for _ in range(3):
+        breaker.call(success_func)
+    release.set()
+    bus.close()
+
+    assert len(delivered) == 2
+    assert bus.dropped_count == 2
+
+
+def test_threaded_bus_logs_listener_errors(success_func, caplog):
+    bus = ThreadedEventBus()
+    delivered = []
+    bus.subscribe(mock.Mock(side_effect=ValueError()))
+    bus.subscribe(delivered.append)
+    breaker = CircuitBreaker(event_bus=bus)
+
+    breaker.call(success_func)
+    bus.close()
+
+    assert len(delivered) == 1
+    assert "Breaker event listener failed" in caplog.text
+
+
+def test_asyncio_bus(async_success_func):
+    delivered = []
+
+    async def listener(event):
+        delivered.append(event.type)
+
+    async def main():
+        bus = AsyncioEventBus(max_pending=1)
+        bus.subscribe(listener)
+        wrapped = circuit(async_success_func, event_bus=bus)
+
+        await wrapped()
+        await wrapped()
+        assert delivered == []
+
+        await asyncio.sleep(0.01)
+        return bus
+
+    bus = asyncio.run(main())
+
+    assert delivered == [CircuitBreakerEventType.SUCCESS]
+    assert bus.dropped_count == 1
+
+
+def test_asyncio_bus_drops_events_without_a_loop(success_func):
+    bus = AsyncioEventBus()
+    breaker = CircuitBreaker(event_bus=bus)
+
+    assert breaker.call(success_func)
+    assert bus.dropped_count == 1
+
+
+def test_asyncio_bus_follows_the_running_loop(async_success_func, success_func):
+    delivered = []
+    bus = AsyncioEventBus()
+    bus.subscribe(lambda event: delivered.append(event.type))
+    wrapped = circuit(async_success_func, event_bus=bus)
+
+    async def main():
+        await wrapped()
+        await asyncio.sleep(0.01)
+
+    asyncio.run(main())
+    # The first loop is closed now
+    assert CircuitBreaker(event_bus=bus).call(success_func)
+    asyncio.run(main())
+
+    assert delivered == [CircuitBreakerEventType.SUCCESS] * 2
+    assert bus.dropped_count == 1
+    assert bus._pending == 0
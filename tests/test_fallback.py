@@ -0,0 +1,164 @@
+import asyncio
+
+import pytest
+
+from pycircuitbreaker import (
+    circuit,
+    CircuitBreaker,
+    CircuitBreakerException,
+    ResultCache,
+)
+
+
+def lookup(key, fail=False):
+    if fail:
+        raise IOError(key)
+
+    return f"value-{key}"
+
+
+@pytest.fixture()
+def open_breaker_factory(error_func):
+    def factory(**kwargs):
+        breaker = CircuitBreaker(error_threshold=1, **kwargs)
+        with pytest.raises(IOError):
+            breaker.call(error_func)
+        return breaker
+
+    return factory
+
+
+def test_static_fallback(open_breaker_factory, success_func):
+    breaker = open_breaker_factory(fallback="default")
+
+    assert breaker.call(success_func) == "default"
+
+
+def test_callable_fallback_receives_arguments(open_breaker_factory):
+    breaker = open_breaker_factory(fallback=lambda key, **kwargs: f"fallback-{key}")
+
+    assert breaker.call(lookup, "a") == "fallback-a"
+
+
+def test_fallback_not_used_for_errors(error_func):
+    breaker = CircuitBreaker(error_threshold=2, fallback="default")
+
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+
+
+def test_no_fallback_raises(open_breaker_factory, success_func):
+    breaker = open_breaker_factory()
+
+    with pytest.raises(CircuitBreakerException):
+        breaker.call(success_func)
+
+
+def test_stale_result_served_while_open(clock):
+    breaker = CircuitBreaker(
+        clock=clock, error_threshold=1, stale_cache=ResultCache(clock=clock)
+    )
+
+    assert breaker.call(lookup, "a") == "value-a"
+    with pytest.raises(IOError):
+        breaker.call(lookup, "b", fail=True)
+
+    assert breaker.call(lookup, "a") == "value-a"
+    with pytest.raises(CircuitBreakerException):
+        breaker.call(lookup, "b")
+
+
+def test_stale_result_falls_back_on_miss(clock):
+    breaker = CircuitBreaker(
+        clock=clock,
+        error_threshold=1,
+        fallback="default",
+        stale_cache=ResultCache(clock=clock),
+    )
+
+    with pytest.raises(IOError):
+        breaker.call(lookup, "a", fail=True)
+
+    assert breaker.call(lookup, "a") == "default"
+
+
+def test_detected_errors_not_cached():
+    cache = ResultCache()
+    breaker = CircuitBreaker(
+        detect_error=lambda result: result == "value-a", stale_cache=cache
+    )
+
+    breaker.call(lookup, "a")
+    breaker.call(lookup, "b")
+
+    assert len(cache) == 1
+
+
+def test_cache_expires_results(clock):
+    cache = ResultCache(ttl=10, clock=clock)
+    cache.put(lookup, ("a",), {}, "value-a")
+
+    clock.advance(5)
+    assert cache.get(lookup, ("a",), {}) == "value-a"
+
+    clock.advance(5)
+    with pytest.raises(KeyError):
+        cache.get(lookup, ("a",), {})
+    assert len(cache) == 0
+
+
+def test_cache_evicts_least_recently_used():
+    cache = ResultCache(max_size=2)
+    cache.put(lookup, ("a",), {}, 1)
+    cache.put(lookup, ("b",), {}, 2)
+    cache.get(lookup, ("a",), {})
+    cache.put(lookup, ("c",), {}, 3)
+
+    assert cache.get(lookup, ("a",), {}) == 1
+    assert cache.get(lookup, ("c",), {}) == 3
+    with pytest.raises(KeyError):
+        cache.get(lookup, ("b",), {})
+
+
+def test_cache_keys():
+    cache = ResultCache(key_func=lambda items: len(items))
+
+    cache.put(lookup, ([1, 2],), {}, "two")
+    assert cache.get(lookup, ([3, 4],), {}) == "two"
+    with pytest.raises(KeyError):
+        cache.get(len, ([3, 4],), {})
+
+
+def test_unhashable_arguments_not_cached():
+    cache = ResultCache()
+
+    cache.put(lookup, ([1],), {}, "value")
+    assert len(cache) == 0
+
+    with pytest.raises(KeyError):
+        cache.get(lookup, ([1],), {})
+
+
+def test_async_fallback(async_error_func):
+    async def fallback():
+        return "default"
+
+    wrapped = circuit(async_error_func, error_threshold=1, fallback=fallback)
+
+    with pytest.raises(IOError):
+        asyncio.run(wrapped())
+
+    assert asyncio.run(wrapped()) == "default"
+
+
+def test_async_stale_result():
+    async def fetch(key, fail=False):
+        return lookup(key, fail)
+
+    wrapped = circuit(fetch, error_threshold=1, stale_cache=ResultCache())
+
+    assert asyncio.run(wrapped("a")) == "value-a"
+    with pytest.raises(IOError):
+        asyncio.run(wrapped("a", fail=True))
+
+    assert asyncio.run(wrapped("a")) == "value-a"
@@ -0,0 +1,138 @@
+import asyncio
+
+from pycircuitbreaker import (
+    circuit,
+    CircuitBreakerException,
+    CircuitBreakerGroup,
+    CircuitBreakerRegistry,
+    CircuitBreakerState,
+)
+
+import pytest
+
+
+def by_host(host, *args, **kwargs):
+    return host
+
+
+def request(host, fail=False):
+    if fail:
+        raise IOError(host)
+
+    return host
+
+
+def test_breaker_created_per_key():
+    group = CircuitBreakerGroup(breaker_id="http", key_func=by_host, error_threshold=1)
+
+    with pytest.raises(IOError):
+        group.call(request, "a", fail=True)
+
+    with pytest.raises(CircuitBreakerException):
+        group.call(request, "a")
+
+    assert group.call(request, "b") == "b"
+    assert len(group) == 2
+    assert group.get("a").state == CircuitBreakerState.OPEN
+    assert group.get("b").state == CircuitBreakerState.CLOSED
+    assert group.get("a").id == "http:a"
+
+
+def test_same_breaker_returned_for_key():
+    group = CircuitBreakerGroup()
+
+    assert group.get("a") is group.get("a")
+    assert "a" in group
+    assert "b" not in group
+
+
+def test_call_without_key_func(success_func):
+    group = CircuitBreakerGroup()
+
+    with pytest.raises(ValueError):
+        group.call(success_func)
+
+
+def test_least_recently_used_evicted():
+    group = CircuitBreakerGroup(max_size=2)
+
+    group.get("a")
+    group.get("b")
+    group.get("a")
+    group.get("c")
+
+    assert len(group) == 2
+    assert "a" in group
+    assert "b" not in group
+    assert "c" in group
+
+
+def test_open_breaker_not_evicted():
+    group = CircuitBreakerGroup(key_func=by_host, max_size=1, error_threshold=1)
+
+    with pytest.raises(IOError):
+        group.call(request, "a", fail=True)
+
+    group.get("b")
+    group.get("c")
+
+    assert len(group) == 2
+    assert "a" in group
+    assert "b" not in group
+    assert "c" in group
+
+
+def test_group_grows_when_all_open():
+    group = CircuitBreakerGroup(key_func=by_host, max_size=1, error_threshold=1)
+
+    for host in "abc":
+        with pytest.raises(IOError):
+            group.call(request, host, fail=True)
+
+    assert len(group) == 3
+
+
+def test_idle_breakers_expire(clock):
+    group = CircuitBreakerGroup(clock=clock, idle_ttl=10)
+
+    group.get("a")
+    clock.advance(5)
+    group.get("b")
+    clock.advance(6)
+    group.get("c")
+
+    assert "a" not in group
+    assert "b" in group
+    assert "c" in group
+
+
+def test_registry_integration():
+    registry = CircuitBreakerRegistry()
+    group = CircuitBreakerGroup(breaker_id="http", max_size=1, registry=registry)
+
+    group.get("a")
+    assert [breaker.id for breaker in registry.get_circuits()] == ["http:a"]
+
+    group.get("b")
+    assert [breaker.id for breaker in registry.get_circuits()] == ["http:b"]
+
+
+def test_decorator_key_func():
+    wrapped = circuit(request, key_func=by_host, error_threshold=1)
+
+    with pytest.raises(IOError):
+        wrapped("a", fail=True)
+
+    with pytest.raises(CircuitBreakerException):
+        wrapped("a")
+
+    assert wrapped("b") == "b"
+
+
+def test_decorator_key_func_coroutine():
+    async def func(host):
+        return host
+
+    wrapped = circuit(func, key_func=by_host)
+
+    assert asyncio.run(wrapped("a")) == "a"
@@ -0,0 +1,159 @@
+import asyncio
+from threading import Barrier, Event, Thread
+from time import monotonic, sleep
+
+import pytest
+
+from pycircuitbreaker import (
+    CircuitBreaker,
+    CircuitBreakerException,
+    CircuitBreakerState,
+)
+
+
+@pytest.fixture()
+def breaker(clock, error_func):
+    breaker = CircuitBreaker(
+        clock=clock,
+        error_threshold=1,
+        half_open_max_calls=2,
+        recovery_threshold=2,
+        recovery_timeout=30,
+    )
+
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+
+    clock.advance(30)
+    assert breaker.state == CircuitBreakerState.HALF_OPEN
+    return breaker
+
+
+def test_half_open_rejects_calls_above_limit(breaker, success_func):
+    rejected = []
+
+    def probe():
+        def nested_probe():
+            with pytest.raises(CircuitBreakerException):
+                breaker.call(success_func)
+            rejected.append(True)
+            return True
+
+        return breaker.call(nested_probe)
+
+    assert breaker.call(probe) is True
+    assert rejected == [True]
+
+
+def test_half_open_frees_slots_when_probes_finish(breaker, success_func):
+    breaker.call(success_func)
+    assert breaker._probes_in_flight == 0
+    assert breaker.state == CircuitBreakerState.HALF_OPEN
+
+    breaker.call(success_func)
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_half_open_frees_slots_when_probes_fail(breaker, clock, error_func):
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+
+    assert breaker.state == CircuitBreakerState.OPEN
+    assert breaker._probes_in_flight == 0
+
+
+def test_half_open_limits_concurrent_tasks(breaker):
+    release = None
+
+    async def probe():
+        await release.wait()
+        return True
+
+    async def run():
+        nonlocal release
+        release = asyncio.Event()
+        tasks = [asyncio.ensure_future(breaker.call_async(probe)) for _ in range(10)]
+        await asyncio.sleep(0)
+        release.set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    assert results.count(True) == 2
+    assert all(
+        isinstance(result, CircuitBreakerException)
+        for result in results
+        if result is not True
+    )
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_half_open_limits_concurrent_threads(clock, error_func):
+    breaker = CircuitBreaker(
+        clock=clock,
+        error_threshold=1,
+        half_open_max_calls=2,
+        recovery_threshold=2,
+        recovery_timeout=30,
+        thread_safe=True,
+    )
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+    clock.advance(30)
+
+    threads = 10
+    barrier = Barrier(threads)
+    release = Event()
+    results = []
+
+    def probe():
+        release.wait(5)
+        return True
+
+    def run():
+        barrier.wait()
+        try:
+            results.append(breaker.call(probe))
+        except CircuitBreakerException as ex:
+            results.append(ex)
+
+    workers = [Thread(target=run) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+
+    # The rejected calls return while the admitted probes are held
+    deadline = monotonic() + 5
+    while len(results) < threads - 2 and monotonic() < deadline:
+        sleep(0.01)
+    release.set()
+    for worker in workers:
+        worker.join()
+
+    assert results.count(True) == 2
+    assert all(
+        isinstance(result, CircuitBreakerException)
+        for result in results
+        if result is not True
+    )
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_recovery_only_counts_probes(clock, error_func, success_func):
+    breaker = CircuitBreaker(clock=clock, error_threshold=2, recovery_timeout=30)
+
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+
+    def slow_success_func():
+        # The breaker opens and the recovery period starts while this call,
+        # admitted while closed, is still in flight
+        with pytest.raises(IOError):
+            breaker.call(error_func)
+        clock.advance(30)
+        return True
+
+    breaker.call(slow_success_func)
+    assert breaker.state == CircuitBreakerState.HALF_OPEN
+
+    breaker.call(success_func)
+    assert breaker.state == CircuitBreakerState.CLOSED
@@ -0,0 +1,159 @@
+from unittest import mock
+
+import pytest
+
+from pycircuitbreaker import (
+    Bulkhead,
+    CircuitBreaker,
+    CircuitBreakerException,
+    CircuitBreakerRegistry,
+    CircuitBreakerState,
+)
+from pycircuitbreaker.metrics import LatencyHistogram
+
+
+@pytest.fixture()
+def breaker(clock):
+    with mock.patch("pycircuitbreaker.pycircuitbreaker.perf_counter", clock):
+        yield CircuitBreaker(
+            breaker_id="db",
+            clock=clock,
+            detect_error=lambda result: result == 500,
+            error_threshold=2,
+            exception_allowlist=[KeyError],
+            metrics=True,
+        )
+
+
+def slow(clock, seconds, result=True, error=None):
+    def call():
+        clock.advance(seconds)
+        if error is not None:
+            raise error
+        return result
+
+    return call
+
+
+def test_metrics_disabled_by_default():
+    assert CircuitBreaker().metrics is None
+
+
+def test_call_outcomes_counted(breaker, clock, success_func):
+    breaker.call(success_func)
+    breaker.call(lambda: 500)
+    with pytest.raises(KeyError):
+        breaker.call(slow(clock, 0, error=KeyError()))
+    with pytest.raises(IOError):
+        breaker.call(slow(clock, 0, error=IOError()))
+    with pytest.raises(CircuitBreakerException):
+        breaker.call(success_func)
+
+    metrics = breaker.metrics
+    assert metrics.calls == 4
+    assert metrics.successes == 1
+    assert metrics.failures == {"int": 1, "OSError": 1}
+    assert metrics.rejections == {
+        "bulkhead": 0,
+        "executor": 0,
+        "open": 1,
+        "throttled": 0,
+    }
+    assert metrics.transitions == {
+        CircuitBreakerState.CLOSED: 0,
+        CircuitBreakerState.OPEN: 1,
+    }
+
+
+def test_transitions_counted(breaker, clock, error_func, success_func):
+    for _ in range(2):
+        with pytest.raises(IOError):
+            breaker.call(error_func)
+    clock.advance(30)
+    breaker.call(success_func)
+
+    assert breaker.metrics.transitions == {
+        CircuitBreakerState.CLOSED: 1,
+        CircuitBreakerState.OPEN: 1,
+    }
+
+
+def test_bulkhead_rejections_counted(success_func):
+    bulkhead = Bulkhead(max_concurrent_calls=1)
+    breaker = CircuitBreaker(bulkhead=bulkhead, metrics=True)
+
+    assert bulkhead.acquire()
+    with pytest.raises(CircuitBreakerException):
+        breaker.call(success_func)
+    bulkhead.release()
+
+    assert breaker.metrics.rejections == {
+        "bulkhead": 1,
+        "executor": 0,
+        "open": 0,
+        "throttled": 0,
+    }
+    assert breaker.metrics.calls == 0
+
+
+def test_latency_recorded(breaker, clock):
+    breaker.call(slow(clock, 0.0005))
+    breaker.call(slow(clock, 0.003))
+    breaker.call(slow(clock, 100))
+
+    latency = breaker.metrics.latency
+    assert latency.count == 3
+    assert latency.sum == pytest.approx(100.0035)
+    buckets = dict(latency.buckets)
+    assert buckets[0.001] == 1
+    assert buckets[0.002] == 1
+    assert buckets[0.004] == 2
+    assert buckets[32.768] == 2
+    assert buckets[float("inf")] == 3
+
+
+def test_histogram_bounds_are_inclusive():
+    histogram = LatencyHistogram()
+    histogram.observe(0.001)
+
+    assert histogram.buckets[0] == (0.001, 1)
+
+
+def test_registry_metrics_snapshot(breaker, clock, success_func):
+    registry = CircuitBreakerRegistry(clock=clock)
+    registry.register(breaker)
+    registry.register(CircuitBreaker(breaker_id="cache"))
+    breaker.call(success_func)
+
+    snapshot = registry.get_metrics()
+
+    assert snapshot["cache"] == {"state": "CLOSED", "metrics": None, "executor": None}
+    assert snapshot["db"]["state"] == "CLOSED"
+    assert snapshot["db"]["metrics"]["calls"] == 1
+    assert snapshot["db"]["metrics"]["transitions"] == {"CLOSED": 0, "OPEN": 0}
+
+
+def test_registry_renders_prometheus(breaker, clock, error_func):
+    registry = CircuitBreakerRegistry(clock=clock)
+    registry.register(breaker)
+    registry.register(CircuitBreaker(breaker_id='say "hi"'))
+    for _ in range(2):
+        with pytest.raises(IOError):
+            breaker.call(error_func)
+
+    lines = registry.render_prometheus().splitlines()
+
+    assert "# TYPE pycircuitbreaker_calls_total counter" in lines
+    assert 'pycircuitbreaker_state{breaker="db",state="OPEN"} 1' in lines
+    assert 'pycircuitbreaker_state{breaker="db",state="CLOSED"} 0' in lines
+    assert 'pycircuitbreaker_state{breaker="say \\"hi\\"",state="CLOSED"} 1' in lines
+    assert 'pycircuitbreaker_calls_total{breaker="db"} 2' in lines
+    assert (
+        'pycircuitbreaker_failures_total{breaker="db",exception="OSError"} 2' in lines
+    )
+    assert 'pycircuitbreaker_transitions_total{breaker="db",state="OPEN"} 1' in lines
+    assert (
+        'pycircuitbreaker_call_duration_seconds_bucket{breaker="db",le="+Inf"} 2'
+        in lines
+    )
+    assert 'pycircuitbreaker_call_duration_seconds_count{breaker="db"} 2' in lines
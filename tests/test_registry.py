@@ -1,7 +1,11 @@
+import gc
+from unittest import mock
+
 from pycircuitbreaker import (
     CircuitBreaker,
     CircuitBreakerRegistry,
     CircuitBreakerRegistryException,
+    CircuitBreakerState,
 )
 
 import pytest
@@ -87,3 +91,103 @@ def test_get_open_circuits_when_one_circuit_is_open(error_func):
     assert len(opened) == 1
     assert open_circuit in opened
     assert closed_circuit not in opened
+
+
+def test_count_by_state(error_func):
+    registry = CircuitBreakerRegistry()
+    open_circuit = CircuitBreaker(breaker_id="open_breaker", error_threshold=1)
+    closed_circuit = CircuitBreaker(breaker_id="closed_breaker")
+    registry.register(open_circuit)
+    registry.register(closed_circuit)
+
+    with pytest.raises(IOError):
+        open_circuit.call(error_func)
+
+    assert registry.count_by_state() == {
+        CircuitBreakerState.CLOSED: 1,
+        CircuitBreakerState.HALF_OPEN: 0,
+        CircuitBreakerState.OPEN: 1,
+    }
+
+
+def test_open_circuits_move_to_half_open_after_recovery_timeout(
+    clock, error_func, success_func
+):
+    registry = CircuitBreakerRegistry(clock=clock)
+    circuit = CircuitBreaker(clock=clock, error_threshold=1, recovery_timeout=30)
+    registry.register(circuit)
+
+    with pytest.raises(IOError):
+        circuit.call(error_func)
+
+    clock.advance(29)
+    assert registry.get_open_circuits() == [circuit]
+
+    clock.advance(1)
+    assert registry.get_open_circuits() == []
+    assert registry.get_half_open_circuits() == [circuit]
+
+    circuit.call(success_func)
+    assert registry.get_half_open_circuits() == []
+    assert registry.count_by_state()[CircuitBreakerState.CLOSED] == 1
+
+
+def test_reopened_circuit_uses_new_deadline(clock, error_func):
+    registry = CircuitBreakerRegistry(clock=clock)
+    circuit = CircuitBreaker(clock=clock, error_threshold=1, recovery_timeout=30)
+    registry.register(circuit)
+
+    with pytest.raises(IOError):
+        circuit.call(error_func)
+    clock.advance(30)
+    with pytest.raises(IOError):
+        circuit.call(error_func)
+
+    assert registry.get_open_circuits() == [circuit]
+
+    clock.advance(30)
+    assert registry.get_half_open_circuits() == [circuit]
+
+
+def test_open_circuit_queries_do_not_evaluate_breaker_state(error_func):
+    registry = CircuitBreakerRegistry()
+    circuits = [CircuitBreaker(error_threshold=1) for _ in range(100)]
+    for circuit in circuits:
+        registry.register(circuit)
+
+    with pytest.raises(IOError):
+        circuits[0].call(error_func)
+
+    with mock.patch.object(
+        CircuitBreaker, "state", new_callable=mock.PropertyMock
+    ) as state:
+        assert registry.get_open_circuits() == [circuits[0]]
+
+    state.assert_not_called()
+
+
+def test_unregister():
+    registry = CircuitBreakerRegistry()
+    circuit = CircuitBreaker()
+    registry.register(circuit)
+
+    registry.unregister(circuit)
+
+    assert registry.get_circuits() == []
+    assert registry.count_by_state()[CircuitBreakerState.CLOSED] == 0
+
+    with pytest.raises(CircuitBreakerRegistryException):
+        registry.unregister(circuit)
+
+
+def test_weak_registry_does_not_keep_breakers_alive():
+    registry = CircuitBreakerRegistry(weak=True)
+    circuit = CircuitBreaker()
+    registry.register(circuit)
+    assert registry.get_circuits() == [circuit]
+
+    del circuit
+    gc.collect()
+
+    assert registry.get_circuits() == []
+    assert registry.count_by_state()[CircuitBreakerState.CLOSED] == 0
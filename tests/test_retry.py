@@ -0,0 +1,212 @@
+import asyncio
+
+import pytest
+
+from pycircuitbreaker import (
+    circuit,
+    CircuitBreaker,
+    CircuitBreakerException,
+    CircuitBreakerState,
+    ExponentialBackoff,
+    RetryBudget,
+    RetryPolicy,
+)
+
+
+class Flaky:
+    def __init__(self, failures, exception=IOError):
+        self.calls = 0
+        self.failures = failures
+        self.exception = exception
+
+    def __call__(self):
+        self.calls += 1
+        if self.calls <= self.failures:
+            raise self.exception("flaky")
+
+        return "ok"
+
+
+@pytest.fixture()
+def sleeps():
+    return []
+
+
+@pytest.fixture()
+def policy_factory(sleeps):
+    def factory(**kwargs):
+        kwargs.setdefault("sleep", sleeps.append)
+        return RetryPolicy(**kwargs)
+
+    return factory
+
+
+def test_retries_until_success(policy_factory, sleeps):
+    func = Flaky(2)
+    breaker = CircuitBreaker(error_threshold=5, retry=policy_factory(max_attempts=3))
+
+    assert breaker.call(func) == "ok"
+    assert func.calls == 3
+    assert sleeps == [0.1, 0.1]
+
+
+def test_gives_up_after_max_attempts(policy_factory):
+    func = Flaky(5)
+    breaker = CircuitBreaker(error_threshold=10, retry=policy_factory(max_attempts=3))
+
+    with pytest.raises(IOError):
+        breaker.call(func)
+
+    assert func.calls == 3
+
+
+def test_every_attempt_is_counted(policy_factory):
+    func = Flaky(5)
+    breaker = CircuitBreaker(error_threshold=5, retry=policy_factory(max_attempts=3))
+
+    with pytest.raises(IOError):
+        breaker.call(func)
+
+    assert breaker.error_count == 3
+
+
+def test_stops_when_breaker_opens(policy_factory):
+    func = Flaky(5)
+    breaker = CircuitBreaker(error_threshold=2, retry=policy_factory(max_attempts=5))
+
+    with pytest.raises(IOError):
+        breaker.call(func)
+
+    assert func.calls == 2
+    assert breaker.state == CircuitBreakerState.OPEN
+
+
+def test_rejections_are_not_retried(policy_factory, sleeps):
+    func = Flaky(5)
+    breaker = CircuitBreaker(error_threshold=1, retry=policy_factory(max_attempts=5))
+    with pytest.raises(IOError):
+        breaker.call(func)
+
+    with pytest.raises(CircuitBreakerException):
+        breaker.call(func)
+
+    assert func.calls == 1
+    assert sleeps == []
+
+
+def test_allowlisted_exceptions_are_not_retried(policy_factory):
+    func = Flaky(1, exception=ValueError)
+    breaker = CircuitBreaker(retry=policy_factory(exception_allowlist=[ValueError]))
+
+    with pytest.raises(ValueError):
+        breaker.call(func)
+
+    assert func.calls == 1
+
+
+def test_only_denylisted_exceptions_are_retried(policy_factory):
+    func = Flaky(1, exception=ConnectionError)
+    breaker = CircuitBreaker(retry=policy_factory(exception_denylist=[ConnectionError]))
+
+    assert breaker.call(func) == "ok"
+    assert func.calls == 2
+
+    other = Flaky(1, exception=ValueError)
+    with pytest.raises(ValueError):
+        breaker.call(other)
+    assert other.calls == 1
+
+
+def test_backoff_grows_wait(policy_factory, sleeps):
+    func = Flaky(3)
+    breaker = CircuitBreaker(
+        error_threshold=10,
+        retry=policy_factory(
+            max_attempts=4, interval=1, backoff=ExponentialBackoff(multiplier=2)
+        ),
+    )
+
+    breaker.call(func)
+
+    assert sleeps == [1, 2, 4]
+
+
+def test_budget_caps_retries(policy_factory):
+    budget = RetryBudget(ratio=0.5, burst=1)
+    breaker = CircuitBreaker(
+        error_threshold=100, retry=policy_factory(max_attempts=2, budget=budget)
+    )
+
+    # The burst allows the first retry, the second call has only deposited half
+    first = Flaky(1)
+    assert breaker.call(first) == "ok"
+    assert first.calls == 2
+
+    second = Flaky(1)
+    with pytest.raises(IOError):
+        breaker.call(second)
+    assert second.calls == 1
+
+    third = Flaky(1)
+    assert breaker.call(third) == "ok"
+    assert third.calls == 2
+
+
+def test_budget_is_capped_at_burst():
+    budget = RetryBudget(ratio=1, burst=2)
+
+    for _ in range(5):
+        budget.deposit()
+
+    assert budget.balance == 2
+    assert budget.withdraw()
+    assert budget.withdraw()
+    assert not budget.withdraw()
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        RetryPolicy(max_attempts=0)
+
+    with pytest.raises(ValueError):
+        RetryBudget(ratio=2)
+
+
+def test_decorator(policy_factory):
+    func = Flaky(1)
+    wrapped = circuit(func, retry=policy_factory())
+
+    assert wrapped() == "ok"
+    assert func.calls == 2
+
+
+def test_async_retries(policy_factory):
+    calls = []
+
+    async def fetch():
+        calls.append(None)
+        if len(calls) < 3:
+            raise IOError("flaky")
+        return "ok"
+
+    wrapped = circuit(fetch, error_threshold=5, retry=policy_factory(interval=0))
+
+    assert asyncio.run(wrapped()) == "ok"
+    assert len(calls) == 3
+
+
+def test_async_stops_when_breaker_opens(policy_factory):
+    calls = []
+
+    async def fetch():
+        calls.append(None)
+        raise IOError("down")
+
+    breaker = CircuitBreaker(
+        error_threshold=1, retry=policy_factory(max_attempts=3, interval=0)
+    )
+
+    with pytest.raises(IOError):
+        asyncio.run(breaker.call_async(fetch))
+
+    assert len(calls) == 1
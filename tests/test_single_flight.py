@@ -0,0 +1,247 @@
+import asyncio
+import threading
+from time import sleep
+
+import pytest
+
+from pycircuitbreaker import (
+    circuit,
+    CircuitBreaker,
+    CircuitBreakerState,
+    SingleFlight,
+)
+
+
+def run_concurrently(func, callers):
+    results = []
+
+    def target():
+        try:
+            results.append(func())
+        except Exception as ex:
+            results.append(ex)
+
+    threads = [threading.Thread(target=target) for _ in range(callers)]
+    for thread in threads:
+        thread.start()
+    return threads, results
+
+
+def make_backend(release, fail=False):
+    calls = []
+
+    def backend(key):
+        calls.append(key)
+        release.wait()
+        if fail:
+            raise IOError(key)
+        return f"value-{key}"
+
+    return backend, calls
+
+
+def release_after_callers_wait(release):
+    # Gives the other callers time to join the call in progress
+    sleep(0.05)
+    release.set()
+
+
+def test_concurrent_calls_share_result():
+    release = threading.Event()
+    backend, calls = make_backend(release)
+    single_flight = SingleFlight()
+    breaker = CircuitBreaker(single_flight=single_flight)
+
+    threads, results = run_concurrently(lambda: breaker.call(backend, "a"), 5)
+    release_after_callers_wait(release)
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value-a"] * 5
+    assert calls == ["a"]
+    assert single_flight._flights == {}
+
+
+def test_concurrent_calls_share_exception():
+    release = threading.Event()
+    backend, calls = make_backend(release, fail=True)
+    breaker = CircuitBreaker(single_flight=SingleFlight(), error_threshold=10)
+
+    threads, results = run_concurrently(lambda: breaker.call(backend, "a"), 5)
+    release_after_callers_wait(release)
+    for thread in threads:
+        thread.join()
+
+    assert all(isinstance(result, IOError) for result in results)
+    assert len({id(result) for result in results}) == 5
+    assert calls == ["a"]
+    assert breaker.error_count == 1
+
+
+def test_calls_with_different_keys_not_shared():
+    single_flight = SingleFlight()
+    started = threading.Barrier(2)
+
+    def backend(key):
+        started.wait(timeout=5)
+        return key
+
+    breaker = CircuitBreaker(single_flight=single_flight)
+    threads = [
+        threading.Thread(target=breaker.call, args=(backend, key)) for key in "ab"
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not started.broken
+
+
+def test_sequential_calls_not_shared():
+    calls = []
+    breaker = CircuitBreaker(single_flight=SingleFlight())
+
+    def backend(key):
+        calls.append(key)
+        return key
+
+    breaker.call(backend, "a")
+    breaker.call(backend, "a")
+
+    assert calls == ["a", "a"]
+
+
+def test_unhashable_arguments_not_shared():
+    single_flight = SingleFlight()
+    breaker = CircuitBreaker(single_flight=single_flight)
+
+    assert breaker.call(lambda items: items, [1]) == [1]
+    assert single_flight.key(len, ([1],), {}) is None
+
+
+def test_key_func():
+    single_flight = SingleFlight(key_func=lambda items: len(items))
+
+    assert single_flight.key(len, ([1],), {}) == single_flight.key(len, ([2],), {})
+
+
+def test_half_open_probe_shared(clock, error_func):
+    release = threading.Event()
+    backend, calls = make_backend(release)
+    single_flight = SingleFlight()
+    breaker = CircuitBreaker(
+        clock=clock,
+        error_threshold=1,
+        half_open_max_calls=1,
+        single_flight=single_flight,
+    )
+
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+    clock.advance(30)
+
+    threads, results = run_concurrently(lambda: breaker.call(backend, "a"), 5)
+    release_after_callers_wait(release)
+    for thread in threads:
+        thread.join()
+
+    assert results == ["value-a"] * 5
+    assert calls == ["a"]
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_async_calls_share_result():
+    calls = []
+
+    async def backend(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        return f"value-{key}"
+
+    wrapped = circuit(backend, single_flight=SingleFlight())
+
+    async def main():
+        return await asyncio.gather(*(wrapped("a") for _ in range(5)))
+
+    assert asyncio.run(main()) == ["value-a"] * 5
+    assert calls == ["a"]
+
+
+def test_async_calls_share_exception():
+    calls = []
+
+    async def backend(key):
+        calls.append(key)
+        await asyncio.sleep(0.01)
+        raise IOError(key)
+
+    wrapped = circuit(backend, single_flight=SingleFlight())
+
+    async def main():
+        return await asyncio.gather(
+            *(wrapped("a") for _ in range(5)), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, IOError) for result in results)
+    assert calls == ["a"]
+
+
+def test_follower_takes_over_cancelled_call():
+    calls = []
+
+    async def backend(key):
+        calls.append(key)
+        await asyncio.sleep(0.05)
+        return f"value-{key}"
+
+    wrapped = circuit(backend, single_flight=SingleFlight())
+
+    async def main():
+        leader = asyncio.ensure_future(wrapped("a"))
+        await asyncio.sleep(0)
+        follower = asyncio.ensure_future(wrapped("a"))
+        await asyncio.sleep(0)
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(main()) == "value-a"
+    assert calls == ["a", "a"]
+
+
+def test_follower_takes_over_interrupted_call():
+    release = threading.Event()
+    calls = []
+
+    class Interrupted(BaseException):
+        pass
+
+    def backend(key):
+        calls.append(key)
+        if len(calls) == 1:
+            release.wait()
+            raise Interrupted()
+        return f"value-{key}"
+
+    breaker = CircuitBreaker(single_flight=SingleFlight())
+
+    def leader():
+        with pytest.raises(Interrupted):
+            breaker.call(backend, "a")
+
+    leader_thread = threading.Thread(target=leader)
+    leader_thread.start()
+    while not calls:
+        sleep(0.001)
+
+    threads, results = run_concurrently(lambda: breaker.call(backend, "a"), 1)
+    release_after_callers_wait(release)
+    for thread in [leader_thread] + threads:
+        thread.join()
+
+    assert results == ["value-a"]
+    assert calls == ["a", "a"]
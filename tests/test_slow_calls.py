@@ -0,0 +1,120 @@
+from unittest import mock
+
+import pytest
+
+from pycircuitbreaker import CircuitBreaker, CircuitBreakerState
+from pycircuitbreaker.strategies import CircuitBreakerStrategy
+
+
+@pytest.fixture()
+def slow_func(clock):
+    def slow(seconds=2):
+        clock.advance(seconds)
+        return True
+
+    return slow
+
+
+@pytest.fixture()
+def timer(clock):
+    with mock.patch("pycircuitbreaker.pycircuitbreaker.perf_counter", clock):
+        yield clock
+
+
+def test_slow_calls_count_as_errors(timer, slow_func):
+    mock_open = mock.Mock()
+    breaker = CircuitBreaker(
+        error_threshold=2, on_open=mock_open, slow_call_threshold=1
+    )
+
+    assert breaker.call(slow_func) is True
+    assert breaker.error_count == 1
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+    breaker.call(slow_func)
+    assert breaker.state == CircuitBreakerState.OPEN
+    mock_open.assert_called_once_with(breaker, True)
+
+
+def test_fast_calls_are_successes(timer, slow_func):
+    breaker = CircuitBreaker(error_threshold=1, slow_call_threshold=1)
+
+    breaker.call(slow_func, 0.5)
+    assert breaker.error_count == 0
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_calls_are_not_timed_without_threshold(timer, slow_func):
+    breaker = CircuitBreaker(error_threshold=1)
+
+    breaker.call(slow_func, 60)
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_slow_recovery_call_reopens(timer, clock, error_func, slow_func):
+    breaker = CircuitBreaker(
+        clock=clock, error_threshold=1, recovery_timeout=30, slow_call_threshold=1
+    )
+
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+
+    clock.advance(30)
+    assert breaker.state == CircuitBreakerState.HALF_OPEN
+
+    breaker.call(slow_func)
+    assert breaker.state == CircuitBreakerState.OPEN
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [CircuitBreakerStrategy.SLIDING_WINDOW, CircuitBreakerStrategy.COUNT_WINDOW],
+)
+def test_window_strategies_track_slow_call_rate(
+    timer, clock, slow_func, success_func, strategy
+):
+    breaker = CircuitBreaker(
+        clock=clock,
+        slow_call_threshold=1,
+        strategy=strategy,
+        strategy_options={
+            "minimum_calls": 4,
+            "slow_call_rate_threshold": 50,
+            "window_size": 100,
+        },
+    )
+
+    breaker.call(success_func)
+    breaker.call(success_func)
+    breaker.call(slow_func)
+    assert breaker.error_count == 0
+    assert breaker.state == CircuitBreakerState.CLOSED
+    assert breaker._strategy.slow_call_rate == pytest.approx(100 / 3)
+
+    breaker.call(slow_func)
+    assert breaker.state == CircuitBreakerState.OPEN
+    assert breaker._strategy.slow_call_rate == pytest.approx(50)
+
+
+@pytest.mark.parametrize(
+    "strategy",
+    [CircuitBreakerStrategy.SLIDING_WINDOW, CircuitBreakerStrategy.COUNT_WINDOW],
+)
+def test_window_strategies_count_slow_failures_once(timer, clock, io_error, strategy):
+    breaker = CircuitBreaker(
+        clock=clock,
+        slow_call_threshold=1,
+        strategy=strategy,
+        strategy_options={"minimum_calls": 100, "window_size": 100},
+    )
+
+    def slow_error():
+        clock.advance(2)
+        raise io_error
+
+    with pytest.raises(IOError):
+        breaker.call(slow_error)
+
+    assert breaker._strategy._calls == 1
+    assert breaker.error_count == 1
+    assert breaker._strategy.slow_call_rate == pytest.approx(100)
@@ -0,0 +1,188 @@
+import asyncio
+import contextvars
+from threading import Event
+
+import pytest
+
+from pycircuitbreaker import (
+    CallTimeoutException,
+    circuit,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+    CircuitBreakerState,
+    TimeoutExecutor,
+    TimeoutExecutorFullException,
+)
+
+
+@pytest.fixture()
+def executor():
+    executor = TimeoutExecutor(max_workers=1, max_queue_size=0)
+    yield executor
+    executor.shutdown(wait=False)
+
+
+@pytest.fixture()
+def hang():
+    release = Event()
+
+    def hang():
+        release.wait(5)
+        return "late"
+
+    yield hang
+    release.set()
+
+
+def test_call_within_timeout(executor, success_func):
+    breaker = CircuitBreaker(timeout=1, timeout_executor=executor)
+
+    assert breaker.call(success_func) is True
+    assert breaker.state == CircuitBreakerState.CLOSED
+
+
+def test_call_exceeding_timeout_fails(executor, hang):
+    breaker = CircuitBreaker(timeout=0.05, timeout_executor=executor)
+
+    with pytest.raises(CallTimeoutException) as exc_info:
+        breaker.call(hang)
+
+    assert isinstance(exc_info.value, TimeoutError)
+    assert breaker.error_count == 1
+
+
+def test_timeouts_open_breaker(hang):
+    executor = TimeoutExecutor(max_workers=2)
+    breaker = CircuitBreaker(error_threshold=2, timeout=0.05, timeout_executor=executor)
+
+    for _ in range(2):
+        with pytest.raises(CallTimeoutException):
+            breaker.call(hang)
+
+    assert breaker.state == CircuitBreakerState.OPEN
+    executor.shutdown(wait=False)
+
+
+def test_timeouts_count_whatever_the_exception_lists(executor, hang):
+    breaker = CircuitBreaker(
+        exception_allowlist=[TimeoutError], timeout=0.05, timeout_executor=executor
+    )
+
+    with pytest.raises(CallTimeoutException):
+        breaker.call(hang)
+
+    assert breaker.error_count == 1
+
+
+def test_errors_from_the_call_are_raised(executor, error_func):
+    breaker = CircuitBreaker(timeout=1, timeout_executor=executor)
+
+    with pytest.raises(IOError):
+        breaker.call(error_func)
+
+    assert breaker.error_count == 1
+
+
+def test_full_executor_rejects_calls(executor, hang, success_func):
+    breaker = CircuitBreaker(metrics=True, timeout=0.05, timeout_executor=executor)
+
+    with pytest.raises(CallTimeoutException):
+        breaker.call(hang)
+
+    # The hung call still holds the only thread
+    assert executor.running_calls == 1
+    with pytest.raises(TimeoutExecutorFullException):
+        breaker.call(success_func)
+
+    assert breaker.error_count == 1
+    assert executor.rejected_count == 1
+    assert breaker.metrics.rejections["executor"] == 1
+
+
+def test_full_executor_falls_back(executor, hang, success_func):
+    breaker = CircuitBreaker(
+        fallback="default", timeout=0.05, timeout_executor=executor
+    )
+    with pytest.raises(CallTimeoutException):
+        breaker.call(hang)
+
+    assert breaker.call(success_func) == "default"
+
+
+def test_queued_calls_that_time_out_are_not_started(hang):
+    executor = TimeoutExecutor(max_workers=1, max_queue_size=1)
+    breaker = CircuitBreaker(
+        error_threshold=10, timeout=0.05, timeout_executor=executor
+    )
+    with pytest.raises(CallTimeoutException):
+        breaker.call(hang)
+
+    started = []
+    with pytest.raises(CallTimeoutException):
+        breaker.call(started.append, None)
+
+    assert started == []
+    assert executor.queue_depth == 0
+    executor.shutdown(wait=False)
+
+
+def test_context_is_copied(executor):
+    request_id = contextvars.ContextVar("request_id")
+    request_id.set("abc")
+    breaker = CircuitBreaker(timeout=1, timeout_executor=executor)
+
+    assert breaker.call(request_id.get) == "abc"
+
+
+def test_default_executor_is_shared(success_func):
+    first = CircuitBreaker(timeout=1)
+    second = CircuitBreaker(timeout=2)
+
+    assert first.timeout_executor is second.timeout_executor
+    assert CircuitBreaker().timeout_executor is None
+
+
+def test_executor_metrics_exported(executor):
+    registry = CircuitBreakerRegistry()
+    registry.register(
+        CircuitBreaker(breaker_id="db", timeout=1, timeout_executor=executor)
+    )
+
+    snapshot = registry.get_metrics()["db"]["executor"]
+    assert snapshot == {
+        "max_workers": 1,
+        "max_queue_size": 0,
+        "running_calls": 0,
+        "queue_depth": 0,
+        "rejected_count": 0,
+    }
+    assert 'pycircuitbreaker_executor_workers{breaker="db"} 1' in (
+        registry.render_prometheus()
+    )
+
+
+def test_invalid_executor_settings():
+    with pytest.raises(ValueError):
+        TimeoutExecutor(max_workers=0)
+
+    with pytest.raises(ValueError):
+        TimeoutExecutor(max_queue_size=-1)
+
+
+def test_async_call_exceeding_timeout_fails():
+    async def hang():
+        await asyncio.sleep(5)
+
+    wrapped = circuit(hang, timeout=0.05)
+
+    with pytest.raises(CallTimeoutException):
+        asyncio.run(wrapped())
+
+
+def test_async_call_within_timeout():
+    async def fetch():
+        return "value"
+
+    breaker = CircuitBreaker(timeout=1)
+
+    assert asyncio.run(breaker.call_async(fetch)) == "value"